@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_bots.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for bot lookups: linear search over catalog vs BotIndex.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_bots.py
+"""
+
+import random
+from functools import partial
+from timeit import repeat
+
+from src.ablt_python_api.utils.bot_index import BotIndex
+
+SIZES = (10, 100, 1_000, 10_000)
+LOOKUPS = 10_000
+ROUNDS = 5
+
+
+def build_bots(size: int) -> list:
+    """
+    Builds catalog of bots.
+
+    :param size: number of bots
+    :return: list of bot dicts
+    """
+    models = ("gpt-4", "gpt-3.5", "claude", "llama")
+    return [
+        {"uid": f"uid-{number}", "slug": f"bot-{number}", "name": f"Bot {number}", "model": random.choice(models)}
+        for number in range(size)
+    ]
+
+
+def linear_find(bots: list, key: str, value: str):
+    """
+    Finds bot like find_bot_by_* did before index.
+
+    :param bots: list of bot dicts
+    :param key: key to compare
+    :param value: value to search
+    :return: bot dict or None
+    """
+    for bot_info in bots:
+        if bot_info.get(key) == value:
+            return bot_info
+    return None
+
+
+def linear_lookups(bots: list, slugs: list) -> list:
+    """
+    Finds bots by slugs with linear search.
+
+    :param bots: list of bot dicts
+    :param slugs: slugs to search
+    :return: found bot dicts
+    """
+    return [linear_find(bots, "slug", slug) for slug in slugs]
+
+
+def indexed_lookups(index: BotIndex, slugs: list) -> list:
+    """
+    Finds bots by slugs with index.
+
+    :param index: index of bots
+    :param slugs: slugs to search
+    :return: found bot dicts
+    """
+    return [index.by_slug(slug) for slug in slugs]
+
+
+def prefix_lookups(index: BotIndex, prefix: str, lookups: int) -> list:
+    """
+    Finds bots by prefix of name with index several times.
+
+    :param index: index of bots
+    :param prefix: prefix of name
+    :param lookups: number of lookups
+    :return: found lists of bot dicts
+    """
+    return [index.by_name_prefix(prefix) for _ in range(lookups)]
+
+
+def run() -> None:
+    """Runs benchmark and prints cost per lookup."""
+    random.seed(42)
+    for size in SIZES:
+        bots = build_bots(size)
+        slugs = [random.choice(bots)["slug"] for _ in range(LOOKUPS)]
+        build = min(repeat(partial(BotIndex, bots), number=1, repeat=ROUNDS))
+        index = BotIndex(bots)
+        linear = min(repeat(partial(linear_lookups, bots, slugs), number=1, repeat=ROUNDS))
+        indexed = min(repeat(partial(indexed_lookups, index, slugs), number=1, repeat=ROUNDS))
+        prefix = min(repeat(partial(prefix_lookups, index, "bot 99", 100), number=1, repeat=ROUNDS))
+        print(
+            f"{size:>6} bots: linear {linear / LOOKUPS * 1e9:>9.0f} ns   index {indexed / LOOKUPS * 1e9:>5.0f} ns   "
+            f"prefix {prefix / 100 * 1e6:>7.1f} us   build {build * 1e3:>6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_chat_request.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for building chat request body: payload dict with conditional spreads encoded on
+each call versus reused ChatRequest, which encodes just the prompt or messages.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_chat_request.py
+"""
+
+from timeit import repeat
+from typing import Any
+
+from src.ablt_python_api.utils.chat_request import ChatRequest
+from src.ablt_python_api.utils.codec import CODECS, get_codec
+
+CALLS = 100_000
+ROUNDS = 5
+PROMPT = "What is the capital of France? Answer in one word."
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant, answer briefly."},
+    {"role": "user", "content": "What is the capital of France?"},
+    {"role": "assistant", "content": "Paris."},
+    {"role": "user", "content": "And of Germany?"},
+]
+PARAMS: dict[str, Any] = {
+    "bot_slug": "omni",
+    "bot_uid": None,
+    "stream": True,
+    "user_id": 42,
+    "language": "English",
+    "assumptions": {"tone": "formal", "audience": "developers", "format": "plain text"},
+    "max_words": 100,
+    "use_search": False,
+}
+
+
+# pylint: disable=too-many-arguments
+def legacy_payload(
+    bot_uid=None,
+    bot_slug=None,
+    prompt=None,
+    messages=None,
+    stream=False,
+    user_id=None,
+    language=None,
+    assumptions=None,
+    max_words=None,
+    use_search=False,
+):
+    """
+    Builds payload like chat did before ChatRequest.
+
+    :return: payload
+    """
+    return {
+        "stream": stream,
+        **({"bot_slug": bot_slug} if bot_slug is not None else {}),
+        **({"bot_uid": bot_uid} if bot_uid is not None else {}),
+        **({"language": language} if language is not None else {}),
+        **({"max_words": max_words} if max_words is not None else {}),
+        **({"assumptions": assumptions} if assumptions is not None else {}),
+        **({"prompt": prompt} if prompt is not None else {}),
+        **({"messages": messages} if messages is not None else {}),
+        **({"user_id": user_id} if user_id is not None else {}),
+        **({"use_search": use_search} if use_search is not None else {}),
+    }
+
+
+def run() -> None:
+    """Runs benchmark and prints cost of a single request body for each codec."""
+    token = "x" * 64
+    print(f"{'codec':<8}{'case':<34}{'prompt':>12}{'messages':>12}")
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            continue
+        request = ChatRequest(json_codec=codec, **PARAMS)
+        cases = {
+            "dict + headers per call": lambda message, dumps=codec.dumps: (
+                {"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+                dumps(legacy_payload(**PARAMS, **message)),
+            ),
+            "ChatRequest per call": lambda message, codec=codec: ChatRequest(json_codec=codec, **PARAMS).encode(
+                **message
+            ),
+            "reused ChatRequest": lambda message, request=request: request.encode(**message),
+        }
+        for case, build in cases.items():
+            timings = []
+            for message in ({"prompt": PROMPT}, {"messages": MESSAGES}):
+                elapsed = min(repeat(lambda: build(message), number=CALLS, repeat=ROUNDS))  # pylint: disable=W0640
+                timings.append(elapsed / CALLS * 1e9)
+            print(f"{codec.name:<8}{case:<34}{timings[0]:>9.0f} ns{timings[1]:>9.0f} ns")
+
+
+if __name__ == "__main__":
+    run()
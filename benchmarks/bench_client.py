@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_client.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains benchmark suite for client hot paths against local mock of aBLT API (run in separate process,
+so it doesn't compete with the client for GIL): chat requests per second, SSE events per second and time to first
+token, bot lookups, statistics fetch, import and constructor time of both API wrappers. Results are written to JSON
+and may be compared with results of other version.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_client.py [--output results.json] [--compare baseline.json] [--quick]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Callable
+
+import requests
+
+from src.ablt_python_api.ablt_api_async import ABLTApi as AsyncABLTApi
+from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.utils.codec import default_codec
+
+ROOT = Path(__file__).resolve().parents[1]
+TOKEN = "bench-token"
+LOGGER = logging.getLogger("ablt-bench")
+LOGGER.setLevel(logging.CRITICAL)
+
+
+class Results:
+    """This class collects metrics of the suite."""
+
+    def __init__(self):
+        """Init Results class"""
+        self.metrics: dict[str, dict] = {}
+
+    def add(self, name: str, value: float, unit: str, better: str = "lower") -> None:
+        """
+        Adds metric and prints it.
+
+        :param name: name of metric
+        :param value: value of metric
+        :param unit: unit of value, e.g. 'ms'
+        :param better: 'lower' or 'higher' is better
+        """
+        self.metrics[name] = {"value": round(value, 6), "unit": unit, "better": better}
+        print(f"{name:<40}{value:>14.3f} {unit}")
+
+
+def median_ms(function: Callable[[], object], rounds: int) -> float:
+    """
+    Returns median duration of the function.
+
+    :param function: function to measure
+    :param rounds: number of calls
+    :return: median duration in ms
+    """
+    durations = []
+    for _ in range(rounds):
+        started_at = perf_counter()
+        function()
+        durations.append(perf_counter() - started_at)
+    return statistics.median(durations) * 1e3
+
+
+def start_server(response_words: int) -> tuple[subprocess.Popen, str]:
+    """
+    Starts mock server in separate process and waits until it's ready.
+
+    :param response_words: number of words in each chat response
+    :return: process and base API URL
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable,
+            "-m",
+            "src.ablt_python_api.mock_server",
+            "--port",
+            str(port),
+            "--bearer-token",
+            TOKEN,
+            "--bots",
+            "1000",
+            "--response-words",
+            str(response_words),
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{url}/health-check", timeout=1)
+            return process, url
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Mock server didn't start")
+
+
+def bench_startup(results: Results, rounds: int) -> None:
+    """
+    Measures import time (fresh interpreter) and constructor time of both API wrappers.
+
+    :param results: results
+    :param rounds: number of rounds
+    """
+    statements = {
+        "sync": "from src.ablt_python_api import ABLTApi",
+        "async": "from src.ablt_python_api import ABLTApi_async",
+    }
+    for name, statement in statements.items():
+        code = f"from time import perf_counter; t = perf_counter(); {statement}; print(perf_counter() - t)"
+        timings = [
+            float(
+                subprocess.run(
+                    [sys.executable, "-c", code], cwd=ROOT, capture_output=True, check=True, text=True
+                ).stdout
+            )
+            for _ in range(rounds)
+        ]
+        results.add(f"import_{name}", min(timings) * 1e3, "ms")
+    results.add(
+        "constructor_sync",
+        median_ms(lambda: ABLTApi(bearer_token=TOKEN, logger=LOGGER, lazy=True).close(), rounds * 20),
+        "ms",
+    )
+    results.add(
+        "constructor_async",
+        median_ms(lambda: AsyncABLTApi(bearer_token=TOKEN, logger=LOGGER, lazy=True), rounds * 20),
+        "ms",
+    )
+
+
+def bench_sync(results: Results, url: str, requests_count: int, rounds: int) -> None:
+    """
+    Measures sync API wrapper.
+
+    :param results: results
+    :param url: base API URL of mock server
+    :param requests_count: number of chat requests
+    :param rounds: number of rounds of latency measurements
+    """
+    with ABLTApi(bearer_token=TOKEN, base_api_url=url, logger=LOGGER) as api:
+        started_at = perf_counter()
+        for _ in range(requests_count):
+            list(api.chat(bot_slug="mock-bot-0", prompt="Hi!", max_words=10))
+        results.add("chat_sync_rps", requests_count / (perf_counter() - started_at), "req/s", "higher")
+
+        first_tokens, events, duration = [], 0, 0.0
+        for _ in range(rounds):
+            started_at = perf_counter()
+            chat_stream = api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False)
+            for _ in chat_stream:
+                if chat_stream.messages == 1:
+                    first_tokens.append(perf_counter() - started_at)
+            events += chat_stream.events
+            duration += perf_counter() - started_at
+        results.add("chat_stream_sync_events_per_s", events / duration, "events/s", "higher")
+        results.add("chat_stream_sync_ttft", statistics.median(first_tokens) * 1e3, "ms")
+
+        api.invalidate_bots()
+        results.add("get_bots_sync_cold", median_ms(lambda: (api.invalidate_bots(), api.get_bots()), rounds), "ms")
+        results.add("get_bots_sync_cached", median_ms(api.get_bots, rounds * 10), "ms")
+        results.add("find_bot_by_slug_sync", median_ms(lambda: api.find_bot_by_slug("mock-bot-999"), rounds * 10), "ms")
+        results.add("find_bot_by_uid_sync", median_ms(lambda: api.find_bot_by_uid("mock-uid-999"), rounds * 10), "ms")
+        results.add("find_bot_by_name_sync", median_ms(lambda: api.find_bot_by_name("Mock Bot 999"), rounds * 10), "ms")
+
+        results.add(
+            "statistics_sync_month",
+            median_ms(lambda: api.get_usage_statistics(start_date="2024-01-01", end_date="2024-01-31"), rounds),
+            "ms",
+        )
+        results.add(
+            "statistics_sync_year",
+            median_ms(lambda: api.get_usage_statistics(start_date="2024-01-01", end_date="2024-12-31"), rounds),
+            "ms",
+        )
+
+
+async def bench_async(results: Results, url: str, requests_count: int, rounds: int) -> None:
+    """
+    Measures async API wrapper.
+
+    :param results: results
+    :param url: base API URL of mock server
+    :param requests_count: number of chat requests
+    :param rounds: number of rounds of latency measurements
+    """
+    async with AsyncABLTApi(bearer_token=TOKEN, base_api_url=url, logger=LOGGER, lazy=True) as api:
+        await api.health_check()
+
+        async def chat() -> None:
+            """Sends single chat request."""
+            async for _ in api.chat(bot_slug="mock-bot-0", prompt="Hi!", max_words=10):
+                pass
+
+        started_at = perf_counter()
+        for _ in range(requests_count):
+            await chat()
+        results.add("chat_async_rps", requests_count / (perf_counter() - started_at), "req/s", "higher")
+        started_at = perf_counter()
+        await asyncio.gather(*(chat() for _ in range(requests_count)))
+        results.add("chat_async_concurrent_rps", requests_count / (perf_counter() - started_at), "req/s", "higher")
+
+        first_tokens, events, duration = [], 0, 0.0
+        for _ in range(rounds):
+            started_at = perf_counter()
+            chat_stream = api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False)
+            async for _ in chat_stream:
+                if chat_stream.messages == 1:
+                    first_tokens.append(perf_counter() - started_at)
+            events += chat_stream.events
+            duration += perf_counter() - started_at
+        results.add("chat_stream_async_events_per_s", events / duration, "events/s", "higher")
+        results.add("chat_stream_async_ttft", statistics.median(first_tokens) * 1e3, "ms")
+
+        durations = []
+        for _ in range(rounds):
+            api.invalidate_bots()
+            started_at = perf_counter()
+            await api.get_bots()
+            durations.append(perf_counter() - started_at)
+        results.add("get_bots_async_cold", statistics.median(durations) * 1e3, "ms")
+        durations = []
+        for _ in range(rounds * 10):
+            started_at = perf_counter()
+            await api.find_bot_by_slug("mock-bot-999")
+            durations.append(perf_counter() - started_at)
+        results.add("find_bot_by_slug_async", statistics.median(durations) * 1e3, "ms")
+
+        durations = []
+        for _ in range(rounds):
+            started_at = perf_counter()
+            await api.get_usage_statistics(start_date="2024-01-01", end_date="2024-12-31")
+            durations.append(perf_counter() - started_at)
+        results.add("statistics_async_year", statistics.median(durations) * 1e3, "ms")
+
+
+def compare(metrics: dict, baseline_path: str) -> None:
+    """
+    Prints comparison with baseline results.
+
+    :param metrics: current metrics
+    :param baseline_path: path to JSON with baseline results
+    """
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))["metrics"]
+    print(f"\n{'metric':<40}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name, metric in metrics.items():
+        if name not in baseline or not baseline[name]["value"]:
+            continue
+        old, new = baseline[name]["value"], metric["value"]
+        change = (new - old) / old * 100
+        improved = change > 0 if metric["better"] == "higher" else change < 0
+        print(f"{name:<40}{old:>14.3f}{new:>14.3f}{change:>+9.1f}%{'' if improved or abs(change) < 5 else '  !'}")
+
+
+def run() -> None:
+    """Runs benchmark suite, writes results to JSON and compares them with baseline if requested."""
+    parser = argparse.ArgumentParser(description="Benchmark suite for client hot paths")
+    parser.add_argument("--output", default="bench_results.json", help="path to JSON with results")
+    parser.add_argument("--compare", default=None, help="path to JSON with baseline results")
+    parser.add_argument("--quick", action="store_true", help="fewer requests, e.g. for CI")
+    args = parser.parse_args()
+    requests_count, rounds = (50, 5) if args.quick else (500, 20)
+    results = Results()
+    process, url = start_server(response_words=200)
+    try:
+        bench_startup(results, rounds=3 if args.quick else 10)
+        bench_sync(results, url, requests_count, rounds)
+        asyncio.run(bench_async(results, url, requests_count, rounds))
+    finally:
+        process.terminate()
+        process.wait()
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "codec": default_codec.name,
+            "requests": requests_count,
+            "rounds": rounds,
+        },
+        "metrics": results.metrics,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults are written to {args.output}")
+    if args.compare:
+        compare(results.metrics, args.compare)
+
+
+if __name__ == "__main__":
+    run()
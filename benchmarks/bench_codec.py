@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_codec.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for JSON codecs: per-event decode cost of chat deltas and payload encode cost.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_codec.py
+"""
+
+import random
+from functools import partial
+from timeit import repeat
+
+from src.ablt_python_api.utils.codec import CODECS, default_codec, get_codec
+
+EVENTS = 100_000
+ROUNDS = 5
+
+
+def build_events(events: int) -> list:
+    """
+    Builds typical chat deltas as they come in SSE 'data:' lines.
+
+    :param events: number of events
+    :return: list of JSON strings
+    """
+    words = ("Hello", " world", ", how", " are", " you", " today", "?", " Привет", " 🙂", ' "quoted"')
+    return [get_codec("json").dumps({"content": random.choice(words)}).decode("utf-8") for _ in range(events)]
+
+
+def decode_events(loads, events: list) -> list:
+    """
+    Decodes events one by one, like chat stream does.
+
+    :param loads: decode function of codec
+    :param events: list of JSON strings
+    :return: decoded events
+    """
+    return [loads(event) for event in events]
+
+
+def run() -> None:
+    """Runs benchmark and prints cost per event."""
+    random.seed(42)
+    events = build_events(EVENTS)
+    payload = {
+        "stream": True,
+        "bot_slug": "omni",
+        "language": "English",
+        "max_words": 100,
+        "messages": [{"role": "user", "content": "What is the capital of France?"}] * 5,
+        "use_search": False,
+    }
+    print(f"Default codec: {default_codec.name}, {EVENTS} events")
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            print(f"{name:<8} not installed")
+            continue
+        decode = min(repeat(partial(decode_events, codec.loads, events), number=1, repeat=ROUNDS)) / EVENTS
+        encode = min(repeat(partial(codec.dumps, payload), number=10_000, repeat=ROUNDS)) / 10_000
+        print(f"{name:<8} decode {decode * 1e9:>7.0f} ns/event   encode payload {encode * 1e9:>7.0f} ns")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_columnar.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for statistics rollups: loops over item dicts vs StatisticsColumns backends.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_columnar.py
+"""
+
+import random
+from datetime import date, timedelta
+from functools import partial
+from timeit import repeat
+
+from src.ablt_python_api.utils.columnar import StatisticsColumns
+from src.ablt_python_api.utils.statistics import STAT_FIELDS
+
+USERS = 200
+DAYS = 3 * 365
+ROUNDS = 3
+
+
+def build_statistics() -> dict:
+    """
+    Builds statistics of users for few years.
+
+    :return: statistics dicts by user id
+    """
+    start = date(2023, 1, 1)
+    days = [(start + timedelta(days=day)).isoformat() for day in range(DAYS)]
+    return {
+        user_id: {"items": [{**{field: random.randint(0, 5000) for field in STAT_FIELDS}, "date": day} for day in days]}
+        for user_id in range(USERS)
+    }
+
+
+def naive_monthly(statistics_by_user: dict) -> dict:
+    """
+    Sums items by month in loops over dicts.
+
+    :param statistics_by_user: statistics dicts by user id
+    :return: totals by month
+    """
+    result: dict = {}
+    for statistics in statistics_by_user.values():
+        for item in statistics["items"]:
+            total = result.setdefault(item["date"][:7], dict.fromkeys(STAT_FIELDS, 0))
+            for field in STAT_FIELDS:
+                total[field] += item[field]
+    return result
+
+
+def get_backends() -> list:
+    """
+    Returns installed backends.
+
+    :return: backend names
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel,unused-import
+
+        return ["array", "numpy"]
+    except ImportError:
+        return ["array"]
+
+
+def run() -> None:
+    """Runs benchmark and prints time of rollups."""
+    random.seed(42)
+    statistics_by_user = build_statistics()
+    naive = min(repeat(partial(naive_monthly, statistics_by_user), number=1, repeat=ROUNDS))
+    print(f"{USERS * DAYS} items, naive month rollup {naive * 1e3:>8.1f} ms")
+    for backend in get_backends():
+        build_columns = partial(StatisticsColumns.from_users, statistics_by_user, backend)
+        build = min(repeat(build_columns, number=1, repeat=ROUNDS))
+        columns = build_columns()
+        # Bound methods are timed, so each timing uses columns of current backend
+        timings = [
+            (period, min(repeat(partial(columns.rollup, period), number=1, repeat=ROUNDS)))
+            for period in ("day", "week", "month", "user")
+        ]
+        timings.append(("avg7", min(repeat(partial(columns.moving_average, window=7), number=1, repeat=ROUNDS))))
+        timings.append(("top10", min(repeat(partial(columns.top_days, 10), number=1, repeat=ROUNDS))))
+        print(
+            f"{backend:>6}: build {build * 1e3:>7.1f} ms   "
+            + "   ".join(f"{name} {timing * 1e3:>6.1f} ms" for name, timing in timings)
+        )
+
+
+if __name__ == "__main__":
+    run()
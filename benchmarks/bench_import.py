@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_import.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains import-time benchmark (python -X importtime) of package entry points with startup budgets.
+Import time is the sum of self times of modules which are not loaded by bare interpreter. Exits with code 1 if
+any entry point exceeds its budget or loads module it shouldn't.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_import.py
+"""
+
+import os
+import subprocess
+import sys
+
+ROUNDS = 5
+
+# Statement: (budget in ms, modules which shouldn't be loaded)
+ENTRY_POINTS = {
+    "import ablt_python_api": (20, ("requests", "aiohttp", "pydantic", "asyncio")),
+    "from ablt_python_api import ABLTApi": (250, ("aiohttp", "pydantic", "asyncio")),
+    "from ablt_python_api import ABLTApi_async": (400, ("requests", "pydantic")),
+    "from ablt_python_api import BotSchema": (250, ("requests", "aiohttp")),
+}
+
+
+def import_times(statement: str) -> dict:
+    """
+    Runs statement in fresh interpreter and returns self import time of each module.
+
+    :param statement: statement to run
+    :return: self import time in microseconds by module name
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_time)
+    return times
+
+
+def run() -> int:
+    """
+    Runs benchmark and prints import time of each entry point.
+
+    :return: exit code, 1 if any budget is exceeded
+    """
+    baseline = set(import_times("pass"))
+    failed = False
+    print(f"{'entry point':<46}{'time':>11}{'budget':>11}  unwanted modules")
+    for statement, (budget, unwanted) in ENTRY_POINTS.items():
+        rounds = [import_times(statement) for _ in range(ROUNDS)]
+        elapsed = min(sum(time for name, time in times.items() if name not in baseline) for times in rounds) / 1e3
+        loaded = sorted(module for module in unwanted if module in rounds[0])
+        ok = elapsed <= budget and not loaded
+        failed = failed or not ok
+        print(f"{statement:<46}{elapsed:>8.1f} ms{budget:>8} ms  {', '.join(loaded) or '-'}{'' if ok else '  FAIL'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_records.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for records: construction time and memory of 100,000 statistic items held as
+dicts, pydantic models and records.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_records.py
+"""
+
+import tracemalloc
+from datetime import date, timedelta
+from timeit import repeat
+
+from src.ablt_python_api.records import StatisticItemRecord
+from src.ablt_python_api.schemas import StatisticItemSchema
+from src.ablt_python_api.utils.statistics import STAT_FIELDS
+
+ITEMS = 100_000
+ROUNDS = 3
+
+
+def build_items() -> list:
+    """
+    Builds statistics items like API returns.
+
+    :return: list of items
+    """
+    start = date(2000, 1, 1)
+    return [
+        {**dict.fromkeys(STAT_FIELDS, day), "date": (start + timedelta(days=day % 10_000)).isoformat()}
+        for day in range(ITEMS)
+    ]
+
+
+def measure(build) -> int:
+    """
+    Measures memory held by result of build.
+
+    :param build: function building objects
+    :return: size in bytes
+    """
+    tracemalloc.start()
+    objects = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def run() -> None:
+    """Runs benchmark and prints time and memory of each representation."""
+    items = build_items()
+    models = [StatisticItemSchema.model_validate(item) for item in items]
+    records = [StatisticItemRecord.from_dict(item) for item in items]
+    cases = {
+        "dicts (copy)": lambda: [dict(item) for item in items],
+        "models (model_validate)": lambda: [StatisticItemSchema.model_validate(item) for item in items],
+        "records (from_dict)": lambda: [StatisticItemRecord.from_dict(item) for item in items],
+        "records (from_model)": lambda: [StatisticItemRecord.from_model(model) for model in models],
+        "models (record.to_model)": lambda: [record.to_model() for record in records],
+    }
+    print(f"{'representation':<28}{f'{ITEMS} items':>14}{'memory':>14}")
+    for name, build in cases.items():
+        elapsed = min(repeat(build, number=1, repeat=ROUNDS))
+        print(f"{name:<28}{elapsed * 1e3:>11.2f} ms{measure(build) / 2**20:>11.2f} MB")
+
+
+if __name__ == "__main__":
+    run()
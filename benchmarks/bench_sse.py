@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_sse.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for server-sent events decoder on multi-megabyte synthetic stream.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_sse.py
+"""
+
+import json
+import random
+from time import perf_counter
+
+from src.ablt_python_api.utils.sse import iter_events
+
+EVENTS = 100_000
+CHUNK_SIZES = (64, 1024, 16384)
+ROUNDS = 3
+
+
+def build_stream(events: int) -> bytes:
+    """
+    Builds synthetic chat stream.
+
+    :param events: number of content events
+    :return: raw stream
+    """
+    words = ("Hello", " world", ", how", " are", " you", " today", "?", " Привет", " 🙂")
+    parts = [f"data: {json.dumps({'content': random.choice(words)})}\n\n" for _ in range(events)]
+    parts.append("data: [DONE]\n\n")
+    return "".join(parts).encode("utf-8")
+
+
+def split_stream(stream: bytes, chunk_size: int) -> list:
+    """
+    Splits stream into chunks of random size (like TCP does).
+
+    :param stream: raw stream
+    :param chunk_size: average chunk size
+    :return: list of chunks
+    """
+    chunks = []
+    position = 0
+    while position < len(stream):
+        size = random.randint(1, chunk_size * 2)
+        chunks.append(stream[position : position + size])
+        position += size
+    return chunks
+
+
+def legacy_decode(chunks: list) -> int:
+    """
+    Decodes stream the way it was done before the decoder (split every chunk into lines).
+
+    :param chunks: list of chunks
+    :return: number of events (lines split across chunks are lost)
+    """
+    count = 0
+    for chunk in chunks:
+        for data in chunk.decode("utf-8", errors="replace").splitlines():
+            if data.startswith("data:"):
+                data = data[5:].strip()
+                count += 1
+    return count
+
+
+def decoder_decode(chunks: list) -> int:
+    """
+    Decodes stream with incremental decoder.
+
+    :param chunks: list of chunks
+    :return: number of events
+    """
+    count = 0
+    for _ in iter_events(chunks):
+        count += 1
+    return count
+
+
+def run() -> None:
+    """Runs benchmark and prints events per second."""
+    random.seed(42)
+    stream = build_stream(EVENTS)
+    print(f"Stream: {len(stream) / 1024 / 1024:.2f} MiB, {EVENTS + 1} events")
+    for chunk_size in CHUNK_SIZES:
+        chunks = split_stream(stream, chunk_size)
+        for name, decode in (("legacy splitlines", legacy_decode), ("SSEDecoder", decoder_decode)):
+            best = float("inf")
+            count = 0
+            for _ in range(ROUNDS):
+                start = perf_counter()
+                count = decode(chunks)
+                best = min(best, perf_counter() - start)
+            print(
+                f"chunk~{chunk_size:>6} B  {name:<18} {count / best:>12,.0f} events/s  "
+                f"{len(stream) / best / 1024 / 1024:>8.1f} MiB/s  events seen: {count}"
+            )
+
+
+if __name__ == "__main__":
+    run()
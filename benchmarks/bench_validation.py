@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: bench_validation.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains micro-benchmark for validation modes: cost per 1,000 bots and 10,000 statistic items.
+
+Usage:
+    PYTHONPATH=. python benchmarks/bench_validation.py
+"""
+
+import json
+from datetime import date, timedelta
+from timeit import repeat
+from typing import List
+
+from src.ablt_python_api.schemas import BotSchema, StatisticsSchema
+from src.ablt_python_api.utils.codec import default_codec
+from src.ablt_python_api.utils.statistics import STAT_FIELDS, sum_statistics
+from src.ablt_python_api.utils.validation import ResponseValidator
+
+BOTS = 1_000
+ITEMS = 10_000
+ROUNDS = 5
+
+
+def build_bots() -> bytes:
+    """
+    Builds bot catalog response.
+
+    :return: response body
+    """
+    return json.dumps(
+        [
+            {
+                "uid": f"uid-{number}",
+                "slug": f"bot-{number}",
+                "model": "gpt-4",
+                "name": f"Bot {number}",
+                "description": "Bot for benchmark",
+                "welcome_message": "Hi! How can I help you?",
+                "avatar_url": None,
+            }
+            for number in range(BOTS)
+        ]
+    ).encode()
+
+
+def build_statistics() -> bytes:
+    """
+    Builds statistics response.
+
+    :return: response body
+    """
+    start = date(2000, 1, 1)
+    items = [
+        {**dict.fromkeys(STAT_FIELDS, day), "date": (start + timedelta(days=day)).isoformat()} for day in range(ITEMS)
+    ]
+    return json.dumps({"total": sum_statistics(items), "items": items}).encode()
+
+
+def run() -> None:
+    """Runs benchmark and prints cost of each mode."""
+    bots_content, statistics_content = build_bots(), build_statistics()
+    off, lazy, strict = ResponseValidator("off"), ResponseValidator("lazy"), ResponseValidator("strict")
+    cases = {
+        "off (raw dicts)": (
+            lambda: off.typed_many(off.loads(bots_content, BotSchema), BotSchema),
+            lambda: off.typed(off.loads(statistics_content, StatisticsSchema), StatisticsSchema),
+        ),
+        "lazy (not accessed)": (
+            lambda: lazy.typed_many(lazy.loads(bots_content, BotSchema), BotSchema),
+            lambda: lazy.typed(lazy.loads(statistics_content, StatisticsSchema), StatisticsSchema),
+        ),
+        "lazy (all accessed)": (
+            lambda: [bot.slug for bot in lazy.typed_many(lazy.loads(bots_content, BotSchema), BotSchema)],
+            lambda: lazy.typed(lazy.loads(statistics_content, StatisticsSchema), StatisticsSchema).items,
+        ),
+        "strict (from bytes)": (
+            lambda: strict.loads(bots_content, List[BotSchema]),
+            lambda: strict.loads(statistics_content, StatisticsSchema),
+        ),
+        "strict (from dicts)": (
+            lambda: strict.typed_many(default_codec.loads(bots_content), BotSchema),
+            lambda: strict.typed(default_codec.loads(statistics_content), StatisticsSchema),
+        ),
+        "model_validate per object": (
+            lambda: [BotSchema.model_validate(bot) for bot in default_codec.loads(bots_content)],
+            lambda: StatisticsSchema.model_validate(default_codec.loads(statistics_content)),
+        ),
+    }
+    print(f"codec: {default_codec.name}")
+    print(f"{'mode':<28}{f'{BOTS} bots':>14}{f'{ITEMS} items':>14}")
+    for name, (bots, statistics) in cases.items():
+        bots_time = min(repeat(bots, number=1, repeat=ROUNDS))
+        statistics_time = min(repeat(statistics, number=1, repeat=ROUNDS))
+        print(f"{name:<28}{bots_time * 1e3:>11.2f} ms{statistics_time * 1e3:>11.2f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -5,13 +5,100 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 20.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file describes entry point for aBLT chat API.
+Public names are imported from submodules on first access (PEP 562), so e.g. sync API doesn't load aiohttp.
 """
 
-from .ablt_python_api.ablt_api_async import ABLTApi as ABLTApi_async
-from .ablt_python_api.ablt_api_sync import ABLTApi
-from .ablt_python_api.utils.exceptions import DoneException
-from .ablt_python_api.schemas import *
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ablt_python_api.ablt_api_async import ABLTApi as ABLTApi_async
+    from .ablt_python_api.ablt_api_sync import ABLTApi
+    from .ablt_python_api.mock_server import MockABLTServer
+    from .ablt_python_api.records import BotRecord, ChatChunk, StatisticItemRecord
+    from .ablt_python_api.utils.bot_cache import BotCache
+    from .ablt_python_api.utils.bot_index import BotIndex
+    from .ablt_python_api.utils.chat_request import ChatRequest
+    from .ablt_python_api.utils.columnar import StatisticsColumns
+    from .ablt_python_api.utils.exceptions import DoneException
+    from .ablt_python_api.utils.metrics import APIMetrics, MetricsRegistry
+    from .ablt_python_api.utils.request_trace import RequestTrace, RequestTracer
+    from .ablt_python_api.utils.retry import RetryPolicy
+    from .ablt_python_api.utils.statistics_cache import StatisticsCache
+    from .ablt_python_api.utils.statistics_store import StatisticsStore
+    from .ablt_python_api.utils.stream import AsyncChatStream, ChatStream
+    from .ablt_python_api.utils.validation import LazyModel
+    from .ablt_python_api.schemas import (
+        BotSchema,
+        ChatChunkSchema,
+        StatisticItemSchema,
+        StatisticsRequestSchema,
+        StatisticsSchema,
+        StatisticTotalSchema,
+    )
+
+# Public name: (submodule, name in submodule)
+_LAZY_IMPORTS = {
+    "ABLTApi_async": (".ablt_python_api.ablt_api_async", "ABLTApi"),
+    "ABLTApi": (".ablt_python_api.ablt_api_sync", "ABLTApi"),
+    "MockABLTServer": (".ablt_python_api.mock_server", "MockABLTServer"),
+    "BotRecord": (".ablt_python_api.records", "BotRecord"),
+    "ChatChunk": (".ablt_python_api.records", "ChatChunk"),
+    "StatisticItemRecord": (".ablt_python_api.records", "StatisticItemRecord"),
+    "BotCache": (".ablt_python_api.utils.bot_cache", "BotCache"),
+    "BotIndex": (".ablt_python_api.utils.bot_index", "BotIndex"),
+    "ChatRequest": (".ablt_python_api.utils.chat_request", "ChatRequest"),
+    "StatisticsColumns": (".ablt_python_api.utils.columnar", "StatisticsColumns"),
+    "DoneException": (".ablt_python_api.utils.exceptions", "DoneException"),
+    "APIMetrics": (".ablt_python_api.utils.metrics", "APIMetrics"),
+    "MetricsRegistry": (".ablt_python_api.utils.metrics", "MetricsRegistry"),
+    "RequestTrace": (".ablt_python_api.utils.request_trace", "RequestTrace"),
+    "RequestTracer": (".ablt_python_api.utils.request_trace", "RequestTracer"),
+    "RetryPolicy": (".ablt_python_api.utils.retry", "RetryPolicy"),
+    "StatisticsCache": (".ablt_python_api.utils.statistics_cache", "StatisticsCache"),
+    "StatisticsStore": (".ablt_python_api.utils.statistics_store", "StatisticsStore"),
+    "AsyncChatStream": (".ablt_python_api.utils.stream", "AsyncChatStream"),
+    "ChatStream": (".ablt_python_api.utils.stream", "ChatStream"),
+    "LazyModel": (".ablt_python_api.utils.validation", "LazyModel"),
+    "StatisticItemSchema": (".ablt_python_api.schemas", "StatisticItemSchema"),
+    "StatisticTotalSchema": (".ablt_python_api.schemas", "StatisticTotalSchema"),
+    "StatisticsSchema": (".ablt_python_api.schemas", "StatisticsSchema"),
+    "StatisticsRequestSchema": (".ablt_python_api.schemas", "StatisticsRequestSchema"),
+    "BotSchema": (".ablt_python_api.schemas", "BotSchema"),
+    "ChatChunkSchema": (".ablt_python_api.schemas", "ChatChunkSchema"),
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports public name from its submodule on first access.
+
+    :param name: name of the attribute.
+    :type name: str
+    :return: class imported from submodule.
+    :rtype: Any
+    :raises AttributeError: If there is no such public name.
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY_IMPORTS[name]
+    value = getattr(import_module(module, __name__), attribute)
+    # Cache in module, so next access doesn't reach __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    Returns attributes of the module, including public names which aren't imported yet.
+
+    :return: names of attributes.
+    :rtype: list
+    """
+    return sorted({*globals(), *__all__})
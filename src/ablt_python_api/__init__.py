@@ -5,13 +5,100 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 20.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file describes entry point for aBLT chat API.
+Public names are imported from submodules on first access (PEP 562), so e.g. sync API doesn't load aiohttp.
 """
 
-from .ablt_api_async import ABLTApi as ABLTApi_async
-from .ablt_api_sync import ABLTApi
-from .utils.exceptions import DoneException
-from .schemas import *
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ablt_api_async import ABLTApi as ABLTApi_async
+    from .ablt_api_sync import ABLTApi
+    from .mock_server import MockABLTServer
+    from .records import BotRecord, ChatChunk, StatisticItemRecord
+    from .utils.bot_cache import BotCache
+    from .utils.bot_index import BotIndex
+    from .utils.chat_request import ChatRequest
+    from .utils.columnar import StatisticsColumns
+    from .utils.exceptions import DoneException
+    from .utils.metrics import APIMetrics, MetricsRegistry
+    from .utils.request_trace import RequestTrace, RequestTracer
+    from .utils.retry import RetryPolicy
+    from .utils.statistics_cache import StatisticsCache
+    from .utils.statistics_store import StatisticsStore
+    from .utils.stream import AsyncChatStream, ChatStream
+    from .utils.validation import LazyModel
+    from .schemas import (
+        BotSchema,
+        ChatChunkSchema,
+        StatisticItemSchema,
+        StatisticsRequestSchema,
+        StatisticsSchema,
+        StatisticTotalSchema,
+    )
+
+# Public name: (submodule, name in submodule)
+_LAZY_IMPORTS = {
+    "ABLTApi_async": (".ablt_api_async", "ABLTApi"),
+    "ABLTApi": (".ablt_api_sync", "ABLTApi"),
+    "MockABLTServer": (".mock_server", "MockABLTServer"),
+    "BotRecord": (".records", "BotRecord"),
+    "ChatChunk": (".records", "ChatChunk"),
+    "StatisticItemRecord": (".records", "StatisticItemRecord"),
+    "BotCache": (".utils.bot_cache", "BotCache"),
+    "BotIndex": (".utils.bot_index", "BotIndex"),
+    "ChatRequest": (".utils.chat_request", "ChatRequest"),
+    "StatisticsColumns": (".utils.columnar", "StatisticsColumns"),
+    "DoneException": (".utils.exceptions", "DoneException"),
+    "APIMetrics": (".utils.metrics", "APIMetrics"),
+    "MetricsRegistry": (".utils.metrics", "MetricsRegistry"),
+    "RequestTrace": (".utils.request_trace", "RequestTrace"),
+    "RequestTracer": (".utils.request_trace", "RequestTracer"),
+    "RetryPolicy": (".utils.retry", "RetryPolicy"),
+    "StatisticsCache": (".utils.statistics_cache", "StatisticsCache"),
+    "StatisticsStore": (".utils.statistics_store", "StatisticsStore"),
+    "AsyncChatStream": (".utils.stream", "AsyncChatStream"),
+    "ChatStream": (".utils.stream", "ChatStream"),
+    "LazyModel": (".utils.validation", "LazyModel"),
+    "StatisticItemSchema": (".schemas", "StatisticItemSchema"),
+    "StatisticTotalSchema": (".schemas", "StatisticTotalSchema"),
+    "StatisticsSchema": (".schemas", "StatisticsSchema"),
+    "StatisticsRequestSchema": (".schemas", "StatisticsRequestSchema"),
+    "BotSchema": (".schemas", "BotSchema"),
+    "ChatChunkSchema": (".schemas", "ChatChunkSchema"),
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports public name from its submodule on first access.
+
+    :param name: name of the attribute.
+    :type name: str
+    :return: class imported from submodule.
+    :rtype: Any
+    :raises AttributeError: If there is no such public name.
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY_IMPORTS[name]
+    value = getattr(import_module(module, __name__), attribute)
+    # Cache in module, so next access doesn't reach __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    Returns attributes of the module, including public names which aren't imported yet.
+
+    :return: names of attributes.
+    :rtype: list
+    """
+    return sorted({*globals(), *__all__})
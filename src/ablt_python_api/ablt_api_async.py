@@ -5,24 +5,36 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 21.08.2023
+Last Modified: 18.10.2026
 
 Description:
 This file contains an implementation of class for async aBLT chat API.
 """
 
 import asyncio
-import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from os import environ
-from time import sleep
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional, Union
 
 import aiohttp
 
-from .utils.exceptions import DoneException
+from .utils.batch import AsyncChatBatch
+from .utils.bot_cache import BotCache
+from .utils.bot_index import BotIndex
+from .utils.chat_request import ChatRequest
+from .utils.codec import JSONCodec, default_codec
 from .utils.logger_config import setup_logger
+from .utils.metrics import APIMetrics, MetricsRegistry
+from .utils.request_trace import RequestTracer
+from .utils.retry import RetryPolicy
+from .utils.sse import DONE_MARKER, aiter_events
+from .utils.statistics import merge_statistics, split_date_range
+from .utils.statistics_batch import AsyncStatisticsBatch
+from .utils.statistics_cache import StatisticsCache
+from .utils.statistics_store import StatisticsStore
+from .utils.stream import AsyncChatStream, StreamInfo
+from .utils.validation import ResponseValidator
 
 
 class ABLTApi:
@@ -33,6 +45,18 @@ class ABLTApi:
         bearer_token: Optional[str] = None,
         base_api_url: str = "https://api.ablt.ai",
         logger: Optional[logging.Logger] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+        pool_limit: int = 100,
+        pool_limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        lazy: bool = False,
+        json_codec: Optional[JSONCodec] = None,
+        bot_cache: Optional[BotCache] = None,
+        statistics_cache: Optional[StatisticsCache] = None,
+        validation: str = "off",
+        tracer: Optional[RequestTracer] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ):
         """
         Initializes the object with the provided base API URL and bearer token.
@@ -43,6 +67,36 @@ class ABLTApi:
         :type base_api_url: str
         :param logger: default logger.
         :type logger: logger
+        :param session: external session to use, it will not be closed by the API. By default, own session is created.
+        :type session: aiohttp.ClientSession
+        :param pool_limit: total number of simultaneous connections in own pool, 0 means no limit. Default is 100.
+        :type pool_limit: int
+        :param pool_limit_per_host: number of simultaneous connections to the same host, 0 means no limit.
+        :type pool_limit_per_host: int
+        :param keepalive_timeout: time in seconds to keep idle connection alive in own pool. Default is 15 seconds.
+        :type keepalive_timeout: float
+        :param retry_policy: policy to retry health check on API update, see RetryPolicy for defaults.
+        :type retry_policy: RetryPolicy
+        :param lazy: if True, API health isn't checked on init, but on first request. Default is False.
+        :type lazy: bool
+        :param json_codec: JSON codec for requests and responses, by default the fastest installed one is used.
+        :type json_codec: JSONCodec
+        :param bot_cache: cache of bot catalog, see BotCache for defaults, BotCache(ttl=0) disables it (stale
+                          catalog isn't served too).
+        :type bot_cache: BotCache
+        :param statistics_cache: cache of usage statistics for past days. By default, statistics aren't cached.
+        :type statistics_cache: StatisticsCache
+        :param validation: validation of bots and statistics: 'off' (raw dicts), 'lazy' (LazyModel, validated with
+                           schema on attribute access) or 'strict' (models, validated at once). Default is 'off'.
+        :type validation: str
+        :param tracer: tracer to record timing breakdown (DNS, connect, TLS, time to headers, body) of each request of
+                       own session, add tracer.trace_config() to trace configs of external session. By default,
+                       requests aren't traced.
+        :type tracer: RequestTracer
+        :param metrics: registry to collect metrics of requests, retries and chat responses (see APIMetrics), it
+                        traces requests of own session (with tracer, if it's provided). By default, there are no
+                        metrics.
+        :type metrics: MetricsRegistry
 
         Raises:
             TypeError: If the bearer token is not provided.
@@ -60,6 +114,35 @@ class ABLTApi:
         else:
             self.__logger = setup_logger("api", "api.log")
             self.__logger.info("Logger for API now launched!")
+        self.__retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.__lazy = lazy
+        self.__codec = default_codec if json_codec is None else json_codec
+        self.__bot_cache = BotCache() if bot_cache is None else bot_cache
+        self.__statistics_cache = statistics_cache
+        self.__validator = ResponseValidator(validation, self.__codec)
+        self.__metrics = None if metrics is None else APIMetrics(metrics)
+        # Tracer which feeds the metrics, the listener is removed on close
+        self.__metrics_tracer: Optional[RequestTracer] = None
+        if self.__metrics is not None:
+            if tracer is None:
+                tracer = RequestTracer(max_traces=0)
+            tracer.add_listener(self.__metrics)
+            self.__metrics_tracer = tracer
+        self.__typed_bots: tuple = (None, [])
+        self.__bots_refresh: Optional[asyncio.Task] = None
+        self.__api_checked = False
+        self.__chat_url_and_headers: Optional[tuple[str, dict]] = None
+        self.__chat_requests: dict[tuple, ChatRequest] = {}
+        self.__session = session
+        self.__owns_session = session is None
+        # Own sessions by event loop, session can be used and closed only by its own loop
+        self.__sessions: dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self.__trace_configs = None if tracer is None else [tracer.trace_config()]
+        self.__pool_limit = pool_limit
+        self.__pool_limit_per_host = pool_limit_per_host
+        self.__keepalive_timeout = keepalive_timeout
+        if lazy:
+            return
 
         try:
             loop = asyncio.get_event_loop()
@@ -71,6 +154,96 @@ class ABLTApi:
             loop.create_task(self.update_api())
         else:
             loop.run_until_complete(self.update_api())
+            # Own session is bound to this loop, which may never run again, so don't leave it open
+            loop.run_until_complete(self.__close_loop_session())
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> "ABLTApi":
+        """
+        Creates API instance and checks API health without blocking running event loop.
+
+        Accepts the same params as the constructor, 'lazy' param is ignored.
+
+        :return: API instance.
+        :rtype: ABLTApi
+        :raises ConnectionError: If the health check fails for all attempts of the retry policy.
+        """
+        kwargs["lazy"] = True
+        api = cls(*args, **kwargs)
+        await api.update_api()
+        return api
+
+    async def __aenter__(self):
+        """
+        Enters async context manager.
+
+        :return: API instance.
+        :rtype: ABLTApi
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Exits async context manager and closes own session.
+
+        :param exc_type: exception type.
+        :param exc_val: exception value.
+        :param exc_tb: exception traceback.
+        """
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes own session of the running event loop and releases its pooled connections, stops tracing of requests for
+        metrics. External session is left untouched. If API is used in several event loops, call it in each of them.
+        """
+        if self.__bots_refresh is not None and not self.__bots_refresh.done():
+            self.__bots_refresh.cancel()
+        if self.__metrics_tracer is not None:
+            self.__metrics_tracer.remove_listener(self.__metrics)
+            self.__metrics_tracer = None
+        await self.__close_loop_session()
+
+    async def __close_loop_session(self) -> None:
+        """Closes own session of the running event loop."""
+        if not self.__owns_session:
+            return
+        session = self.__sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+        self.__drop_closed_loops()
+        if self.__sessions:
+            self.__logger.warning(
+                "Sessions of %s other event loop(s) are left open, call aclose() in those loops", len(self.__sessions)
+            )
+
+    async def __get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns session with connection pool, own session is created on first use in each event loop.
+
+        :return: session to make requests with.
+        :rtype: aiohttp.ClientSession
+        """
+        if not self.__owns_session and self.__session is not None:
+            return self.__session
+        loop = asyncio.get_running_loop()
+        session = self.__sessions.get(loop)
+        if session is None or session.closed:
+            self.__drop_closed_loops()
+            session = self.__sessions[loop] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.__pool_limit,
+                    limit_per_host=self.__pool_limit_per_host,
+                    keepalive_timeout=self.__keepalive_timeout,
+                ),
+                trace_configs=self.__trace_configs,
+            )
+        return session
+
+    def __drop_closed_loops(self) -> None:
+        """Forgets sessions of closed event loops, their connections are gone with the loop and can't be closed."""
+        for loop in [loop for loop in self.__sessions if loop.is_closed()]:
+            del self.__sessions[loop]
 
     def get_base_api_url(self) -> str:
         """
@@ -100,19 +273,39 @@ class ABLTApi:
         """
         self.__logger = new_logger
 
-    def __get_url_and_headers(self, endpoint: str) -> tuple[str, dict]:
+    def __get_url_and_headers(self, endpoint: str, json_body: bool = False) -> tuple[str, dict]:
         """
         Constructs the URL and headers for an API request.
 
         :param endpoint: The endpoint for the API request.
         :type endpoint: str
+        :param json_body: A flag to add JSON content type header for requests with body.
+        :type json_body: bool
         :return: The URL and headers for the API request.
         :rtype: tuple
         """
         url = f"{self.__base_api_url}/{endpoint}"
         headers = {"Authorization": f"Bearer {self.__bearer_token}"}
+        if json_body:
+            headers["Content-Type"] = "application/json"
         return url, headers
 
+    def __get_chat_url_and_headers(self) -> tuple[str, dict]:
+        """
+        Returns the URL and headers for chat requests, they are built once per base API URL and bearer token.
+
+        :return: The URL and headers for chat request, headers must not be modified.
+        :rtype: tuple
+        """
+        if self.__chat_url_and_headers is None:
+            self.__chat_url_and_headers = self.__get_url_and_headers("v1/chat", json_body=True)
+        return self.__chat_url_and_headers
+
+    async def __ensure_api_checked(self) -> None:
+        """Checks API health on first request in lazy mode."""
+        if self.__lazy and not self.__api_checked:
+            await self.update_api()
+
     async def health_check(self) -> bool:
         """
         Performs a health check on the API.
@@ -121,78 +314,152 @@ class ABLTApi:
         :rtype: bool
         """
         url, headers = self.__get_url_and_headers("health-check")
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("status") == "ok":
-                            self.__logger.info("ABLT chat API is working like a charm")
-                            return True
-                        self.__logger.error("Error: %s", data.get("status"))
-                        try:
-                            self.__logger.error("Error details:")
-                            for error in data["detail"]:
-                                self.__logger.error(
-                                    "  - %s (type: %s, location: %s)", error["msg"], error["type"], error["loc"]
-                                )
-                            self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
-                        except ValueError:
-                            self.__logger.error(
-                                "Error text: %s, x-request-id: %s", response.text, response.headers.get("x-request-id")
-                            )
-                        return False
-                    self.__logger.error(
-                        "Request error: %s, x-request-id: %s", response.status, response.headers.get("x-request-id")
-                    )
+        session = await self.__get_session()
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    data = self.__codec.loads(await response.read())
+                    if data.get("status") == "ok":
+                        self.__logger.info("ABLT chat API is working like a charm")
+                        return True
+                    self.__logger.error("Error: %s", data.get("status"))
                     try:
-                        error_data = await response.json()
                         self.__logger.error("Error details:")
-                        for original_error in error_data["detail"]:
+                        for error in data["detail"]:
                             self.__logger.error(
-                                "  - %s (type: %s, location: %s)",
-                                original_error["msg"],
-                                original_error["type"],
-                                original_error["loc"],
+                                "  - %s (type: %s, location: %s)", error["msg"], error["type"], error["loc"]
                             )
                         self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
-                    except (ValueError, aiohttp.ContentTypeError):
+                    except ValueError:
                         self.__logger.error(
                             "Error text: %s, x-request-id: %s", response.text, response.headers.get("x-request-id")
                         )
                     return False
-            except aiohttp.ClientConnectorError:
-                self.__logger.error("Error: Connection to aBLT API couldn't be established, check URL: %s", url)
+                self.__logger.error(
+                    "Request error: %s, x-request-id: %s", response.status, response.headers.get("x-request-id")
+                )
+                try:
+                    error_data = await response.json()
+                    self.__logger.error("Error details:")
+                    for original_error in error_data["detail"]:
+                        self.__logger.error(
+                            "  - %s (type: %s, location: %s)",
+                            original_error["msg"],
+                            original_error["type"],
+                            original_error["loc"],
+                        )
+                    self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
+                except (ValueError, aiohttp.ContentTypeError):
+                    self.__logger.error(
+                        "Error text: %s, x-request-id: %s", response.text, response.headers.get("x-request-id")
+                    )
                 return False
+        except aiohttp.ClientConnectorError:
+            self.__logger.error("Error: Connection to aBLT API couldn't be established, check URL: %s", url)
+            return False
 
-    async def get_bots(self) -> list[dict]:
+    async def get_bots(self, force_refresh: bool = False) -> list:
         """
         Retrieves all published bots.
 
-        :return: A list of dictionaries containing bot information (BotSchema), or an empty list if an error occurs.
-        :rtype: list[dict]
+        Bot catalog is cached: fresh catalog is returned from memory, stale one is returned from memory and
+        refreshed in background task, otherwise it's revalidated (or downloaded) before return.
+
+        :param force_refresh: revalidate catalog even if it's fresh. Default is False.
+        :type force_refresh: bool
+        :return: A list of bots (dicts, LazyModel or BotSchema depending on validation mode), or an empty list if
+                 an error occurs.
+        :rtype: list
+        """
+        return self.__get_typed_bots(await self.get_bot_index(force_refresh))
+
+    def __get_typed_bots(self, index: BotIndex) -> list:
+        """
+        Returns bots of the index according to validation mode, they are converted once per catalog.
+
+        :param index: index of bots.
+        :type index: BotIndex
+        :return: list of bots (dicts, LazyModel or BotSchema).
+        :rtype: list
+        """
+        if self.__validator.mode == "off":
+            return index.bots
+        typed_index, bots = self.__typed_bots
+        if typed_index is not index:
+            bots = self.__validator.typed_many(index.bots, "BotSchema")
+            self.__typed_bots = (index, bots)
+        return list(bots)
+
+    async def get_bot_index(self, force_refresh: bool = False) -> BotIndex:
+        """
+        Retrieves index of all published bots for constant-time lookups, it's cached like get_bots.
+
+        :param force_refresh: revalidate catalog even if it's fresh. Default is False.
+        :type force_refresh: bool
+        :return: index of bots, empty if an error occurs.
+        :rtype: BotIndex
+        """
+        await self.__ensure_api_checked()
+        if not force_refresh:
+            index = self.__bot_cache.get_index()
+            if index is not None:
+                if not self.__bot_cache.is_fresh and self.__bot_cache.begin_refresh():
+                    self.__bots_refresh = asyncio.ensure_future(self.__refresh_bots())
+                return index
+        return await self.__fetch_bots()
+
+    async def __fetch_bots(self) -> BotIndex:
+        """
+        Downloads bot catalog or revalidates cached one with conditional request.
+
+        :return: index of bots, empty if an error occurs.
+        :rtype: BotIndex
         """
         url, headers = self.__get_url_and_headers("v1/bots")
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
+        validators = self.__bot_cache.validators()
+        headers.update(validators)
+        session = await self.__get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 304:
+                index = self.__bot_cache.revalidated()
+                if index is not None:
+                    return index
+                # Catalog was invalidated while request was in progress
+                return await self.__fetch_bots() if validators else BotIndex()
+            if response.status == 200:
+                return self.__bot_cache.store(
+                    self.__codec.loads(await response.read()),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                )
+            self.__logger.error(
+                "Request error: %s, x-request-id: %s", response.status, response.headers.get("x-request-id")
+            )
+            try:
+                error_data = await response.json()
                 self.__logger.error(
-                    "Request error: %s, x-request-id: %s", response.status, response.headers.get("x-request-id")
+                    "Error details: %s, x-request-id: %s", error_data, response.headers.get("x-request-id")
                 )
-                try:
-                    error_data = await response.json()
-                    self.__logger.error(
-                        "Error details: %s, x-request-id: %s", error_data, response.headers.get("x-request-id")
-                    )
-                except (ValueError, aiohttp.ContentTypeError):
-                    self.__logger.error(
-                        "Error text: %s, x-request-id: %s", await response.text(), response.headers.get("x-request-id")
-                    )
-                return []
+            except (ValueError, aiohttp.ContentTypeError):
+                self.__logger.error(
+                    "Error text: %s, x-request-id: %s", await response.text(), response.headers.get("x-request-id")
+                )
+            return BotIndex()
+
+    async def __refresh_bots(self) -> None:
+        """Refreshes stale bot catalog in background task."""
+        try:
+            await self.__fetch_bots()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.__logger.warning("WARNING: Bot catalog refresh failed: %s", err)
+        finally:
+            self.__bot_cache.end_refresh()
 
-    # pylint: disable=R0914,R0912,R0915
-    async def chat(
+    def invalidate_bots(self) -> None:
+        """Drops cached bot catalog, so it will be downloaded on the next request."""
+        self.__bot_cache.invalidate()
+
+    def chat(
         self,
         bot_uid: Optional[str] = None,
         bot_slug: Optional[str] = None,
@@ -204,7 +471,11 @@ class ABLTApi:
         assumptions: Optional[dict] = None,
         max_words: Optional[int] = None,
         use_search: Optional[bool] = False,
-    ):
+        raise_on_done: bool = True,
+        request: Optional[ChatRequest] = None,
+        timing: bool = False,
+        on_finish: Optional[Callable[[StreamInfo], None]] = None,
+    ) -> AsyncChatStream:
         """
         Sends a chat request to the API and returns the response.
         :param bot_uid: The id of the bot to chat with.
@@ -229,127 +500,233 @@ class ABLTApi:
         :type max_words: int
         :param use_search: A flag for using search mode (default is False).
         :type use_search: bool
-        :return: The response message from the bot or None in case of an error.
-        :rtype: yield
-        :raises DoneException: If the bot is done with the conversation.
+        :param raise_on_done: raise DoneException when the bot is done (default is True, legacy behaviour), otherwise
+            iteration just stops. Metadata of the response (chunks, bytes, duration, etc.) is kept by returned stream.
+        :type raise_on_done: bool
+        :param request: reusable request with pre-encoded bot and other params, if it's provided, 'bot_uid',
+            'bot_slug', 'stream', 'user_id', 'language', 'assumptions', 'max_words' and 'use_search' are ignored.
+        :type request: ChatRequest
+        :param timing: record arrival time of each message, time to first token, gaps between messages and rate are
+            available on returned stream (see 'metrics' method), it has negligible overhead if it's disabled.
+        :type timing: bool
+        :param on_finish: callback, which is called with returned stream when it's finished or closed (e.g. to export
+            its metrics), it enables timing.
+        :type on_finish: Callable[[StreamInfo], None]
+        :return: The stream of response messages from the bot, it's empty in case of an error.
+        :rtype: AsyncChatStream
+        :raises DoneException: If the bot is done with the conversation and 'raise_on_done' is True.
 
         Important: Only one of the parameters 'prompt' or 'messages' should be provided.
                    Only one of the parameters 'bot_uid' or 'bot_slug' should be provided.
 
         Errors:
         - If both 'prompt' and 'messages' parameters are missing or provided simultaneously, the function
-          will print an error message and return None.
+          will print an error message and return empty stream.
         - If the 'messages' parameter is provided, but its elements do not have the required keys or
-          their values are not of the correct type, the function will print an error message and return None.
+          their values are not of the correct type, the function will print an error message and return empty stream.
 
         Raises:
-            DoneException: If the bot is done with the conversation.
+            DoneException: If the bot is done with the conversation and 'raise_on_done' is True.
         """
+        if self.__metrics is not None:
+            on_finish = self.__metrics.on_finish(on_finish)
+        chat_stream = AsyncChatStream(raise_on_done, timing, on_finish)
         if (prompt is None and messages is None) or (prompt is not None and messages is not None):
             self.__logger.error("Error: Only one param is required ('prompt' or 'messages')")
-            return
+            return chat_stream
 
-        if (not bot_slug and not bot_uid) or (bot_slug and bot_uid):
-            self.__logger.error("Error: Only one param is required ('bot_slug' or 'bot_uid')")
-            return
+        if request is None:
+            if (not bot_slug and not bot_uid) or (bot_slug and bot_uid):
+                self.__logger.error("Error: Only one param is required ('bot_slug' or 'bot_uid')")
+                return chat_stream
+            request = self.__get_chat_request(
+                bot_uid, bot_slug, stream, user_id, language, assumptions, max_words, use_search
+            )
+        return chat_stream.attach(self.__chat_messages(chat_stream, request, prompt, messages))
 
-        url, headers = self.__get_url_and_headers("v1/chat")
-        payload = {
-            "stream": stream,
-            **({"bot_slug": bot_slug} if bot_slug is not None else {}),
-            **({"bot_uid": bot_uid} if bot_uid is not None else {}),
-            **({"language": language} if language is not None else {}),
-            **({"max_words": max_words} if max_words is not None else {}),
-            **({"assumptions": assumptions} if assumptions is not None else {}),
-            **({"prompt": prompt} if prompt is not None else {}),
-            **({"messages": messages} if messages is not None else {}),
-            **({"user_id": user_id} if user_id is not None else {}),
-            **({"use_search": use_search} if use_search is not None else {}),
-        }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 200:
-                    if stream:
-                        try:
-                            async for line in response.content.iter_any():
-                                if line:
-                                    line_data = line.decode("utf-8").splitlines()
-                                    for data in line_data:
-                                        if data.startswith("data:"):
-                                            if "[DONE]" in data:
-                                                raise DoneException
-                                            data = data[5:].strip()
-                                            try:
-                                                message_data = json.loads(data)
-                                            except json.JSONDecodeError:
-                                                self.__logger.error("Seems json malformed %s", line)
-                                                continue
-                                            content = message_data.get("content")
-                                            message = message_data.get("message")
-                                            if content is not None:
-                                                yield content
-                                            elif message is not None:
-                                                yield message
-                        finally:
-                            await response.release()
-                    else:
-                        response_json = await response.json()
+    # pylint: disable=too-many-arguments
+    def __get_chat_request(
+        self,
+        bot_uid: Optional[str],
+        bot_slug: Optional[str],
+        stream: Optional[bool],
+        user_id: Optional[int],
+        language: Optional[str],
+        assumptions: Optional[dict],
+        max_words: Optional[int],
+        use_search: Optional[bool],
+    ) -> ChatRequest:
+        """
+        Returns chat request for the params, requests without assumptions are reused for the same params.
 
-                        if "message" in response_json:
-                            message = response_json.get("message")
-                        elif "content" in response_json:
-                            message = response_json.get("content")
-                        else:
-                            self.__logger.error(
-                                "Response malformed! Actual response is: %s, x-request-id: %s",
-                                response_json,
-                                response.headers.get("x-request-id"),
-                            )
-                            return
-                        yield message
-                else:
-                    self.__logger.error("Error: %s", response.status)
+        :param bot_uid: The id of the bot to chat with.
+        :type bot_uid: str
+        :param bot_slug: The slug of the bot to chat with.
+        :type bot_slug: str
+        :param stream: A flag for streaming mode.
+        :type stream: bool
+        :param user_id: The user identifier.
+        :type user_id: int
+        :param language: The language of the chat.
+        :type language: str
+        :param assumptions: The assumptions for the chat.
+        :type assumptions: dict
+        :param max_words: The maximum number of words in the response.
+        :type max_words: int
+        :param use_search: A flag for using search mode.
+        :type use_search: bool
+        :return: chat request.
+        :rtype: ChatRequest
+        """
+        if assumptions is not None:
+            # Assumptions may be changed by caller between calls, so they are encoded each time
+            return ChatRequest(
+                bot_uid, bot_slug, stream, user_id, language, assumptions, max_words, use_search, self.__codec
+            )
+        key = (bot_uid, bot_slug, stream, user_id, language, max_words, use_search)
+        request = self.__chat_requests.get(key)
+        if request is None:
+            if len(self.__chat_requests) >= 256:
+                self.__chat_requests.clear()
+            request = ChatRequest(
+                bot_uid, bot_slug, stream, user_id, language, None, max_words, use_search, self.__codec
+            )
+            self.__chat_requests[key] = request
+        return request
+
+    def chat_many(self, chat_requests: Iterable[dict], concurrency: int = 10, ordered: bool = True) -> AsyncChatBatch:
+        """
+        Sends many chat requests concurrently over the pooled session and returns results as they are completed.
+
+        Errors of single requests are captured in results and don't abort the batch. Keep 'pool_limit' not less than
+        'concurrency', otherwise requests wait for free connections.
+
+        :param chat_requests: chat params for each request, e.g. {"bot_slug": "omni", "prompt": "Hi!"}.
+        :type chat_requests: Iterable[dict]
+        :param concurrency: maximum number of simultaneous requests. Default is 10.
+        :type concurrency: int
+        :param ordered: yield results in order of requests (True) or as soon as they are completed (False).
+        :type ordered: bool
+        :return: async iterator over results (ChatResult), which keeps aggregate statistics (throughput, etc.).
+        :rtype: AsyncChatBatch
+        """
+        return AsyncChatBatch(self.chat, chat_requests, concurrency, ordered)
+
+    # pylint: disable=R0912
+    async def __chat_messages(
+        self, chat_stream: AsyncChatStream, request: ChatRequest, prompt: Optional[str], messages: Optional[list]
+    ):
+        """
+        Sends a chat request to the API and yields messages from the bot.
+
+        :param chat_stream: stream to keep metadata of the response.
+        :type chat_stream: AsyncChatStream
+        :param request: chat request with static params.
+        :type request: ChatRequest
+        :param prompt: The text prompt for the bot.
+        :type prompt: str
+        :param messages: A list of messages for the bot.
+        :type messages: list[dict]
+        :return: The response message from the bot.
+        :rtype: yield
+        """
+        await self.__ensure_api_checked()
+        url, headers = self.__get_chat_url_and_headers()
+        session = await self.__get_session()
+        chat_stream.mark_request_sent()
+        async with session.post(url, headers=headers, data=request.encode(prompt, messages)) as response:
+            chat_stream.mark_headers_received()
+            if response.status == 200:
+                if request.stream:
                     try:
-                        error_data = await response.json()
-                        self.__logger.error("Error details:")
-                        if isinstance(error_data["detail"], str):
-                            self.__logger.error("  - %s", error_data["detail"])
-                        else:
-                            for error in error_data["detail"]:
-                                if error.get("msg") and error.get("type") and error.get("loc"):
-                                    self.__logger.error(
-                                        "  - %s (type: %s, location: %s)", error["msg"], error["type"], error["loc"]
-                                    )
-                                else:
-                                    self.__logger.error("  - %s", error)
-                        self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
-                    except (ValueError, aiohttp.ContentTypeError):
-                        error_text = await response.text()
+                        # Each data line of aBLT stream is a message, even without blank line after it
+                        async for event in aiter_events(
+                            chat_stream.atrack_chunks(response.content.iter_any()), split_data=True
+                        ):
+                            chat_stream.events += 1
+                            if event.data == DONE_MARKER:
+                                chat_stream.done = True
+                                return
+                            try:
+                                message_data = self.__codec.loads(event.data)
+                            except ValueError:
+                                self.__logger.error("Seems json malformed %s", event.data)
+                                continue
+                            content = message_data.get("content")
+                            message = message_data.get("message")
+                            if content is not None:
+                                yield content
+                            elif message is not None:
+                                yield message
+                    finally:
+                        await response.release()
+                else:
+                    body = await response.read()
+                    chat_stream.chunks = 1
+                    chat_stream.bytes = len(body)
+                    response_json = self.__codec.loads(body)
+
+                    if "message" in response_json:
+                        message = response_json.get("message")
+                    elif "content" in response_json:
+                        message = response_json.get("content")
+                    else:
                         self.__logger.error(
-                            "Error text: %s, x-request-id: %s", error_text, response.headers.get("x-request-id")
+                            "Response malformed! Actual response is: %s, x-request-id: %s",
+                            response_json,
+                            response.headers.get("x-request-id"),
                         )
-                    return
+                        return
+                    yield message
+            else:
+                self.__logger.error("Error: %s", response.status)
+                try:
+                    error_data = await response.json()
+                    self.__logger.error("Error details:")
+                    if isinstance(error_data["detail"], str):
+                        self.__logger.error("  - %s", error_data["detail"])
+                    else:
+                        for error in error_data["detail"]:
+                            if error.get("msg") and error.get("type") and error.get("loc"):
+                                self.__logger.error(
+                                    "  - %s (type: %s, location: %s)", error["msg"], error["type"], error["loc"]
+                                )
+                            else:
+                                self.__logger.error("  - %s", error)
+                    self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
+                except (ValueError, aiohttp.ContentTypeError):
+                    error_text = await response.text()
+                    self.__logger.error(
+                        "Error text: %s, x-request-id: %s", error_text, response.headers.get("x-request-id")
+                    )
+                return
 
     async def update_api(self) -> None:
         """
-        Updates the API by calling the health_check function.
+        Updates the API by calling the health_check function, retries are made according to the retry policy.
 
-        :raises ConnectionError: If the health_check function fails 10 times in a row.
+        :raises ConnectionError: If the health_check function fails for all attempts of the retry policy.
 
         Raises:
-            ConnectionError: If the health_check function fails 10 times in a row.
-        """
-        retries = 0
-        while retries < 10:
-            if not await self.health_check():
-                retries += 1
-                self.__logger.warning("WARNING: Seems something nasty happened with aBLT api, trying %s/10", retries)
-                sleep(5)
-            else:
-                break
-        if retries >= 10:
-            raise ConnectionError("ERROR: Connection to aBLT API couldn't be established")
+            ConnectionError: If the health_check function fails for all attempts of the retry policy.
+        """
+        delays = self.__retry_policy.delays()
+        attempt = 1
+        while not await self.health_check():
+            delay = next(delays, None)
+            if delay is None:
+                raise ConnectionError("ERROR: Connection to aBLT API couldn't be established")
+            attempt += 1
+            if self.__metrics is not None:
+                self.__metrics.retry("health_check")
+            self.__logger.warning(
+                "WARNING: Seems something nasty happened with aBLT api, trying %s/%s in %.2f s",
+                attempt,
+                self.__retry_policy.max_attempts,
+                delay,
+            )
+            await asyncio.sleep(delay)
+        self.__api_checked = True
 
     async def set_base_api_url(self, new_base_api_url: str, instant_update: bool = False):
         """
@@ -361,6 +738,9 @@ class ABLTApi:
         :type instant_update: bool
         """
         self.__base_api_url = new_base_api_url
+        self.__api_checked = False
+        self.__chat_url_and_headers = None
+        self.__bot_cache.invalidate()
         if instant_update:
             await self.update_api()
 
@@ -374,6 +754,9 @@ class ABLTApi:
         :type instant_update: bool
         """
         self.__bearer_token = new_bearer_token
+        self.__api_checked = False
+        self.__chat_url_and_headers = None
+        self.__bot_cache.invalidate()
         if instant_update:
             await self.update_api()
 
@@ -394,54 +777,61 @@ class ABLTApi:
             await self.set_base_api_url(new_base_api_url)
         await self.update_api()
 
-    async def find_bot_by_uid(self, bot_uid: str) -> Optional[dict]:
+    async def find_bot_by_uid(self, bot_uid: str) -> Optional[Any]:
         """
-        Searches for a bot by its id in the bot list.
+        Searches for a bot by its id in the cached bot index.
 
         :param bot_uid: The id of the bot to search for.
         :type bot_uid: str
-        :return: bot dict (BotSchema).
-        :rtype: dict|None
+        :return: bot (dict, LazyModel or BotSchema depending on validation mode).
+        :rtype: dict|LazyModel|BotSchema|None
         """
-        for bot_info in await self.get_bots():
-            if bot_info.get("uid") == bot_uid:
-                return bot_info
-        return None
+        return self.__validator.typed((await self.get_bot_index()).by_uid(bot_uid), "BotSchema")
 
-    async def find_bot_by_slug(self, bot_slug: str) -> Optional[dict]:
+    async def find_bot_by_slug(self, bot_slug: str) -> Optional[Any]:
         """
-        Searches for a bot by its slug in the bot list.
+        Searches for a bot by its slug in the cached bot index.
 
         :param bot_slug: The slug of the bot to search for.
         :type bot_slug: str
-        :return: bot dict (BotSchema).
-        :rtype: dict|None
+        :return: bot (dict, LazyModel or BotSchema depending on validation mode).
+        :rtype: dict|LazyModel|BotSchema|None
         """
-        for bot_info in await self.get_bots():
-            if bot_info.get("slug") == bot_slug:
-                return bot_info
-        return None
+        return self.__validator.typed((await self.get_bot_index()).by_slug(bot_slug), "BotSchema")
 
-    async def find_bot_by_name(self, bot_name: str) -> Optional[dict]:
+    async def find_bot_by_name(self, bot_name: str, case_sensitive: bool = True) -> Optional[Any]:
         """
-        Searches for a bot by its name in the bot list.
+        Searches for a bot by its name in the cached bot index.
 
         :param bot_name: The name of the bot to search for.
         :type bot_name: str
-        :return: bot dict (BotSchema).
-        :rtype: dict|None
+        :param case_sensitive: compare names case-sensitively. Default is True.
+        :type case_sensitive: bool
+        :return: bot (dict, LazyModel or BotSchema depending on validation mode).
+        :rtype: dict|LazyModel|BotSchema|None
         """
-        for bot_info in await self.get_bots():
-            if bot_info.get("name") == bot_name:
-                return bot_info
-        return None
+        return self.__validator.typed((await self.get_bot_index()).by_name(bot_name, case_sensitive), "BotSchema")
+
+    async def find_bots_by_model(self, model: str) -> list:
+        """
+        Searches for bots using the model in the cached bot index.
+
+        :param model: The model of the bots to search for, e.g. 'gpt-4'.
+        :type model: str
+        :return: list of bots (dicts, LazyModel or BotSchema depending on validation mode), empty if there are no
+                 such bots.
+        :rtype: list
+        """
+        return self.__validator.typed_many((await self.get_bot_index()).by_model(model), "BotSchema")
 
     async def get_usage_statistics(
         self,
         user_id: Optional[int] = -1,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-    ) -> Optional[dict]:
+        window: Optional[Union[str, int]] = None,
+        concurrency: int = 4,
+    ) -> Optional[Any]:
         """
         Retrieves usage statistics for the API.
 
@@ -451,33 +841,173 @@ class ABLTApi:
         :type start_date: str
         :param end_date: The end date for the statistics in format YYYY-MM-DD.
         :type end_date: str
-        :return: The response message from the bot (StatisticsSchema) or None in case of an error.
-        :rtype: dict|None
+        :param window: split long range into windows: 'week', 'month' or number of days, they are fetched
+                       concurrently and merged (items are joined, total is recomputed). By default, range isn't split.
+        :type window: str | int
+        :param concurrency: maximum number of simultaneous requests for split range. Default is 4.
+        :type concurrency: int
+        :return: statistics (dict, LazyModel or StatisticsSchema depending on validation mode) or None in case of
+                 an error.
+        :rtype: dict|LazyModel|StatisticsSchema|None
+        """
+        stats = await self.__get_usage_statistics(user_id, start_date, end_date, window, concurrency, typed=True)
+        return self.__validator.typed(stats, "StatisticsSchema")
+
+    async def __get_usage_statistics(
+        self,
+        user_id: Optional[int] = -1,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        window: Optional[Union[str, int]] = None,
+        concurrency: int = 4,
+        typed: bool = False,
+    ) -> Optional[Any]:
+        """
+        Retrieves usage statistics as dict, see get_usage_statistics for params.
+
+        :param typed: single response may be validated from bytes in strict mode (then model is returned).
+        :type typed: bool
+        :return: statistics (StatisticsSchema dict or model if typed) or None in case of an error.
+        :rtype: dict|StatisticsSchema|None
         """
         if not isinstance(user_id, int):
             self.__logger.error("Error: user_id should be int")
             return None
         start_date = datetime.now().strftime("%Y-%m-%d") if start_date is None else start_date
         end_date = datetime.now().strftime("%Y-%m-%d") if end_date is None else end_date
-        url, headers = self.__get_url_and_headers("v1/user/usage-statistics")
+        await self.__ensure_api_checked()
+        if concurrency < 1:
+            raise ValueError("concurrency should be at least 1")
+        cache = self.__statistics_cache
+        # Statistics of another token or API are kept in shared cache apart
+        scope = "" if cache is None else cache.scope_of(self.__bearer_token, self.__base_api_url)
+        try:
+            if cache is None:
+                ranges = [(start_date, end_date)]
+            else:
+                ranges = cache.missing_ranges(user_id, start_date, end_date, scope)
+            if window is not None:
+                ranges = [dates for missing in ranges for dates in split_date_range(*missing, window)]
+        except ValueError as error:
+            if window is not None:
+                self.__logger.error("Error: %s", error)
+                return None
+            # Malformed dates are reported by API
+            return await self.__fetch_usage_statistics(user_id, start_date, end_date, typed)
+        if cache is None and len(ranges) <= 1:
+            return await self.__fetch_usage_statistics(user_id, start_date, end_date, typed)
+        parts = await self.__fetch_usage_statistics_ranges(user_id, ranges, concurrency)
+        fetched = [part for part in parts if part is not None]
+        if cache is None or len(fetched) < len(parts):
+            return merge_statistics(parts)
+        for (range_start, range_end), part in zip(ranges, fetched):
+            cache.put(user_id, range_start, range_end, part.get("items") or [], scope)
+        return merge_statistics([{"items": cache.get_items(user_id, start_date, end_date, scope)}, *fetched])
+
+    def get_usage_statistics_for_users(
+        self,
+        user_ids: Iterable[int],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        concurrency: int = 10,
+    ) -> AsyncStatisticsBatch:
+        """
+        Retrieves usage statistics for many users concurrently over the pooled session.
+
+        Results are returned as soon as they are completed, combined total of succeeded users is kept by the batch.
+        Keep 'pool_limit' not less than 'concurrency', otherwise requests wait for free connections.
+
+        :param user_ids: The ids of the users to get statistics for.
+        :type user_ids: Iterable[int]
+        :param start_date: The start date for the statistics in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: The end date for the statistics in format YYYY-MM-DD.
+        :type end_date: str
+        :param concurrency: maximum number of simultaneous requests. Default is 10.
+        :type concurrency: int
+        :return: async iterator over results (UserStatisticsResult, statistics depend on validation mode), which
+                 keeps combined total and failed users.
+        :rtype: AsyncStatisticsBatch
+        """
+        start_date = datetime.now().strftime("%Y-%m-%d") if start_date is None else start_date
+        end_date = datetime.now().strftime("%Y-%m-%d") if end_date is None else end_date
+        return AsyncStatisticsBatch(
+            lambda user_id: self.__get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date),
+            user_ids,
+            concurrency,
+            lambda stats: self.__validator.typed(stats, "StatisticsSchema"),
+        )
+
+    async def __fetch_usage_statistics_ranges(
+        self, user_id: int, ranges: list[tuple[str, str]], concurrency: int
+    ) -> list[Optional[dict]]:
+        """
+        Fetches usage statistics for date ranges concurrently.
+
+        :param user_id: The id of the user to get statistics for.
+        :type user_id: int
+        :param ranges: list of (start_date, end_date) pairs.
+        :type ranges: list[tuple[str, str]]
+        :param concurrency: maximum number of simultaneous requests.
+        :type concurrency: int
+        :return: statistics (StatisticsSchema) for each range, None for failed ones.
+        :rtype: list[dict | None]
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_range(range_start: str, range_end: str) -> Optional[dict]:
+            """
+            Fetches statistics for a range, no more than 'concurrency' ranges at once.
+
+            :param range_start: start date of the range.
+            :type range_start: str
+            :param range_end: end date of the range.
+            :type range_end: str
+            :return: statistics (StatisticsSchema) or None in case of an error.
+            :rtype: dict|None
+            """
+            async with semaphore:
+                return await self.__fetch_usage_statistics(user_id, range_start, range_end)
+
+        return list(await asyncio.gather(*(fetch_range(*dates) for dates in ranges)))
+
+    async def __fetch_usage_statistics(
+        self, user_id: int, start_date: str, end_date: str, typed: bool = False
+    ) -> Optional[Any]:
+        """
+        Fetches usage statistics for the date range with single request.
+
+        :param user_id: The id of the user to get statistics for.
+        :type user_id: int
+        :param start_date: The start date for the statistics in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: The end date for the statistics in format YYYY-MM-DD.
+        :type end_date: str
+        :param typed: validate response from bytes in strict mode.
+        :type typed: bool
+        :return: statistics (StatisticsSchema dict or model if typed) or None in case of an error.
+        :rtype: dict|StatisticsSchema|None
+        """
+        url, headers = self.__get_url_and_headers("v1/user/usage-statistics", json_body=True)
         payload = {"user_id": user_id, "start_date": start_date, "end_date": end_date}
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers) as response:
-                if response.status == 200:
-                    return await response.json()
+        session = await self.__get_session()
+        async with session.post(url, data=self.__codec.dumps(payload), headers=headers) as response:
+            if response.status == 200:
+                content = await response.read()
+                return self.__validator.loads(content, "StatisticsSchema") if typed else self.__codec.loads(content)
+            self.__logger.error(
+                "Request error: %s, x-request-id: %s", response.status, response.headers.get("x-request-id")
+            )
+            try:
+                error_data = await response.json()
                 self.__logger.error(
-                    "Request error: %s, x-request-id: %s", response.status, response.headers.get("x-request-id")
+                    "Error details: %s, x-request-id: %s", error_data, response.headers.get("x-request-id")
                 )
-                try:
-                    error_data = await response.json()
-                    self.__logger.error(
-                        "Error details: %s, x-request-id: %s", error_data, response.headers.get("x-request-id")
-                    )
-                except (ValueError, aiohttp.ContentTypeError):
-                    self.__logger.error(
-                        "Error text: %s, x-request-id: %s", await response.text(), response.headers.get("x-request-id")
-                    )
-                return None
+            except (ValueError, aiohttp.ContentTypeError):
+                self.__logger.error(
+                    "Error text: %s, x-request-id: %s", await response.text(), response.headers.get("x-request-id")
+                )
+            return None
 
     async def get_statistics_for_a_day(self, date: Optional[str] = None, user_id: Optional[int] = -1) -> Optional[dict]:
         """
@@ -487,20 +1017,20 @@ class ABLTApi:
         :type date: str
         :param user_id: The id of the user to get statistics for.
         :type user_id: int
-        :return: dict with statistics for a day.
-        :rtype: dict | None.
+        :return: statistics for a day (dict, LazyModel or StatisticItemSchema depending on validation mode).
+        :rtype: dict | LazyModel | StatisticItemSchema | None.
         """
         if not isinstance(user_id, int):
             self.__logger.error("Error: user_id should be int")
             return None
         date = datetime.now().strftime("%Y-%m-%d") if date is None else date
-        stats = await self.get_usage_statistics(user_id=user_id, start_date=date, end_date=date)
+        stats = await self.__get_usage_statistics(user_id=user_id, start_date=date, end_date=date)
         if stats:
             items = stats.get("items")
             if items is not None:
                 for usage_info in items:
                     if usage_info.get("date") == date:
-                        return usage_info
+                        return self.__validator.typed(usage_info, "StatisticItemSchema")
         return None
 
     async def get_statistics_total(
@@ -515,13 +1045,58 @@ class ABLTApi:
         :type start_date: str
         :param end_date: end date for statistics.
         :type end_date: str
-        :return: dict (StatisticTotalSchema) with total statistics.
-        :rtype: dict
+        :return: total statistics (dict, LazyModel or StatisticTotalSchema depending on validation mode).
+        :rtype: dict | LazyModel | StatisticTotalSchema | None
         """
         if not isinstance(user_id, int):
             self.__logger.error("Error: user_id should be int")
             return None
         start_date = datetime.now().strftime("%Y-%m-%d") if start_date is None else start_date
         end_date = datetime.now().strftime("%Y-%m-%d") if end_date is None else end_date
-        stats = await self.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
-        return stats.get("total") if stats is not None else None
+        stats = await self.__get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+        return self.__validator.typed(stats.get("total"), "StatisticTotalSchema") if stats is not None else None
+
+    async def sync_usage_statistics(
+        self,
+        store: StatisticsStore,
+        user_id: Optional[int] = -1,
+        start_date: Optional[str] = None,
+        window: Optional[Union[str, int]] = None,
+        concurrency: int = 4,
+    ) -> Optional[int]:
+        """
+        Syncs usage statistics of the user into local store: only days after the watermark of the user are requested.
+
+        Then reports are built with the store (get_statistics_total, get_statistics_for_a_day, etc.) without requests,
+        statistics are kept by scope of the account: StatisticsStore.scope_of(bearer token, base API URL).
+
+        :param store: local store of statistics.
+        :type store: StatisticsStore
+        :param user_id: The id of the user to sync statistics for.
+        :type user_id: int
+        :param start_date: The first day to sync in format YYYY-MM-DD, used only if the user was never synced.
+                           By default, today.
+        :type start_date: str
+        :param window: split long range into windows: 'week', 'month' or number of days, see get_usage_statistics.
+        :type window: str | int
+        :param concurrency: maximum number of simultaneous requests for split range. Default is 4.
+        :type concurrency: int
+        :return: number of synced items or None in case of an error.
+        :rtype: int | None
+        """
+        if not isinstance(user_id, int):
+            self.__logger.error("Error: user_id should be int")
+            return None
+        end_date = datetime.now().strftime("%Y-%m-%d")
+        scope = store.scope_of(self.__bearer_token, self.__base_api_url)
+        watermark = store.get_watermark(user_id, scope)
+        if watermark is not None:
+            start_date = (datetime.strptime(watermark, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        elif start_date is None:
+            start_date = end_date
+        stats = await self.__get_usage_statistics(
+            user_id=user_id, start_date=start_date, end_date=end_date, window=window, concurrency=concurrency
+        )
+        if stats is None:
+            return None
+        return store.put(user_id, start_date, end_date, stats.get("items") or [], scope)
@@ -5,23 +5,39 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 20.11.2023
-Last Modified: 21.08.2024
+Last Modified: 18.10.2026
 
 Description:
 This file contains an implementation of class for sync aBLT chat API.
 """
 
-import json
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from os import environ
+from threading import Thread
 from time import sleep
-from typing import Optional
+from typing import Any, Callable, Iterable, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from .utils.exceptions import DoneException
+from .utils.batch import ChatBatch
+from .utils.bot_cache import BotCache
+from .utils.bot_index import BotIndex
+from .utils.chat_request import ChatRequest
+from .utils.codec import JSONCodec, default_codec
 from .utils.logger_config import setup_logger
+from .utils.metrics import APIMetrics, MetricsRegistry
+from .utils.request_trace import RequestTracer
+from .utils.retry import RetryPolicy
+from .utils.sse import DONE_MARKER, iter_events
+from .utils.statistics import merge_statistics, split_date_range
+from .utils.statistics_batch import StatisticsBatch
+from .utils.statistics_cache import StatisticsCache
+from .utils.statistics_store import StatisticsStore
+from .utils.stream import ChatStream, StreamInfo
+from .utils.validation import ResponseValidator
 
 
 class ABLTApi:
@@ -32,6 +48,17 @@ class ABLTApi:
         bearer_token: Optional[str] = None,
         base_api_url: str = "https://api.ablt.ai",
         logger: Optional[logging.Logger] = None,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        lazy: bool = False,
+        json_codec: Optional[JSONCodec] = None,
+        bot_cache: Optional[BotCache] = None,
+        statistics_cache: Optional[StatisticsCache] = None,
+        validation: str = "off",
+        tracer: Optional[RequestTracer] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ):
         """
         Initializes the object with the provided base API URL and bearer token.
@@ -42,6 +69,34 @@ class ABLTApi:
         :type base_api_url: str
         :param logger: default logger.
         :type logger: logger
+        :param session: external session to use, it will not be closed by the API. By default, own session is created.
+        :type session: requests.Session
+        :param pool_connections: number of connection pools (hosts) to cache in own session. Default is 10.
+        :type pool_connections: int
+        :param pool_maxsize: maximum number of connections to keep per pool, set it to number of threads which use
+                             the API simultaneously. Default is 10.
+        :type pool_maxsize: int
+        :param retry_policy: policy to retry health check on API update, see RetryPolicy for defaults.
+        :type retry_policy: RetryPolicy
+        :param lazy: if True, API health isn't checked on init, but on first request. Default is False.
+        :type lazy: bool
+        :param json_codec: JSON codec for requests and responses, by default the fastest installed one is used.
+        :type json_codec: JSONCodec
+        :param bot_cache: cache of bot catalog, see BotCache for defaults, BotCache(ttl=0) disables it (stale
+                          catalog isn't served too).
+        :type bot_cache: BotCache
+        :param statistics_cache: cache of usage statistics for past days. By default, statistics aren't cached.
+        :type statistics_cache: StatisticsCache
+        :param validation: validation of bots and statistics: 'off' (raw dicts), 'lazy' (LazyModel, validated with
+                           schema on attribute access) or 'strict' (models, validated at once). Default is 'off'.
+        :type validation: str
+        :param tracer: tracer to record timing breakdown (DNS, connect, TLS, time to headers, body) of each request of
+                       own session, mount tracer.adapter() to external session. By default, requests aren't traced.
+        :type tracer: RequestTracer
+        :param metrics: registry to collect metrics of requests, retries and chat responses (see APIMetrics), it
+                        traces requests of own session (with tracer, if it's provided). By default, there are no
+                        metrics.
+        :type metrics: MetricsRegistry
 
         Raises:
             TypeError: If the bearer token is not provided.
@@ -59,7 +114,66 @@ class ABLTApi:
         else:
             self.__logger = setup_logger("api", "api.log")
             self.__logger.info("Logger for API now launched!")
-        self.update_api()
+        self.__retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.__lazy = lazy
+        self.__codec = default_codec if json_codec is None else json_codec
+        self.__bot_cache = BotCache() if bot_cache is None else bot_cache
+        self.__statistics_cache = statistics_cache
+        self.__validator = ResponseValidator(validation, self.__codec)
+        self.__metrics = None if metrics is None else APIMetrics(metrics)
+        # Tracer which feeds the metrics, the listener is removed on close
+        self.__metrics_tracer: Optional[RequestTracer] = None
+        if self.__metrics is not None:
+            if tracer is None:
+                tracer = RequestTracer(max_traces=0)
+            tracer.add_listener(self.__metrics)
+            self.__metrics_tracer = tracer
+        self.__typed_bots: tuple = (None, [])
+        self.__api_checked = False
+        self.__chat_url_and_headers: Optional[tuple[str, dict]] = None
+        self.__chat_requests: dict[tuple, ChatRequest] = {}
+        self.__owns_session = session is None
+        if session is None:
+            session = requests.Session()
+            if tracer is None:
+                adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            else:
+                adapter = tracer.adapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.__session = session
+        if not lazy:
+            self.update_api()
+
+    def __enter__(self):
+        """
+        Enters context manager.
+
+        :return: API instance.
+        :rtype: ABLTApi
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """
+        Exits context manager and closes own session.
+
+        :param exc_type: exception type.
+        :param exc_val: exception value.
+        :param exc_tb: exception traceback.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes own session and releases all pooled connections, stops tracing of requests for metrics. External session
+        is left untouched.
+        """
+        if self.__metrics_tracer is not None:
+            self.__metrics_tracer.remove_listener(self.__metrics)
+            self.__metrics_tracer = None
+        if self.__owns_session:
+            self.__session.close()
 
     def get_base_api_url(self) -> str:
         """
@@ -89,19 +203,39 @@ class ABLTApi:
         """
         self.__logger = new_logger
 
-    def __get_url_and_headers(self, endpoint: str) -> tuple[str, dict]:
+    def __get_url_and_headers(self, endpoint: str, json_body: bool = False) -> tuple[str, dict]:
         """
         Constructs the URL and headers for an API request.
 
         :param endpoint: The endpoint for the API request.
         :type endpoint: str
+        :param json_body: A flag to add JSON content type header for requests with body.
+        :type json_body: bool
         :return: The URL and headers for the API request.
         :rtype: tuple
         """
         url = f"{self.__base_api_url}/{endpoint}"
         headers = {"Authorization": f"Bearer {self.__bearer_token}"}
+        if json_body:
+            headers["Content-Type"] = "application/json"
         return url, headers
 
+    def __get_chat_url_and_headers(self) -> tuple[str, dict]:
+        """
+        Returns the URL and headers for chat requests, they are built once per base API URL and bearer token.
+
+        :return: The URL and headers for chat request, headers must not be modified.
+        :rtype: tuple
+        """
+        if self.__chat_url_and_headers is None:
+            self.__chat_url_and_headers = self.__get_url_and_headers("v1/chat", json_body=True)
+        return self.__chat_url_and_headers
+
+    def __ensure_api_checked(self) -> None:
+        """Checks API health on first request in lazy mode."""
+        if self.__lazy and not self.__api_checked:
+            self.update_api()
+
     def health_check(self) -> bool:
         """
         Performs a health check on the API.
@@ -112,8 +246,7 @@ class ABLTApi:
         url, headers = self.__get_url_and_headers("health-check")
         response = None
         try:
-            session = requests.session()
-            response = session.get(url, headers=headers)
+            response = self.__session.get(url, headers=headers)
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             if response:
@@ -133,7 +266,7 @@ class ABLTApi:
                     "Request error: Invalid URL: %s, x-request-id: %s", err, response.headers.get("x-request-id")
                 )
             return False
-        data = response.json()
+        data = self.__codec.loads(response.content)
         if data.get("status") == "ok":
             self.__logger.info("ABLT chat API is working like a charm")
             return True
@@ -147,18 +280,69 @@ class ABLTApi:
             self.__logger.error("Error text: %s, x-request-id: %s", response.text, response.headers.get("x-request-id"))
         return False
 
-    def get_bots(self) -> list[dict]:
+    def get_bots(self, force_refresh: bool = False) -> list:
         """
         Retrieves all published bots.
 
-        :return: A list of dictionaries containing bot information (BotSchema), or an empty list if an error occurs.
-        :rtype: list[dict]
+        Bot catalog is cached: fresh catalog is returned from memory, stale one is returned from memory and
+        refreshed in background thread, otherwise it's revalidated (or downloaded) before return.
+
+        :param force_refresh: revalidate catalog even if it's fresh. Default is False.
+        :type force_refresh: bool
+        :return: A list of bots (dicts, LazyModel or BotSchema depending on validation mode), or an empty list if
+                 an error occurs.
+        :rtype: list
+        """
+        return self.__get_typed_bots(self.get_bot_index(force_refresh))
+
+    def __get_typed_bots(self, index: BotIndex) -> list:
+        """
+        Returns bots of the index according to validation mode, they are converted once per catalog.
+
+        :param index: index of bots.
+        :type index: BotIndex
+        :return: list of bots (dicts, LazyModel or BotSchema).
+        :rtype: list
+        """
+        if self.__validator.mode == "off":
+            return index.bots
+        typed_index, bots = self.__typed_bots
+        if typed_index is not index:
+            bots = self.__validator.typed_many(index.bots, "BotSchema")
+            self.__typed_bots = (index, bots)
+        return list(bots)
+
+    def get_bot_index(self, force_refresh: bool = False) -> BotIndex:
+        """
+        Retrieves index of all published bots for constant-time lookups, it's cached like get_bots.
+
+        :param force_refresh: revalidate catalog even if it's fresh. Default is False.
+        :type force_refresh: bool
+        :return: index of bots, empty if an error occurs.
+        :rtype: BotIndex
+        """
+        self.__ensure_api_checked()
+        if not force_refresh:
+            index = self.__bot_cache.get_index()
+            if index is not None:
+                if not self.__bot_cache.is_fresh and self.__bot_cache.begin_refresh():
+                    Thread(target=self.__refresh_bots, name="ablt-bots-refresh", daemon=True).start()
+                return index
+        return self.__fetch_bots()
+
+    def __fetch_bots(self) -> BotIndex:
+        """
+        Downloads bot catalog or revalidates cached one with conditional request.
+
+        :return: index of bots, empty if an error occurs.
+        :rtype: BotIndex
         """
         url, headers = self.__get_url_and_headers("v1/bots")
+        validators = self.__bot_cache.validators()
+        headers.update(validators)
         response = None
         try:
-            session = requests.session()
-            response = session.get(url, headers=headers)
+            response = self.__session.get(url, headers=headers)
             response.raise_for_status()
         except requests.exceptions.HTTPError as err:
             if response:
@@ -167,10 +351,32 @@ class ABLTApi:
                     err,
                     response.headers.get("x-request-id"),
                 )
-            return []
-        return response.json()
+            return BotIndex()
+        if response.status_code == 304:
+            index = self.__bot_cache.revalidated()
+            if index is not None:
+                return index
+            # Catalog was invalidated while request was in progress
+            return self.__fetch_bots() if validators else BotIndex()
+        return self.__bot_cache.store(
+            self.__codec.loads(response.content),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    def __refresh_bots(self) -> None:
+        """Refreshes stale bot catalog in background thread."""
+        try:
+            self.__fetch_bots()
+        except requests.exceptions.RequestException as err:
+            self.__logger.warning("WARNING: Bot catalog refresh failed: %s", err)
+        finally:
+            self.__bot_cache.end_refresh()
+
+    def invalidate_bots(self) -> None:
+        """Drops cached bot catalog, so it will be downloaded on the next request."""
+        self.__bot_cache.invalidate()
 
-    # pylint: disable=R0914,R0912,R0915,R1702
     def chat(
         self,
         bot_uid: Optional[str] = None,
@@ -183,7 +389,12 @@ class ABLTApi:
         assumptions: Optional[dict] = None,
         max_words: Optional[int] = None,
         use_search: Optional[bool] = False,
-    ):
+        raise_on_done: bool = True,
+        timeout: Optional[float] = None,
+        request: Optional[ChatRequest] = None,
+        timing: bool = False,
+        on_finish: Optional[Callable[[StreamInfo], None]] = None,
+    ) -> ChatStream:
         """
         Sends a chat request to the API and returns the response.
         :param bot_uid: The id of the bot to chat with.
@@ -208,124 +419,251 @@ class ABLTApi:
         :type max_words: int
         :param use_search: A flag for using search mode (default is False).
         :type use_search: bool
-        :return: The response message from the bot or None in case of an error.
-        :rtype: yield
-        :raises DoneException: If the bot is done with the conversation.
+        :param raise_on_done: raise DoneException when the bot is done (default is True, legacy behaviour), otherwise
+            iteration just stops. Metadata of the response (chunks, bytes, duration, etc.) is kept by returned stream.
+        :type raise_on_done: bool
+        :param timeout: The timeout in seconds to connect and to wait for data, by default there is no timeout.
+        :type timeout: float
+        :param request: reusable request with pre-encoded bot and other params, if it's provided, 'bot_uid',
+            'bot_slug', 'stream', 'user_id', 'language', 'assumptions', 'max_words' and 'use_search' are ignored.
+        :type request: ChatRequest
+        :param timing: record arrival time of each message, time to first token, gaps between messages and rate are
+            available on returned stream (see 'metrics' method), it has negligible overhead if it's disabled.
+        :type timing: bool
+        :param on_finish: callback, which is called with returned stream when it's finished or closed (e.g. to export
+            its metrics), it enables timing.
+        :type on_finish: Callable[[StreamInfo], None]
+        :return: The stream of response messages from the bot, it's empty in case of an error.
+        :rtype: ChatStream
+        :raises DoneException: If the bot is done with the conversation and 'raise_on_done' is True.
 
         Important: Only one of the parameters 'prompt' or 'messages' should be provided.
                    Only one of the parameters 'bot_uid' or 'bot_slug' should be provided.
 
         Errors:
         - If both 'prompt' and 'messages' parameters are missing or provided simultaneously, the function
-          will print an error message and return None.
+          will print an error message and return empty stream.
         - If the 'messages' parameter is provided, but its elements do not have the required keys or
-          their values are not of the correct type, the function will print an error message and return None.
+          their values are not of the correct type, the function will print an error message and return empty stream.
 
         Raises:
-            DoneException: If the bot is done with the conversation.
+            DoneException: If the bot is done with the conversation and 'raise_on_done' is True.
         """
+        if self.__metrics is not None:
+            on_finish = self.__metrics.on_finish(on_finish)
+        chat_stream = ChatStream(raise_on_done, timing, on_finish)
         if (prompt is None and messages is None) or (prompt is not None and messages is not None):
             self.__logger.error("Error: Only one param is required ('prompt' or 'messages')")
-            return
-
-        if (not bot_slug and not bot_uid) or (bot_slug and bot_uid):
-            self.__logger.error("Error: Only one param is required ('bot_slug' or 'bot_uid')")
-            return
-
-        url, headers = self.__get_url_and_headers("v1/chat")
-        payload = {
-            "stream": stream,
-            **({"bot_slug": bot_slug} if bot_slug is not None else {}),
-            **({"bot_uid": bot_uid} if bot_uid is not None else {}),
-            **({"language": language} if language is not None else {}),
-            **({"max_words": max_words} if max_words is not None else {}),
-            **({"assumptions": assumptions} if assumptions is not None else {}),
-            **({"prompt": prompt} if prompt is not None else {}),
-            **({"messages": messages} if messages is not None else {}),
-            **({"user_id": user_id} if user_id is not None else {}),
-            **({"use_search": use_search} if use_search is not None else {}),
-        }
-
-        session = requests.session()
-        response = session.post(url, headers=headers, json=payload)
-        if response.status_code == 200:
-            if stream:
-                for line in response.iter_lines():
-                    if line:
-                        line_data = line.decode("utf-8").splitlines()
-                        for data in line_data:
-                            if data.startswith("data:"):
-                                if "[DONE]" in data:
-                                    raise DoneException
-                                data = data[5:].strip()
-                                try:
-                                    message_data = json.loads(data)
-                                except json.JSONDecodeError:
-                                    self.__logger.error("Seems json malformed %s", line)
-                                    continue
-                                content = message_data.get("content")
-                                message = message_data.get("message")
-                                if content is not None:
-                                    yield content
-                                elif message is not None:
-                                    yield message
-            else:
-                response_json = response.json()
+            return chat_stream
+
+        if request is None:
+            if (not bot_slug and not bot_uid) or (bot_slug and bot_uid):
+                self.__logger.error("Error: Only one param is required ('bot_slug' or 'bot_uid')")
+                return chat_stream
+            request = self.__get_chat_request(
+                bot_uid, bot_slug, stream, user_id, language, assumptions, max_words, use_search
+            )
+        return chat_stream.attach(self.__chat_messages(chat_stream, request, prompt, messages, timeout))
+
+    # pylint: disable=too-many-arguments
+    def __get_chat_request(
+        self,
+        bot_uid: Optional[str],
+        bot_slug: Optional[str],
+        stream: Optional[bool],
+        user_id: Optional[int],
+        language: Optional[str],
+        assumptions: Optional[dict],
+        max_words: Optional[int],
+        use_search: Optional[bool],
+    ) -> ChatRequest:
+        """
+        Returns chat request for the params, requests without assumptions are reused for the same params.
 
-                if "message" in response_json:
-                    message = response_json.get("message")
-                elif "content" in response_json:
-                    message = response_json.get("content")
+        :param bot_uid: The id of the bot to chat with.
+        :type bot_uid: str
+        :param bot_slug: The slug of the bot to chat with.
+        :type bot_slug: str
+        :param stream: A flag for streaming mode.
+        :type stream: bool
+        :param user_id: The user identifier.
+        :type user_id: int
+        :param language: The language of the chat.
+        :type language: str
+        :param assumptions: The assumptions for the chat.
+        :type assumptions: dict
+        :param max_words: The maximum number of words in the response.
+        :type max_words: int
+        :param use_search: A flag for using search mode.
+        :type use_search: bool
+        :return: chat request.
+        :rtype: ChatRequest
+        """
+        if assumptions is not None:
+            # Assumptions may be changed by caller between calls, so they are encoded each time
+            return ChatRequest(
+                bot_uid, bot_slug, stream, user_id, language, assumptions, max_words, use_search, self.__codec
+            )
+        key = (bot_uid, bot_slug, stream, user_id, language, max_words, use_search)
+        request = self.__chat_requests.get(key)
+        if request is None:
+            if len(self.__chat_requests) >= 256:
+                self.__chat_requests.clear()
+            request = ChatRequest(
+                bot_uid, bot_slug, stream, user_id, language, None, max_words, use_search, self.__codec
+            )
+            self.__chat_requests[key] = request
+        return request
+
+    def chat_many(
+        self,
+        chat_requests: Iterable[dict],
+        max_workers: int = 10,
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+    ) -> ChatBatch:
+        """
+        Sends many chat requests in thread pool over the shared session and returns results as they are completed.
+
+        Errors of single requests (including timeouts) are captured in results and don't abort the batch. Keep
+        'pool_maxsize' not less than 'max_workers', otherwise extra connections are not reused.
+
+        :param chat_requests: chat params for each request, e.g. {"bot_slug": "omni", "prompt": "Hi!"}.
+        :type chat_requests: Iterable[dict]
+        :param max_workers: maximum number of threads (simultaneous requests). Default is 10.
+        :type max_workers: int
+        :param ordered: yield results in order of requests (True) or as soon as they are completed (False).
+        :type ordered: bool
+        :param timeout: timeout for single request in seconds, by default there is no timeout.
+        :type timeout: float
+        :return: iterator over results (ChatResult), which keeps aggregate statistics (throughput, etc.).
+        :rtype: ChatBatch
+        """
+        return ChatBatch(self.chat, chat_requests, max_workers, ordered, timeout)
+
+    # pylint: disable=R0912
+    def __chat_messages(
+        self,
+        chat_stream: ChatStream,
+        request: ChatRequest,
+        prompt: Optional[str],
+        messages: Optional[list],
+        timeout: Optional[float] = None,
+    ):
+        """
+        Sends a chat request to the API and yields messages from the bot.
+
+        :param chat_stream: stream to keep metadata of the response.
+        :type chat_stream: ChatStream
+        :param request: chat request with static params.
+        :type request: ChatRequest
+        :param prompt: The text prompt for the bot.
+        :type prompt: str
+        :param messages: A list of messages for the bot.
+        :type messages: list[dict]
+        :param timeout: The timeout in seconds to connect and to wait for data.
+        :type timeout: float
+        :return: The response message from the bot.
+        :rtype: yield
+        """
+        self.__ensure_api_checked()
+        url, headers = self.__get_chat_url_and_headers()
+        chat_stream.mark_request_sent()
+        response = self.__session.post(
+            url, headers=headers, data=request.encode(prompt, messages), stream=request.stream, timeout=timeout
+        )
+        chat_stream.mark_headers_received()
+        try:
+            if response.status_code == 200:
+                if request.stream:
+                    # Each data line of aBLT stream is a message, even without blank line after it
+                    for event in iter_events(
+                        chat_stream.track_chunks(response.iter_content(chunk_size=None)), split_data=True
+                    ):
+                        chat_stream.events += 1
+                        if event.data == DONE_MARKER:
+                            chat_stream.done = True
+                            return
+                        try:
+                            message_data = self.__codec.loads(event.data)
+                        except ValueError:
+                            self.__logger.error("Seems json malformed %s", event.data)
+                            continue
+                        content = message_data.get("content")
+                        message = message_data.get("message")
+                        if content is not None:
+                            yield content
+                        elif message is not None:
+                            yield message
                 else:
+                    chat_stream.chunks = 1
+                    chat_stream.bytes = len(response.content)
+                    response_json = self.__codec.loads(response.content)
+
+                    if "message" in response_json:
+                        message = response_json.get("message")
+                    elif "content" in response_json:
+                        message = response_json.get("content")
+                    else:
+                        self.__logger.error(
+                            "Response malformed! Actual response is: %s, x-request-id: %s",
+                            response_json,
+                            response.headers.get("x-request-id"),
+                        )
+                        return
+                    yield message
+            else:
+                self.__logger.error("Error: %s", response.status_code)
+                try:
+                    error_data = response.json()
+                    self.__logger.error("Error details:")
+                    if isinstance(error_data["detail"], str):
+                        self.__logger.error("  - %s", error_data["detail"])
+                    else:
+                        for error in error_data["detail"]:
+                            if error.get("msg") and error.get("type") and error.get("loc"):
+                                self.__logger.error(
+                                    "  - %s (type: %s, location: %s)", error["msg"], error["type"], error["loc"]
+                                )
+                            else:
+                                self.__logger.error("  - %s", error)
+                    self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
+                except ValueError:
+                    error_text = response.text
                     self.__logger.error(
-                        "Response malformed! Actual response is: %s, x-request-id: %s",
-                        response_json,
-                        response.headers.get("x-request-id"),
+                        "Error text: %s, x-request-id: %s", error_text, response.headers.get("x-request-id")
                     )
-                    return
-                yield message
-        else:
-            self.__logger.error("Error: %s", response.status_code)
-            try:
-                error_data = response.json()
-                self.__logger.error("Error details:")
-                if isinstance(error_data["detail"], str):
-                    self.__logger.error("  - %s", error_data["detail"])
-                else:
-                    for error in error_data["detail"]:
-                        if error.get("msg") and error.get("type") and error.get("loc"):
-                            self.__logger.error(
-                                "  - %s (type: %s, location: %s)", error["msg"], error["type"], error["loc"]
-                            )
-                        else:
-                            self.__logger.error("  - %s", error)
-                self.__logger.error("  - x-request-id: %s", response.headers.get("x-request-id"))
-            except (ValueError, json.JSONDecodeError):
-                error_text = response.text
-                self.__logger.error(
-                    "Error text: %s, x-request-id: %s", error_text, response.headers.get("x-request-id")
-                )
-            return
+                return
+        finally:
+            # Streamed response holds pooled connection until it's closed
+            response.close()
 
     def update_api(self) -> None:
         """
-        Updates the API by calling the health_check function.
+        Updates the API by calling the health_check function, retries are made according to the retry policy.
 
-        :raises ConnectionError: If the health_check function fails 10 times in a row.
+        :raises ConnectionError: If the health_check function fails for all attempts of the retry policy.
 
         Raises:
-            ConnectionError: If the health_check function fails 10 times in a row.
-        """
-        retries = 0
-        while retries < 10:
-            if not self.health_check():
-                retries += 1
-                self.__logger.warning("WARNING: Seems something nasty happened with aBLT api, trying %s/10", retries)
-                sleep(5)
-            else:
-                break
-        if retries >= 10:
-            raise ConnectionError("ERROR: Connection to aBLT API couldn't be established")
+            ConnectionError: If the health_check function fails for all attempts of the retry policy.
+        """
+        delays = self.__retry_policy.delays()
+        attempt = 1
+        while not self.health_check():
+            delay = next(delays, None)
+            if delay is None:
+                raise ConnectionError("ERROR: Connection to aBLT API couldn't be established")
+            attempt += 1
+            if self.__metrics is not None:
+                self.__metrics.retry("health_check")
+            self.__logger.warning(
+                "WARNING: Seems something nasty happened with aBLT api, trying %s/%s in %.2f s",
+                attempt,
+                self.__retry_policy.max_attempts,
+                delay,
+            )
+            sleep(delay)
+        self.__api_checked = True
 
     def set_base_api_url(self, new_base_api_url: str, instant_update: bool = False):
         """
@@ -337,6 +675,9 @@ class ABLTApi:
         :type instant_update: bool
         """
         self.__base_api_url = new_base_api_url
+        self.__api_checked = False
+        self.__chat_url_and_headers = None
+        self.__bot_cache.invalidate()
         if instant_update:
             self.update_api()
 
@@ -350,6 +691,9 @@ class ABLTApi:
         :type instant_update: bool
         """
         self.__bearer_token = new_bearer_token
+        self.__api_checked = False
+        self.__chat_url_and_headers = None
+        self.__bot_cache.invalidate()
         if instant_update:
             self.update_api()
 
@@ -370,54 +714,61 @@ class ABLTApi:
             self.set_base_api_url(new_base_api_url)
         self.update_api()
 
-    def find_bot_by_uid(self, bot_uid: str) -> Optional[dict]:
+    def find_bot_by_uid(self, bot_uid: str) -> Optional[Any]:
         """
-        Searches for a bot by its id in the bot list.
+        Searches for a bot by its id in the cached bot index.
 
         :param bot_uid: The id of the bot to search for.
         :type bot_uid: str
-        :return: bot dict (BotSchema).
-        :rtype: dict|None
+        :return: bot (dict, LazyModel or BotSchema depending on validation mode).
+        :rtype: dict|LazyModel|BotSchema|None
         """
-        for bot_info in self.get_bots():
-            if bot_info.get("uid") == bot_uid:
-                return bot_info
-        return None
+        return self.__validator.typed(self.get_bot_index().by_uid(bot_uid), "BotSchema")
 
-    def find_bot_by_slug(self, bot_slug: str) -> Optional[dict]:
+    def find_bot_by_slug(self, bot_slug: str) -> Optional[Any]:
         """
-        Searches for a bot by its slug in the bot list.
+        Searches for a bot by its slug in the cached bot index.
 
         :param bot_slug: The slug of the bot to search for.
         :type bot_slug: str
-        :return: bot dict (BotSchema).
-        :rtype: dict|None
+        :return: bot (dict, LazyModel or BotSchema depending on validation mode).
+        :rtype: dict|LazyModel|BotSchema|None
         """
-        for bot_info in self.get_bots():
-            if bot_info.get("slug") == bot_slug:
-                return bot_info
-        return None
+        return self.__validator.typed(self.get_bot_index().by_slug(bot_slug), "BotSchema")
 
-    def find_bot_by_name(self, bot_name: str) -> Optional[dict]:
+    def find_bot_by_name(self, bot_name: str, case_sensitive: bool = True) -> Optional[Any]:
         """
-        Searches for a bot by its name in the bot list.
+        Searches for a bot by its name in the cached bot index.
 
         :param bot_name: The name of the bot to search for.
         :type bot_name: str
-        :return: bot dict (BotSchema).
-        :rtype: dict|None
+        :param case_sensitive: compare names case-sensitively. Default is True.
+        :type case_sensitive: bool
+        :return: bot (dict, LazyModel or BotSchema depending on validation mode).
+        :rtype: dict|LazyModel|BotSchema|None
         """
-        for bot_info in self.get_bots():
-            if bot_info.get("name") == bot_name:
-                return bot_info
-        return None
+        return self.__validator.typed(self.get_bot_index().by_name(bot_name, case_sensitive), "BotSchema")
+
+    def find_bots_by_model(self, model: str) -> list:
+        """
+        Searches for bots using the model in the cached bot index.
+
+        :param model: The model of the bots to search for, e.g. 'gpt-4'.
+        :type model: str
+        :return: list of bots (dicts, LazyModel or BotSchema depending on validation mode), empty if there are no
+                 such bots.
+        :rtype: list
+        """
+        return self.__validator.typed_many(self.get_bot_index().by_model(model), "BotSchema")
 
     def get_usage_statistics(
         self,
         user_id: Optional[int] = -1,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-    ) -> Optional[dict]:
+        window: Optional[Union[str, int]] = None,
+        concurrency: int = 4,
+    ) -> Optional[Any]:
         """
         Retrieves usage statistics for the API.
 
@@ -427,21 +778,148 @@ class ABLTApi:
         :type start_date: str
         :param end_date: The end date for the statistics in format YYYY-MM-DD.
         :type end_date: str
-        :return: The response message from the bot (StatisticsSchema) or None in case of an error.
-        :rtype: dict|None
+        :param window: split long range into windows: 'week', 'month' or number of days, they are fetched
+                       in thread pool and merged (items are joined, total is recomputed). By default, range isn't split.
+        :type window: str | int
+        :param concurrency: maximum number of threads (simultaneous requests) for split range. Default is 4.
+        :type concurrency: int
+        :return: statistics (dict, LazyModel or StatisticsSchema depending on validation mode) or None in case of
+                 an error.
+        :rtype: dict|LazyModel|StatisticsSchema|None
+        """
+        stats = self.__get_usage_statistics(user_id, start_date, end_date, window, concurrency, typed=True)
+        return self.__validator.typed(stats, "StatisticsSchema")
+
+    def __get_usage_statistics(
+        self,
+        user_id: Optional[int] = -1,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        window: Optional[Union[str, int]] = None,
+        concurrency: int = 4,
+        typed: bool = False,
+    ) -> Optional[Any]:
+        """
+        Retrieves usage statistics as dict, see get_usage_statistics for params.
+
+        :param typed: single response may be validated from bytes in strict mode (then model is returned).
+        :type typed: bool
+        :return: statistics (StatisticsSchema dict or model if typed) or None in case of an error.
+        :rtype: dict|StatisticsSchema|None
         """
         if not isinstance(user_id, int):
             self.__logger.error("Error: user_id should be int")
             return None
         start_date = datetime.now().strftime("%Y-%m-%d") if start_date is None else start_date
         end_date = datetime.now().strftime("%Y-%m-%d") if end_date is None else end_date
-        url, headers = self.__get_url_and_headers("v1/user/usage-statistics")
+        self.__ensure_api_checked()
+        if concurrency < 1:
+            raise ValueError("concurrency should be at least 1")
+        cache = self.__statistics_cache
+        # Statistics of another token or API are kept in shared cache apart
+        scope = "" if cache is None else cache.scope_of(self.__bearer_token, self.__base_api_url)
+        try:
+            if cache is None:
+                ranges = [(start_date, end_date)]
+            else:
+                ranges = cache.missing_ranges(user_id, start_date, end_date, scope)
+            if window is not None:
+                ranges = [dates for missing in ranges for dates in split_date_range(*missing, window)]
+        except ValueError as error:
+            if window is not None:
+                self.__logger.error("Error: %s", error)
+                return None
+            # Malformed dates are reported by API
+            return self.__fetch_usage_statistics(user_id, start_date, end_date, typed)
+        if cache is None and len(ranges) <= 1:
+            return self.__fetch_usage_statistics(user_id, start_date, end_date, typed)
+        parts = self.__fetch_usage_statistics_ranges(user_id, ranges, concurrency)
+        fetched = [part for part in parts if part is not None]
+        if cache is None or len(fetched) < len(parts):
+            return merge_statistics(parts)
+        for (range_start, range_end), part in zip(ranges, fetched):
+            cache.put(user_id, range_start, range_end, part.get("items") or [], scope)
+        return merge_statistics([{"items": cache.get_items(user_id, start_date, end_date, scope)}, *fetched])
+
+    def get_usage_statistics_for_users(
+        self,
+        user_ids: Iterable[int],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        concurrency: int = 10,
+    ) -> StatisticsBatch:
+        """
+        Retrieves usage statistics for many users in thread pool over the shared session.
+
+        Results are returned as soon as they are completed, combined total of succeeded users is kept by the batch.
+        Keep 'pool_maxsize' not less than 'concurrency', otherwise extra connections are not reused.
+
+        :param user_ids: The ids of the users to get statistics for.
+        :type user_ids: Iterable[int]
+        :param start_date: The start date for the statistics in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: The end date for the statistics in format YYYY-MM-DD.
+        :type end_date: str
+        :param concurrency: maximum number of threads (simultaneous requests). Default is 10.
+        :type concurrency: int
+        :return: iterator over results (UserStatisticsResult, statistics depend on validation mode), which keeps
+                 combined total and failed users.
+        :rtype: StatisticsBatch
+        """
+        start_date = datetime.now().strftime("%Y-%m-%d") if start_date is None else start_date
+        end_date = datetime.now().strftime("%Y-%m-%d") if end_date is None else end_date
+        return StatisticsBatch(
+            lambda user_id: self.__get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date),
+            user_ids,
+            concurrency,
+            lambda stats: self.__validator.typed(stats, "StatisticsSchema"),
+        )
+
+    def __fetch_usage_statistics_ranges(
+        self, user_id: int, ranges: list[tuple[str, str]], concurrency: int
+    ) -> list[Optional[dict]]:
+        """
+        Fetches usage statistics for date ranges in thread pool.
+
+        :param user_id: The id of the user to get statistics for.
+        :type user_id: int
+        :param ranges: list of (start_date, end_date) pairs.
+        :type ranges: list[tuple[str, str]]
+        :param concurrency: maximum number of threads (simultaneous requests).
+        :type concurrency: int
+        :return: statistics (StatisticsSchema) for each range, None for failed ones.
+        :rtype: list[dict | None]
+        """
+        if len(ranges) <= 1:
+            return [self.__fetch_usage_statistics(user_id, *dates) for dates in ranges]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(ranges)), thread_name_prefix="ablt-stats") as pool:
+            return list(pool.map(lambda dates: self.__fetch_usage_statistics(user_id, *dates), ranges))
+
+    def __fetch_usage_statistics(
+        self, user_id: int, start_date: str, end_date: str, typed: bool = False
+    ) -> Optional[Any]:
+        """
+        Fetches usage statistics for the date range with single request.
+
+        :param user_id: The id of the user to get statistics for.
+        :type user_id: int
+        :param start_date: The start date for the statistics in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: The end date for the statistics in format YYYY-MM-DD.
+        :type end_date: str
+        :param typed: validate response from bytes in strict mode.
+        :type typed: bool
+        :return: statistics (StatisticsSchema dict or model if typed) or None in case of an error.
+        :rtype: dict|StatisticsSchema|None
+        """
+        url, headers = self.__get_url_and_headers("v1/user/usage-statistics", json_body=True)
         payload = {"user_id": user_id, "start_date": start_date, "end_date": end_date}
 
-        session = requests.session()
-        response = session.post(url, json=payload, headers=headers)
+        response = self.__session.post(url, data=self.__codec.dumps(payload), headers=headers)
         if response.status_code == 200:
-            return response.json()
+            if typed:
+                return self.__validator.loads(response.content, "StatisticsSchema")
+            return self.__codec.loads(response.content)
         self.__logger.error(
             "Request error: %s, x-request-id: %s", response.status_code, response.headers.get("x-request-id")
         )
@@ -460,20 +938,20 @@ class ABLTApi:
         :type date: str
         :param user_id: The id of the user to get statistics for.
         :type user_id: int
-        :return: dict with statistics for a day.
-        :rtype: dict | None.
+        :return: statistics for a day (dict, LazyModel or StatisticItemSchema depending on validation mode).
+        :rtype: dict | LazyModel | StatisticItemSchema | None.
         """
         if not isinstance(user_id, int):
             self.__logger.error("Error: user_id should be int")
             return None
         date = datetime.now().strftime("%Y-%m-%d") if date is None else date
-        stats = self.get_usage_statistics(user_id=user_id, start_date=date, end_date=date)
+        stats = self.__get_usage_statistics(user_id=user_id, start_date=date, end_date=date)
         if stats:
             items = stats.get("items")
             if items is not None:
                 for usage_info in items:
                     if usage_info.get("date") == date:
-                        return usage_info
+                        return self.__validator.typed(usage_info, "StatisticItemSchema")
         return None
 
     def get_statistics_total(
@@ -488,13 +966,58 @@ class ABLTApi:
         :type start_date: str
         :param end_date: end date for statistics.
         :type end_date: str
-        :return: dict (StatisticTotalSchema) with total statistics.
-        :rtype: dict
+        :return: total statistics (dict, LazyModel or StatisticTotalSchema depending on validation mode).
+        :rtype: dict | LazyModel | StatisticTotalSchema | None
         """
         if not isinstance(user_id, int):
             self.__logger.error("Error: user_id should be int")
             return None
         start_date = datetime.now().strftime("%Y-%m-%d") if start_date is None else start_date
         end_date = datetime.now().strftime("%Y-%m-%d") if end_date is None else end_date
-        stats = self.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
-        return stats.get("total") if stats is not None else None
+        stats = self.__get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+        return self.__validator.typed(stats.get("total"), "StatisticTotalSchema") if stats is not None else None
+
+    def sync_usage_statistics(
+        self,
+        store: StatisticsStore,
+        user_id: Optional[int] = -1,
+        start_date: Optional[str] = None,
+        window: Optional[Union[str, int]] = None,
+        concurrency: int = 4,
+    ) -> Optional[int]:
+        """
+        Syncs usage statistics of the user into local store: only days after the watermark of the user are requested.
+
+        Then reports are built with the store (get_statistics_total, get_statistics_for_a_day, etc.) without requests,
+        statistics are kept by scope of the account: StatisticsStore.scope_of(bearer token, base API URL).
+
+        :param store: local store of statistics.
+        :type store: StatisticsStore
+        :param user_id: The id of the user to sync statistics for.
+        :type user_id: int
+        :param start_date: The first day to sync in format YYYY-MM-DD, used only if the user was never synced.
+                           By default, today.
+        :type start_date: str
+        :param window: split long range into windows: 'week', 'month' or number of days, see get_usage_statistics.
+        :type window: str | int
+        :param concurrency: maximum number of threads (simultaneous requests) for split range. Default is 4.
+        :type concurrency: int
+        :return: number of synced items or None in case of an error.
+        :rtype: int | None
+        """
+        if not isinstance(user_id, int):
+            self.__logger.error("Error: user_id should be int")
+            return None
+        end_date = datetime.now().strftime("%Y-%m-%d")
+        scope = store.scope_of(self.__bearer_token, self.__base_api_url)
+        watermark = store.get_watermark(user_id, scope)
+        if watermark is not None:
+            start_date = (datetime.strptime(watermark, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+        elif start_date is None:
+            start_date = end_date
+        stats = self.__get_usage_statistics(
+            user_id=user_id, start_date=start_date, end_date=end_date, window=window, concurrency=concurrency
+        )
+        if stats is None:
+            return None
+        return store.put(user_id, start_date, end_date, stats.get("items") or [], scope)
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: mock_server.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains local mock of aBLT API (aiohttp.web) for offline tests, benchmarks and load tests.
+
+Usage:
+    python -m ablt_python_api.mock_server --port 8080 --latency 0.05 --token-rate 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+from datetime import date, timedelta
+from typing import Optional
+from uuid import uuid4
+
+from aiohttp import web
+
+from .utils.sse import DONE_MARKER
+from .utils.statistics import STAT_FIELDS
+
+
+class MockABLTServer:
+    """
+    This class represents local mock of aBLT API: health check, bots, chat (JSON and SSE streaming) and usage
+    statistics. Knobs are attributes, so they may be changed while the server is running.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        bearer_token: Optional[str] = None,
+        bots: int = 10,
+        response_words: int = 20,
+        token_rate: Optional[float] = None,
+        chunk_size: Optional[int] = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        description_size: int = 100,
+        seed: Optional[int] = None,
+    ):
+        """
+        Init MockABLTServer class
+
+        :param bearer_token: token which is accepted, requests with other tokens get 401. By default, any token is ok.
+        :type bearer_token: str
+        :param bots: number of bots in catalog. Default is 10.
+        :type bots: int
+        :param response_words: number of words in each chat response ('max_words' of request may reduce it).
+        :type response_words: int
+        :param token_rate: streamed words per second, by default words are sent without delay.
+        :type token_rate: float
+        :param chunk_size: size of network chunks in bytes to fragment SSE events, by default each event is written
+                           at once.
+        :type chunk_size: int
+        :param latency: delay in seconds before each response. Default is 0.
+        :type latency: float
+        :param error_rate: probability (0..1) of error response to any request. Default is 0.
+        :type error_rate: float
+        :param error_status: HTTP status of error responses. Default is 500.
+        :type error_status: int
+        :param description_size: length of bot descriptions in characters, to control size of catalog.
+        :type description_size: int
+        :param seed: seed of random errors, for reproducible runs.
+        :type seed: int
+        """
+        self.bearer_token = bearer_token
+        self.response_words = response_words
+        self.token_rate = token_rate
+        self.chunk_size = chunk_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.bots = [
+            {
+                "uid": f"mock-uid-{number}",
+                "slug": f"mock-bot-{number}",
+                "model": ("gpt-3.5-turbo", "gpt-4", "claude-2")[number % 3],
+                "name": f"Mock Bot {number}",
+                "description": ("Mock bot. " * (description_size // 10 + 1))[:description_size],
+                "welcome_message": "Hello! How can I help you?",
+                "avatar_url": None,
+            }
+            for number in range(bots)
+        ]
+        self.requests: dict[str, int] = {}
+        self.etag = f'"{uuid4().hex}"'
+        self.__random = random.Random(seed)
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__runner: Optional[web.AppRunner] = None
+        self.__thread: Optional[threading.Thread] = None
+        self.url = ""
+
+    def make_app(self) -> web.Application:
+        """
+        Creates aiohttp application, e.g. to run it in own event loop or with aiohttp test client.
+
+        :return: application with API routes.
+        :rtype: web.Application
+        """
+        app = web.Application(middlewares=[self.__middleware])
+        app.router.add_get("/health-check", self.__health_check)
+        app.router.add_get("/v1/bots", self.__get_bots)
+        app.router.add_post("/v1/chat", self.__chat)
+        app.router.add_post("/v1/user/usage-statistics", self.__get_usage_statistics)
+        return app
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        Starts the server in background thread.
+
+        :param host: host to bind. Default is 127.0.0.1.
+        :type host: str
+        :param port: port to bind, by default free port is selected.
+        :type port: int
+        :return: base API URL of the server, e.g. 'http://127.0.0.1:54321'.
+        :rtype: str
+        """
+        if self.__thread is not None:
+            raise RuntimeError("Mock server is already started")
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.make_app(), access_log=None)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, host, port)
+        loop.run_until_complete(site.start())
+        port = runner.addresses[0][1]
+        self.__loop, self.__runner = loop, runner
+        self.__thread = threading.Thread(target=loop.run_forever, name="ablt-mock-server", daemon=True)
+        self.__thread.start()
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    def stop(self) -> None:
+        """Stops the server and closes its event loop."""
+        if self.__thread is None:
+            return
+        loop, runner = self.__loop, self.__runner
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()  # type: ignore[union-attr,arg-type]
+        loop.call_soon_threadsafe(loop.stop)  # type: ignore[union-attr]
+        self.__thread.join()
+        loop.close()  # type: ignore[union-attr]
+        self.__loop, self.__runner, self.__thread = None, None, None
+
+    def __enter__(self) -> "MockABLTServer":
+        """
+        Starts the server.
+
+        :return: self.
+        :rtype: MockABLTServer
+        """
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """
+        Stops the server.
+
+        :param exc_type: exception type.
+        :param exc_val: exception value.
+        :param exc_tb: exception traceback.
+        """
+        self.stop()
+
+    @web.middleware
+    async def __middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """
+        Counts requests, checks token, emulates latency and errors, adds x-request-id to responses.
+
+        :param request: request.
+        :type request: web.Request
+        :param handler: route handler.
+        :return: response.
+        :rtype: web.StreamResponse
+        """
+        self.requests[request.path] = self.requests.get(request.path, 0) + 1
+        headers = {"x-request-id": uuid4().hex}
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        if self.bearer_token is not None and request.headers.get("Authorization") != f"Bearer {self.bearer_token}":
+            return web.json_response({"detail": "Could not validate credentials"}, status=401, headers=headers)
+        if self.error_rate > 0 and self.__random.random() < self.error_rate:
+            return web.json_response({"detail": "Mock error"}, status=self.error_status, headers=headers)
+        response = await handler(request)
+        if not response.prepared:
+            response.headers.update(headers)
+        return response
+
+    @staticmethod
+    def __validation_error(location: str, message: str) -> web.Response:
+        """
+        Returns validation error like API does.
+
+        :param location: name of invalid field.
+        :type location: str
+        :param message: error message.
+        :type message: str
+        :return: response with 422 status.
+        :rtype: web.Response
+        """
+        return web.json_response(
+            {"detail": [{"loc": ["body", location], "msg": message, "type": "value_error"}]}, status=422
+        )
+
+    async def __health_check(self, _request: web.Request) -> web.Response:
+        """
+        Returns status of the API.
+
+        :param _request: request.
+        :type _request: web.Request
+        :return: response.
+        :rtype: web.Response
+        """
+        return web.json_response({"status": "ok"})
+
+    async def __get_bots(self, request: web.Request) -> web.Response:
+        """
+        Returns catalog of bots, 304 if ETag of the catalog isn't changed.
+
+        :param request: request.
+        :type request: web.Request
+        :return: response.
+        :rtype: web.Response
+        """
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304, headers={"ETag": self.etag})
+        return web.json_response(self.bots, headers={"ETag": self.etag})
+
+    def __find_bot(self, body: dict) -> Optional[dict]:
+        """
+        Finds bot of chat request.
+
+        :param body: chat request.
+        :type body: dict
+        :return: bot or None if there is no such bot.
+        :rtype: dict | None
+        """
+        for bot in self.bots:
+            if bot["uid"] == body.get("bot_uid") or bot["slug"] == body.get("bot_slug"):
+                return bot
+        return None
+
+    async def __chat(self, request: web.Request) -> web.StreamResponse:
+        """
+        Returns chat response as JSON or SSE stream of words ending with [DONE].
+
+        :param request: request.
+        :type request: web.Request
+        :return: response.
+        :rtype: web.StreamResponse
+        """
+        try:
+            body = await request.json()
+        except ValueError:
+            return self.__validation_error("body", "Invalid JSON")
+        bot = self.__find_bot(body)
+        if bot is None:
+            return web.json_response({"detail": "Bot not found"}, status=404)
+        if (body.get("prompt") is None) == (body.get("messages") is None):
+            return self.__validation_error("prompt", "Only one of 'prompt' or 'messages' is required")
+        words = self.response_words if body.get("max_words") is None else min(self.response_words, body["max_words"])
+        tokens = [f"{'' if number == 0 else ' '}word{number}" for number in range(words)]
+        if not body.get("stream"):
+            return web.json_response({"content": "".join(tokens)})
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "x-request-id": uuid4().hex})
+        await response.prepare(request)
+        delay = 0.0 if not self.token_rate else 1 / self.token_rate
+        for token in tokens:
+            if delay:
+                await asyncio.sleep(delay)
+            await self.__write(response, f"data: {json.dumps({'content': token})}\n\n".encode())
+        await self.__write(response, f"data: {DONE_MARKER}\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def __write(self, response: web.StreamResponse, data: bytes) -> None:
+        """
+        Writes data to stream, fragmented to chunks if chunk size is set.
+
+        :param response: stream response.
+        :type response: web.StreamResponse
+        :param data: data to write.
+        :type data: bytes
+        """
+        size = self.chunk_size or len(data)
+        for start in range(0, len(data), size):
+            await response.write(data[start : start + size])
+
+    async def __get_usage_statistics(self, request: web.Request) -> web.Response:
+        """
+        Returns deterministic usage statistics of the user for each day of the range.
+
+        :param request: request.
+        :type request: web.Request
+        :return: response.
+        :rtype: web.Response
+        """
+        try:
+            body = await request.json()
+        except ValueError:
+            return self.__validation_error("body", "Invalid JSON")
+        if not isinstance(body.get("user_id"), int):
+            return self.__validation_error("user_id", "value is not a valid integer")
+        try:
+            start_date = date.fromisoformat(body["start_date"])
+            end_date = date.fromisoformat(body["end_date"])
+        except (KeyError, TypeError, ValueError):
+            return self.__validation_error("start_date", "invalid date format")
+        items = []
+        day = start_date
+        while day <= end_date:
+            tokens = (day.toordinal() + body["user_id"]) % 7 * 10
+            item = dict(zip(STAT_FIELDS, (tokens, 0, tokens * 2, tokens * 3, tokens // 2, 0, tokens, tokens * 3 // 2)))
+            items.append({**item, "date": day.isoformat()})
+            day += timedelta(days=1)
+        total = {field: sum(item[field] for item in items) for field in STAT_FIELDS}
+        return web.json_response({"total": total, "items": items})
+
+
+def main() -> None:
+    """Runs mock server from command line until it's interrupted."""
+    parser = argparse.ArgumentParser(description="Local mock of aBLT API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--bearer-token", default=None)
+    parser.add_argument("--bots", type=int, default=10)
+    parser.add_argument("--response-words", type=int, default=20)
+    parser.add_argument("--token-rate", type=float, default=None, help="streamed words per second")
+    parser.add_argument("--chunk-size", type=int, default=None, help="size of network chunks in bytes")
+    parser.add_argument("--latency", type=float, default=0.0, help="delay before each response in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of error response")
+    parser.add_argument("--error-status", type=int, default=500)
+    args = parser.parse_args()
+    server = MockABLTServer(
+        bearer_token=args.bearer_token,
+        bots=args.bots,
+        response_words=args.response_words,
+        token_rate=args.token_rate,
+        chunk_size=args.chunk_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+    )
+    web.run_app(server.make_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
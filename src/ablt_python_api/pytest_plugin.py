@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: pytest_plugin.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains pytest fixtures with local mock of aBLT API, enable them in conftest.py:
+    pytest_plugins = ["ablt_python_api.pytest_plugin"]
+"""
+
+import logging
+from typing import Iterator
+
+import pytest
+
+from .ablt_api_sync import ABLTApi
+from .mock_server import MockABLTServer
+
+MOCK_BEARER_TOKEN = "mock-token"
+
+
+@pytest.fixture()
+def mock_server() -> Iterator[MockABLTServer]:
+    """
+    This fixture returns started mock of aBLT API, its knobs (latency, error_rate, etc.) may be changed by test.
+
+    :return: mock server, its base API URL is 'url' attribute
+    :rtype: MockABLTServer
+    """
+    with MockABLTServer(bearer_token=MOCK_BEARER_TOKEN, seed=0) as server:
+        yield server
+
+
+@pytest.fixture()
+def mock_api(mock_server: MockABLTServer) -> Iterator[ABLTApi]:  # pylint: disable=redefined-outer-name
+    """
+    This fixture returns sync API connected to mock of aBLT API.
+
+    :param mock_server: mock server fixture
+    :return: ABLTApi instance
+    :rtype: ABLTApi
+    """
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=logging.getLogger("ablt-mock-api")
+    ) as api:
+        yield api
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: records.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains lightweight records (__slots__ classes) equivalent to schemas, for results held in huge numbers.
+"""
+
+from datetime import date
+from typing import Any, ClassVar, Iterator, Optional
+
+from pydantic import BaseModel
+
+from .schemas import BotSchema, ChatChunkSchema, StatisticItemSchema
+
+
+class Record:
+    """
+    This class is base of records: fixed fields without per-instance dict, no validation on construction.
+
+    Conversion from model reads its attributes and conversion to model uses model_construct, so values are shared,
+    not copied or validated again.
+    """
+
+    __slots__ = ()
+    schema: ClassVar[type[BaseModel]]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Any:
+        """
+        Creates record from response dict.
+
+        :param data: response dict, missing fields are None.
+        :type data: dict
+        :return: record.
+        :rtype: Record
+        """
+        return cls(*map(data.get, cls.__slots__))
+
+    @classmethod
+    def from_model(cls, model: BaseModel) -> Any:
+        """
+        Creates record from model.
+
+        :param model: model (instance of schema of the record).
+        :type model: BaseModel
+        :return: record.
+        :rtype: Record
+        """
+        # Field values are in model's __dict__, reading it directly is much faster than getattr per field
+        return cls(*map(model.__dict__.get, cls.__slots__))
+
+    def to_model(self) -> Any:
+        """
+        Converts record to model without validation.
+
+        :return: model (instance of schema of the record).
+        :rtype: BaseModel
+        """
+        return self.schema.model_construct(**self.to_dict())
+
+    def to_dict(self) -> dict:
+        """
+        Converts record to dict.
+
+        :return: dict of fields.
+        :rtype: dict
+        """
+        fields: tuple[str, ...] = self.__slots__
+        return {field: getattr(self, field) for field in fields}
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Returns values of fields, so record may be unpacked like tuple.
+
+        :return: values of fields.
+        :rtype: Iterator[Any]
+        """
+        fields: tuple[str, ...] = self.__slots__
+        return (getattr(self, field) for field in fields)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares records of the same type field by field.
+
+        :param other: other object.
+        :type other: object
+        :return: True if records are equal.
+        :rtype: bool
+        """
+        if type(other) is not type(self):
+            return NotImplemented
+        return tuple(self) == tuple(other)  # type: ignore[arg-type]
+
+    def __hash__(self) -> int:
+        """
+        Returns hash of the values of fields.
+
+        :return: hash.
+        :rtype: int
+        """
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the record.
+
+        :return: representation of the record.
+        :rtype: str
+        """
+        fields: tuple[str, ...] = self.__slots__
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in fields)
+        return f"{type(self).__name__}({values})"
+
+    def __getstate__(self) -> tuple:
+        """
+        Returns state for pickle and copy.
+
+        :return: values of fields.
+        :rtype: tuple
+        """
+        return tuple(self)
+
+    def __setstate__(self, state: tuple) -> None:
+        """
+        Restores state for pickle and copy.
+
+        :param state: values of fields.
+        :type state: tuple
+        """
+        fields: tuple[str, ...] = self.__slots__
+        for field, value in zip(fields, state):
+            setattr(self, field, value)
+
+
+class BotRecord(Record):
+    """This class represents a bot (BotSchema)."""
+
+    __slots__ = ("uid", "slug", "model", "name", "description", "welcome_message", "avatar_url")
+    schema = BotSchema
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        uid: str,
+        slug: str,
+        model: str,
+        name: str,
+        description: str,
+        welcome_message: str,
+        avatar_url: Optional[str] = None,
+    ):
+        """
+        Init BotRecord class
+
+        :param uid: The id of the bot.
+        :type uid: str
+        :param slug: The slug of the bot.
+        :type slug: str
+        :param model: The model of the bot, e.g. 'gpt-4'.
+        :type model: str
+        :param name: The name of the bot.
+        :type name: str
+        :param description: The description of the bot.
+        :type description: str
+        :param welcome_message: The welcome message of the bot.
+        :type welcome_message: str
+        :param avatar_url: The URL of the avatar of the bot.
+        :type avatar_url: str
+        """
+        self.uid = uid
+        self.slug = slug
+        self.model = model
+        self.name = name
+        self.description = description
+        self.welcome_message = welcome_message
+        self.avatar_url = avatar_url
+
+
+class StatisticItemRecord(Record):
+    """This class represents a single item in statistics (StatisticItemSchema)."""
+
+    __slots__ = (
+        "original_tokens",
+        "enchancement_tokens",
+        "response_tokens",
+        "total_tokens",
+        "original_words",
+        "enchancement_words",
+        "response_words",
+        "total_words",
+        "date",
+    )
+    schema = StatisticItemSchema
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        original_tokens: int,
+        enchancement_tokens: int,
+        response_tokens: int,
+        total_tokens: int,
+        original_words: int,
+        enchancement_words: int,
+        response_words: int,
+        total_words: int,
+        date: Optional[date],  # pylint: disable=redefined-outer-name
+    ):
+        """
+        Init StatisticItemRecord class
+
+        :param original_tokens: number of tokens in prompts.
+        :type original_tokens: int
+        :param enchancement_tokens: number of tokens in enhancements of prompts.
+        :type enchancement_tokens: int
+        :param response_tokens: number of tokens in responses.
+        :type response_tokens: int
+        :param total_tokens: total number of tokens.
+        :type total_tokens: int
+        :param original_words: number of words in prompts.
+        :type original_words: int
+        :param enchancement_words: number of words in enhancements of prompts.
+        :type enchancement_words: int
+        :param response_words: number of words in responses.
+        :type response_words: int
+        :param total_words: total number of words.
+        :type total_words: int
+        :param date: day of the statistics, None if it's missing in response.
+        :type date: date | None
+        """
+        self.original_tokens = original_tokens
+        self.enchancement_tokens = enchancement_tokens
+        self.response_tokens = response_tokens
+        self.total_tokens = total_tokens
+        self.original_words = original_words
+        self.enchancement_words = enchancement_words
+        self.response_words = response_words
+        self.total_words = total_words
+        self.date = date
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StatisticItemRecord":
+        """
+        Creates record from response dict, date in format YYYY-MM-DD is parsed.
+
+        :param data: response dict (StatisticItemSchema), missing counters are 0.
+        :type data: dict
+        :return: record.
+        :rtype: StatisticItemRecord
+        """
+        get = data.get
+        day = get("date")
+        return cls(
+            get("original_tokens", 0),
+            get("enchancement_tokens", 0),
+            get("response_tokens", 0),
+            get("total_tokens", 0),
+            get("original_words", 0),
+            get("enchancement_words", 0),
+            get("response_words", 0),
+            get("total_words", 0),
+            date.fromisoformat(day) if isinstance(day, str) else day,
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Converts record to dict like API returns, date is formatted as YYYY-MM-DD (missing date is None).
+
+        :return: dict (StatisticItemSchema).
+        :rtype: dict
+        """
+        data = super().to_dict()
+        data["date"] = self.date.isoformat() if self.date is not None else None
+        return data
+
+    def to_model(self) -> StatisticItemSchema:
+        """
+        Converts record to model without validation.
+
+        :return: model.
+        :rtype: StatisticItemSchema
+        """
+        return StatisticItemSchema.model_construct(**super().to_dict())
+
+
+class ChatChunk(Record):
+    """This class represents a single message of chat response stream (ChatChunkSchema)."""
+
+    __slots__ = ("index", "content", "elapsed")
+    schema = ChatChunkSchema
+
+    def __init__(self, index: int, content: str, elapsed: float = 0.0):
+        """
+        Init ChatChunk class
+
+        :param index: number of the message in the stream, starting from 0.
+        :type index: int
+        :param content: text of the message.
+        :type content: str
+        :param elapsed: seconds since the start of the stream till the message was received.
+        :type elapsed: float
+        """
+        self.index = index
+        self.content = content
+        self.elapsed = elapsed
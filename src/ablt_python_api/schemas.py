@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 06.11.2023
-Last Modified: 06.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file contains schemas for aBLT.ai API.
@@ -70,3 +70,11 @@ class BotSchema(BaseModel):
     description: str
     welcome_message: str
     avatar_url: Optional[str]
+
+
+class ChatChunkSchema(BaseModel):
+    """This class represents a single message of chat response stream."""
+
+    index: int
+    content: str
+    elapsed: float
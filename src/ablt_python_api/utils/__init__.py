@@ -5,11 +5,98 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 03.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file describes entry point for aBLT chat API.
+Public names are imported from submodules on first access (PEP 562), so e.g. import of the package doesn't load SQLite.
 """
 
-from .exceptions import DoneException
-from .logger_config import setup_logger
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .batch import AsyncChatBatch, ChatBatch, ChatResult
+    from .bot_cache import BotCache
+    from .bot_index import BotIndex
+    from .chat_request import ChatRequest
+    from .codec import JSONCodec, default_codec, get_codec
+    from .columnar import StatisticsColumns
+    from .exceptions import DoneException
+    from .logger_config import setup_logger
+    from .metrics import APIMetrics, MetricsRegistry
+    from .request_trace import RequestTrace, RequestTracer
+    from .retry import RetryPolicy
+    from .sse import SSEDecoder, SSEEvent
+    from .statistics import merge_statistics, split_date_range, sum_statistics
+    from .statistics_batch import AsyncStatisticsBatch, StatisticsBatch, UserStatisticsResult
+    from .statistics_cache import StatisticsCache
+    from .statistics_store import StatisticsStore
+    from .stream import AsyncChatStream, ChatStream
+    from .validation import LazyModel, ResponseValidator
+
+# Public name: (submodule, name in submodule)
+_LAZY_IMPORTS = {
+    "AsyncChatBatch": (".batch", "AsyncChatBatch"),
+    "ChatBatch": (".batch", "ChatBatch"),
+    "ChatResult": (".batch", "ChatResult"),
+    "BotCache": (".bot_cache", "BotCache"),
+    "BotIndex": (".bot_index", "BotIndex"),
+    "ChatRequest": (".chat_request", "ChatRequest"),
+    "JSONCodec": (".codec", "JSONCodec"),
+    "default_codec": (".codec", "default_codec"),
+    "get_codec": (".codec", "get_codec"),
+    "StatisticsColumns": (".columnar", "StatisticsColumns"),
+    "DoneException": (".exceptions", "DoneException"),
+    "setup_logger": (".logger_config", "setup_logger"),
+    "APIMetrics": (".metrics", "APIMetrics"),
+    "MetricsRegistry": (".metrics", "MetricsRegistry"),
+    "RequestTrace": (".request_trace", "RequestTrace"),
+    "RequestTracer": (".request_trace", "RequestTracer"),
+    "RetryPolicy": (".retry", "RetryPolicy"),
+    "SSEDecoder": (".sse", "SSEDecoder"),
+    "SSEEvent": (".sse", "SSEEvent"),
+    "merge_statistics": (".statistics", "merge_statistics"),
+    "split_date_range": (".statistics", "split_date_range"),
+    "sum_statistics": (".statistics", "sum_statistics"),
+    "AsyncStatisticsBatch": (".statistics_batch", "AsyncStatisticsBatch"),
+    "StatisticsBatch": (".statistics_batch", "StatisticsBatch"),
+    "UserStatisticsResult": (".statistics_batch", "UserStatisticsResult"),
+    "StatisticsCache": (".statistics_cache", "StatisticsCache"),
+    "StatisticsStore": (".statistics_store", "StatisticsStore"),
+    "AsyncChatStream": (".stream", "AsyncChatStream"),
+    "ChatStream": (".stream", "ChatStream"),
+    "LazyModel": (".validation", "LazyModel"),
+    "ResponseValidator": (".validation", "ResponseValidator"),
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports public name from its submodule on first access.
+
+    :param name: name of the attribute.
+    :type name: str
+    :return: object imported from submodule.
+    :rtype: Any
+    :raises AttributeError: If there is no such public name.
+    """
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module, attribute = _LAZY_IMPORTS[name]
+    value = getattr(import_module(module, __name__), attribute)
+    # Cache in module, so next access doesn't reach __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """
+    Returns attributes of the module, including public names which aren't imported yet.
+
+    :return: names of attributes.
+    :rtype: list
+    """
+    return sorted({*globals(), *__all__})
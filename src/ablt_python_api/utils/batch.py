@@ -0,0 +1,452 @@
+"""
+Filename: batch.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains batch execution of chat requests with bounded concurrency and generic fan-out helpers (thread pool
+and asyncio workers) for batches.
+"""
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from time import perf_counter
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fan_out(
+    execute: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    ordered: bool = True,
+    thread_name_prefix: str = "ablt",
+) -> Generator[R, None, None]:
+    """
+    Executes function for each item in thread pool and yields results. No more than twice the number of workers items
+    are submitted at once, so items may be lazy and endless. Closing of the iterator cancels items which aren't
+    started yet, items in progress are finished in background.
+
+    :param execute: function to execute in worker thread, it should capture its errors into the result.
+    :type execute: Callable[[T], R]
+    :param items: items to execute function for.
+    :type items: Iterable[T]
+    :param max_workers: maximum number of threads.
+    :type max_workers: int
+    :param ordered: yield results in order of items (True) or as soon as they are completed (False).
+    :type ordered: bool
+    :param thread_name_prefix: prefix of names of worker threads.
+    :type thread_name_prefix: str
+    :return: results.
+    :rtype: Generator[R, None, None]
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    items = iter(items)
+    in_flight: Deque[Future] = deque()
+    try:
+        while True:
+            for item in items:
+                in_flight.append(executor.submit(execute, item))
+                if len(in_flight) >= max_workers * 2:
+                    break
+            if not in_flight:
+                return
+            if ordered:
+                future = in_flight.popleft()
+            else:
+                future = wait(in_flight, return_when=FIRST_COMPLETED).done.pop()
+                in_flight.remove(future)
+            yield future.result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+async def afan_out(
+    execute: Callable[[T], Awaitable[R]], items: Iterable[T], concurrency: int, ordered: bool = True
+) -> AsyncGenerator[R, None]:
+    """
+    Executes coroutine function for each item by fixed number of asyncio workers and yields results. No more than
+    twice the concurrency items are taken and not yielded yet (even behind slow item in ordered mode), so items may be
+    lazy and endless. Closing of the iterator cancels items in progress and waits for them.
+
+    :param execute: coroutine function, it should capture its errors into the result.
+    :type execute: Callable[[T], Awaitable[R]]
+    :param items: items to execute function for.
+    :type items: Iterable[T]
+    :param concurrency: maximum number of simultaneous executions.
+    :type concurrency: int
+    :param ordered: yield results in order of items (True) or as soon as they are completed (False).
+    :type ordered: bool
+    :return: results.
+    :rtype: AsyncGenerator[R, None]
+    """
+    # Event loop is already running here, so import is free, while sync users don't load asyncio at all
+    import asyncio  # pylint: disable=import-outside-toplevel
+
+    # Each taken item holds a slot of the window until its result is yielded, so the queue is bounded too
+    window = asyncio.Semaphore(concurrency * 2)
+    queue: asyncio.Queue = asyncio.Queue()
+    numbered = enumerate(items)
+
+    async def worker() -> None:
+        """Takes items one by one, while there is a free slot, until there are no more items."""
+        try:
+            await window.acquire()
+            for index, item in numbered:
+                await queue.put((index, await execute(item)))
+                await window.acquire()
+            window.release()
+        finally:
+            await queue.put(None)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    pending: Dict[int, R] = {}
+    next_index = 0
+    running = len(workers)
+    try:
+        while running:
+            completed = await queue.get()
+            if completed is None:
+                running -= 1
+                continue
+            if not ordered:
+                window.release()
+                yield completed[1]
+                continue
+            pending[completed[0]] = completed[1]
+            while next_index in pending:
+                window.release()
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        for task in workers:
+            task.cancel()
+        # Cancelled executions are finished (e.g. their responses are closed) before the iterator is closed
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+class ChatResult:
+    """This class represents result of single chat request in batch."""
+
+    __slots__ = ("index", "request", "response", "error", "duration")
+
+    def __init__(
+        self,
+        index: int,
+        request: dict,
+        response: Optional[str] = None,
+        error: Optional[BaseException] = None,
+        duration: float = 0.0,
+    ):
+        """
+        Init ChatResult class
+
+        :param index: index of the request in the batch.
+        :type index: int
+        :param request: chat params of the request.
+        :type request: dict
+        :param response: full response from the bot, None if there is no response (see API log for details).
+        :type response: str
+        :param error: exception raised by the request, if any.
+        :type error: BaseException
+        :param duration: duration of the request in seconds.
+        :type duration: float
+        """
+        self.index = index
+        self.request = request
+        self.response = response
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns True if the request succeeded.
+
+        :return: True if there is response and no error.
+        :rtype: bool
+        """
+        return self.error is None and self.response is not None
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the result.
+
+        :return: representation of the result.
+        :rtype: str
+        """
+        return f"ChatResult(index={self.index}, ok={self.ok}, duration={self.duration:.3f}, error={self.error!r})"
+
+
+class BatchInfo:
+    """This class keeps aggregate statistics of the batch."""
+
+    def __init__(self):
+        """Init BatchInfo class"""
+        self.completed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Returns duration of the batch in seconds: from the start till the end (or till now).
+
+        :return: duration in seconds or None if batch wasn't started.
+        :rtype: float | None
+        """
+        if self.started_at is None:
+            return None
+        return (self.finished_at if self.finished_at is not None else perf_counter()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        Returns number of completed requests per second.
+
+        :return: requests per second.
+        :rtype: float
+        """
+        duration = self.duration
+        return self.completed / duration if duration else 0.0
+
+    def _record(self, ok: bool) -> None:
+        """
+        Records outcome of the request.
+
+        :param ok: True if the request succeeded.
+        :type ok: bool
+        """
+        self.completed += 1
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+
+class AsyncChatBatch(BatchInfo):
+    """This class is async iterator over results of chat requests executed concurrently."""
+
+    def __init__(self, chat: Callable[..., Any], requests: Iterable[dict], concurrency: int = 10, ordered: bool = True):
+        """
+        Init AsyncChatBatch class
+
+        :param chat: chat method of the async API.
+        :type chat: Callable
+        :param requests: chat params for each request, e.g. {"bot_slug": "omni", "prompt": "Hi!"}.
+        :type requests: Iterable[dict]
+        :param concurrency: maximum number of simultaneous requests. Default is 10.
+        :type concurrency: int
+        :param ordered: yield results in order of requests (True) or as soon as they are completed (False).
+        :type ordered: bool
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency should be at least 1")
+        super().__init__()
+        self.__chat = chat
+        self.__requests = requests
+        self.__concurrency = concurrency
+        self.__ordered = ordered
+        self.__results: Optional[AsyncIterator[ChatResult]] = None
+
+    def __aiter__(self) -> "AsyncChatBatch":
+        """
+        Returns async iterator.
+
+        :return: self.
+        :rtype: AsyncChatBatch
+        """
+        return self
+
+    async def __anext__(self) -> ChatResult:
+        """
+        Returns next result.
+
+        :return: result of the next request.
+        :rtype: ChatResult
+        """
+        if self.__results is None:
+            self.__results = self.__run()
+        return await self.__results.__anext__()
+
+    async def aclose(self) -> None:
+        """Cancels requests in progress."""
+        if self.__results is not None:
+            await self.__results.aclose()  # type: ignore[attr-defined]
+
+    async def __execute(self, numbered: tuple[int, dict]) -> ChatResult:
+        """
+        Executes single chat request and collects full response.
+
+        :param numbered: index of the request in the batch and chat params of the request.
+        :type numbered: tuple[int, dict]
+        :return: result of the request.
+        :rtype: ChatResult
+        """
+        index, request = numbered
+        started_at = perf_counter()
+        result = ChatResult(index, request)
+        try:
+            chat_stream = self.__chat(**{**request, "raise_on_done": False})
+            messages = [message async for message in chat_stream]
+            result.response = "".join(messages) if messages else None
+        except Exception as error:  # pylint: disable=broad-except
+            result.error = error
+        result.duration = perf_counter() - started_at
+        return result
+
+    async def __run(self) -> AsyncIterator[ChatResult]:
+        """
+        Runs workers and yields results.
+
+        :return: results of the requests.
+        :rtype: AsyncIterator[ChatResult]
+        """
+        self.started_at = perf_counter()
+        results = afan_out(self.__execute, enumerate(self.__requests), self.__concurrency, self.__ordered)
+        try:
+            async for result in results:
+                self._record(result.ok)
+                yield result
+        finally:
+            self.finished_at = perf_counter()
+            await results.aclose()
+
+
+class ChatBatch(BatchInfo):
+    """This class is iterator over results of chat requests executed in thread pool."""
+
+    def __init__(
+        self,
+        chat: Callable[..., Any],
+        requests: Iterable[dict],
+        max_workers: int = 10,
+        ordered: bool = True,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Init ChatBatch class
+
+        :param chat: chat method of the sync API.
+        :type chat: Callable
+        :param requests: chat params for each request, e.g. {"bot_slug": "omni", "prompt": "Hi!"}.
+        :type requests: Iterable[dict]
+        :param max_workers: maximum number of threads (simultaneous requests). Default is 10.
+        :type max_workers: int
+        :param ordered: yield results in order of requests (True) or as soon as they are completed (False).
+        :type ordered: bool
+        :param timeout: timeout for single request in seconds, by default there is no timeout.
+        :type timeout: float
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers should be at least 1")
+        super().__init__()
+        self.__chat = chat
+        self.__requests = requests
+        self.__max_workers = max_workers
+        self.__ordered = ordered
+        self.__timeout = timeout
+        self.__results: Optional[Iterator[ChatResult]] = None
+
+    def __iter__(self) -> "ChatBatch":
+        """
+        Returns iterator.
+
+        :return: self.
+        :rtype: ChatBatch
+        """
+        return self
+
+    def __next__(self) -> ChatResult:
+        """
+        Returns next result.
+
+        :return: result of the next request.
+        :rtype: ChatResult
+        """
+        if self.__results is None:
+            self.__results = self.__run()
+        return next(self.__results)
+
+    def close(self) -> None:
+        """Cancels requests which are not started yet, requests in progress are finished in background."""
+        if self.__results is not None:
+            self.__results.close()  # type: ignore[attr-defined]
+
+    def __execute(self, numbered: tuple[int, dict]) -> ChatResult:
+        """
+        Executes single chat request in worker thread and collects full response.
+
+        :param numbered: index of the request in the batch and chat params of the request.
+        :type numbered: tuple[int, dict]
+        :return: result of the request.
+        :rtype: ChatResult
+        """
+        index, request = numbered
+        started_at = perf_counter()
+        result = ChatResult(index, request)
+        params = {**request, "raise_on_done": False}
+        if self.__timeout is not None:
+            params.setdefault("timeout", self.__timeout)
+        try:
+            chat_stream = self.__chat(**params)
+            messages = []
+            try:
+                for message in chat_stream:
+                    messages.append(message)
+                    if self.__timeout is not None and perf_counter() - started_at > self.__timeout:
+                        raise TimeoutError(f"Request {index} exceeded timeout of {self.__timeout} s")
+            finally:
+                close = getattr(chat_stream, "close", None)
+                if close is not None:
+                    close()
+            result.response = "".join(messages) if messages else None
+        except Exception as error:  # pylint: disable=broad-except
+            result.error = error
+        result.duration = perf_counter() - started_at
+        return result
+
+    def __run(self) -> Iterator[ChatResult]:
+        """
+        Submits requests to the thread pool (no more than twice the number of workers at once) and yields results.
+
+        :return: results of the requests.
+        :rtype: Iterator[ChatResult]
+        """
+        self.started_at = perf_counter()
+        results = fan_out(
+            self.__execute,
+            enumerate(self.__requests),
+            self.__max_workers,
+            self.__ordered,
+            thread_name_prefix="ablt-chat",
+        )
+        try:
+            for result in results:
+                self._record(result.ok)
+                yield result
+        finally:
+            self.finished_at = perf_counter()
+            results.close()
@@ -0,0 +1,179 @@
+"""
+Filename: bot_cache.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains in-memory cache of bot catalog with TTL, conditional revalidation and stale-while-revalidate.
+"""
+
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+from .bot_index import BotIndex
+
+
+class BotCache:
+    """
+    This class keeps bot catalog in memory.
+
+    Catalog is fresh for 'ttl' seconds, then for 'stale_ttl' seconds it's still served while it's refreshed in
+    background, after that it's fetched again before the request. ETag and Last-Modified of the response are kept
+    to revalidate catalog with conditional request, so unchanged catalog isn't downloaded again.
+    Catalog is kept as BotIndex, which is rebuilt only when catalog is changed. Zero 'ttl' disables the cache at all,
+    including stale catalog and conditional requests.
+    """
+
+    def __init__(self, ttl: float = 300.0, stale_ttl: float = 3600.0):
+        """
+        Init BotCache class
+
+        :param ttl: time in seconds while catalog is fresh, 0 disables caching (stale catalog isn't served too).
+                    Default is 5 minutes.
+        :type ttl: float
+        :param stale_ttl: time in seconds after 'ttl' while stale catalog is served and refreshed in background,
+                          0 disables background refresh. Default is 1 hour.
+        :type stale_ttl: float
+        """
+        if ttl < 0 or stale_ttl < 0:
+            raise ValueError("ttl and stale_ttl should be non-negative")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.__lock = Lock()
+        self.__index: Optional[BotIndex] = None
+        self.__fetched_at = 0.0
+        self.__etag: Optional[str] = None
+        self.__last_modified: Optional[str] = None
+        self.__refreshing = False
+
+    @property
+    def age(self) -> Optional[float]:
+        """
+        Returns age of cached catalog in seconds.
+
+        :return: age in seconds or None if catalog isn't cached.
+        :rtype: float | None
+        """
+        if self.__index is None:
+            return None
+        return monotonic() - self.__fetched_at
+
+    @property
+    def is_fresh(self) -> bool:
+        """
+        Returns True if cached catalog may be used without revalidation.
+
+        :return: True if catalog is cached and younger than ttl.
+        :rtype: bool
+        """
+        age = self.age
+        return age is not None and age < self.ttl
+
+    def get(self, allow_stale: bool = True) -> Optional[list[dict]]:
+        """
+        Returns cached catalog.
+
+        :param allow_stale: return stale catalog within 'stale_ttl' window. Default is True.
+        :type allow_stale: bool
+        :return: copy of the list of bots or None if there is no usable catalog.
+        :rtype: list[dict] | None
+        """
+        index = self.get_index(allow_stale)
+        return None if index is None else index.bots
+
+    def get_index(self, allow_stale: bool = True) -> Optional[BotIndex]:
+        """
+        Returns index of cached catalog.
+
+        :param allow_stale: return stale catalog within 'stale_ttl' window. Default is True.
+        :type allow_stale: bool
+        :return: index of bots or None if there is no usable catalog.
+        :rtype: BotIndex | None
+        """
+        index, age = self.__index, self.age
+        if index is None or age is None or not self.ttl:
+            return None
+        if age < self.ttl or (allow_stale and age < self.ttl + self.stale_ttl):
+            return index
+        return None
+
+    def validators(self) -> dict:
+        """
+        Returns headers for conditional request of the catalog.
+
+        :return: 'If-None-Match' and/or 'If-Modified-Since' headers, empty if there is no cached catalog.
+        :rtype: dict
+        """
+        headers = {}
+        if self.__index is not None:
+            if self.__etag:
+                headers["If-None-Match"] = self.__etag
+            if self.__last_modified:
+                headers["If-Modified-Since"] = self.__last_modified
+        return headers
+
+    def store(self, bots: list[dict], etag: Optional[str] = None, last_modified: Optional[str] = None) -> BotIndex:
+        """
+        Stores downloaded catalog and builds its index.
+
+        :param bots: list of bots.
+        :type bots: list[dict]
+        :param etag: ETag header of the response.
+        :type etag: str
+        :param last_modified: Last-Modified header of the response.
+        :type last_modified: str
+        :return: index of bots.
+        :rtype: BotIndex
+        """
+        # Index is built outside the lock and swapped at once, readers see either old or new catalog
+        index = BotIndex(bots)
+        if not self.ttl:
+            # Cache is disabled, catalog is downloaded on each request
+            return index
+        with self.__lock:
+            self.__index = index
+            self.__etag = etag
+            self.__last_modified = last_modified
+            self.__fetched_at = monotonic()
+        return index
+
+    def revalidated(self) -> Optional[BotIndex]:
+        """
+        Marks cached catalog as fresh again after 'Not Modified' response.
+
+        :return: index of bots or None if catalog was invalidated meanwhile.
+        :rtype: BotIndex | None
+        """
+        with self.__lock:
+            if self.__index is not None:
+                self.__fetched_at = monotonic()
+            return self.__index
+
+    def invalidate(self) -> None:
+        """Drops cached catalog, so it will be downloaded on the next request."""
+        with self.__lock:
+            self.__index = None
+            self.__etag = None
+            self.__last_modified = None
+
+    def begin_refresh(self) -> bool:
+        """
+        Marks the start of background refresh.
+
+        :return: True if refresh should be started, False if it's already in progress.
+        :rtype: bool
+        """
+        with self.__lock:
+            if self.__refreshing:
+                return False
+            self.__refreshing = True
+            return True
+
+    def end_refresh(self) -> None:
+        """Marks the end of background refresh."""
+        with self.__lock:
+            self.__refreshing = False
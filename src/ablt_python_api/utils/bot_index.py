@@ -0,0 +1,155 @@
+"""
+Filename: bot_index.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains index of bot catalog for constant-time lookups by uid, slug, name and model.
+"""
+
+from bisect import bisect_left
+from typing import Iterable, Optional
+
+
+class BotIndex:
+    """
+    This class indexes bots (dicts of BotSchema) by uid, slug, name and model.
+
+    Index is immutable: it's built once for the catalog, new catalog gets new index, so readers always see
+    consistent snapshot without locks.
+    """
+
+    __slots__ = ("__bots", "__by_uid", "__by_slug", "__by_name", "__by_lower_name", "__by_model", "__lower_names")
+
+    def __init__(self, bots: Iterable[dict] = ()):
+        """
+        Init BotIndex class
+
+        :param bots: bots (BotSchema dicts) in catalog order.
+        :type bots: Iterable[dict]
+        """
+        self.__bots = tuple(bots)
+        self.__by_uid: dict[str, dict] = {}
+        self.__by_slug: dict[str, dict] = {}
+        self.__by_name: dict[str, dict] = {}
+        self.__by_lower_name: dict[str, dict] = {}
+        self.__by_model: dict[str, list[dict]] = {}
+        for bot in self.__bots:
+            # The first bot wins like in linear search, names and even slugs aren't guaranteed to be unique
+            uid, slug, name, model = bot.get("uid"), bot.get("slug"), bot.get("name"), bot.get("model")
+            # Missed fields aren't indexed, so lookup by None finds nothing
+            if uid is not None:
+                self.__by_uid.setdefault(uid, bot)
+            if slug is not None:
+                self.__by_slug.setdefault(slug, bot)
+            if name is not None:
+                self.__by_name.setdefault(name, bot)
+            if isinstance(name, str):
+                self.__by_lower_name.setdefault(name.casefold(), bot)
+            if model is not None:
+                self.__by_model.setdefault(model, []).append(bot)
+        # Sorted by name, ties are kept in catalog order, so prefix search returns a contiguous slice
+        self.__lower_names = sorted(
+            (bot["name"].casefold(), position)
+            for position, bot in enumerate(self.__bots)
+            if isinstance(bot.get("name"), str)
+        )
+
+    def __len__(self) -> int:
+        """
+        Returns number of bots in the index.
+
+        :return: number of bots.
+        :rtype: int
+        """
+        return len(self.__bots)
+
+    @property
+    def bots(self) -> list[dict]:
+        """
+        Returns all bots in catalog order.
+
+        :return: copy of the list of bots.
+        :rtype: list[dict]
+        """
+        return list(self.__bots)
+
+    def by_uid(self, bot_uid: str) -> Optional[dict]:
+        """
+        Returns bot by uid.
+
+        :param bot_uid: The id of the bot.
+        :type bot_uid: str
+        :return: bot dict (BotSchema).
+        :rtype: dict|None
+        """
+        return self.__by_uid.get(bot_uid)
+
+    def by_slug(self, bot_slug: str) -> Optional[dict]:
+        """
+        Returns bot by slug.
+
+        :param bot_slug: The slug of the bot.
+        :type bot_slug: str
+        :return: bot dict (BotSchema).
+        :rtype: dict|None
+        """
+        return self.__by_slug.get(bot_slug)
+
+    def by_name(self, bot_name: str, case_sensitive: bool = True) -> Optional[dict]:
+        """
+        Returns bot by name.
+
+        :param bot_name: The name of the bot.
+        :type bot_name: str
+        :param case_sensitive: compare names case-sensitively. Default is True.
+        :type case_sensitive: bool
+        :return: bot dict (BotSchema), the first one if name isn't unique.
+        :rtype: dict|None
+        """
+        if case_sensitive:
+            return self.__by_name.get(bot_name)
+        return self.__by_lower_name.get(bot_name.casefold())
+
+    def by_model(self, model: str) -> list[dict]:
+        """
+        Returns bots using the model.
+
+        :param model: The model of the bot, e.g. 'gpt-4'.
+        :type model: str
+        :return: bots in catalog order, empty list if there are no such bots.
+        :rtype: list[dict]
+        """
+        return list(self.__by_model.get(model, ()))
+
+    def by_name_prefix(self, prefix: str) -> list[dict]:
+        """
+        Returns bots which names start with the prefix, case-insensitively.
+
+        :param prefix: beginning of the name.
+        :type prefix: str
+        :return: bots ordered by name.
+        :rtype: list[dict]
+        """
+        prefix = prefix.casefold()
+        lower_names = self.__lower_names
+        bots = []
+        # Binary search for the first match, then matches follow each other: O(log n + k)
+        for item in range(bisect_left(lower_names, (prefix, -1)), len(lower_names)):
+            name, position = lower_names[item]
+            if not name.startswith(prefix):
+                break
+            bots.append(self.__bots[position])
+        return bots
+
+    def models(self) -> list[str]:
+        """
+        Returns models used by bots.
+
+        :return: models in order of the first appearance in catalog.
+        :rtype: list[str]
+        """
+        return list(self.__by_model)
@@ -0,0 +1,156 @@
+"""
+Filename: chat_request.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains reusable chat request with pre-serialized static part of the payload.
+"""
+
+from typing import Any, Optional
+
+from .codec import JSONCodec, default_codec
+
+_KEYS = {"prompt": b'"prompt":', "messages": b'"messages":'}
+
+
+class ChatRequest:
+    """
+    This class represents chat request to the bot: static params (bot, language, assumptions, etc.) are encoded to
+    JSON once, so each call encodes just the prompt or messages.
+    """
+
+    __slots__ = ("__params", "__prefix", "__codec")
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        bot_uid: Optional[str] = None,
+        bot_slug: Optional[str] = None,
+        stream: Optional[bool] = False,
+        user_id: Optional[int] = None,
+        language: Optional[str] = None,
+        assumptions: Optional[dict] = None,
+        max_words: Optional[int] = None,
+        use_search: Optional[bool] = False,
+        json_codec: Optional[JSONCodec] = None,
+    ):
+        """
+        Init ChatRequest class
+
+        :param bot_uid: The id of the bot to chat with.
+        :type bot_uid: str
+        :param bot_slug: The slug of the bot to chat with.
+        :type bot_slug: str
+        :param stream: A flag for streaming mode (default is False).
+        :type stream: bool
+        :param user_id: The user identifier.
+        :type user_id: int
+        :param language: The language of the chat, default is "English".
+        :type language: str
+        :param assumptions: The assumptions for the chat, default is None (TBD). It's encoded at once, so later
+                            changes of the dict are not sent.
+        :type assumptions: dict
+        :param max_words: The maximum number of words in the response, if None, the default value is used.
+        :type max_words: int
+        :param use_search: A flag for using search mode (default is False).
+        :type use_search: bool
+        :param json_codec: JSON codec for the payload, by default the fastest installed one is used.
+        :type json_codec: JSONCodec
+        :raises ValueError: If not exactly one of 'bot_uid' or 'bot_slug' is provided.
+        """
+        if (not bot_slug and not bot_uid) or (bot_slug and bot_uid):
+            raise ValueError("Only one param is required ('bot_slug' or 'bot_uid')")
+        self.__codec = default_codec if json_codec is None else json_codec
+        params = {
+            "bot_slug": bot_slug,
+            "bot_uid": bot_uid,
+            "language": language,
+            "max_words": max_words,
+            "assumptions": assumptions,
+            "user_id": user_id,
+            "use_search": use_search,
+        }
+        self.__params = {"stream": stream, **{name: value for name, value in params.items() if value is not None}}
+        # Encoded object without closing brace, per-call part is appended as the last key
+        self.__prefix = self.__codec.dumps(self.__params)[:-1] + b","
+
+    @property
+    def stream(self) -> bool:
+        """
+        Returns True if the response is requested in streaming mode.
+
+        :return: streaming mode flag.
+        :rtype: bool
+        """
+        return bool(self.__params["stream"])
+
+    @property
+    def params(self) -> dict:
+        """
+        Returns static params of the request.
+
+        :return: copy of static params, without None values (except 'stream').
+        :rtype: dict
+        """
+        return dict(self.__params)
+
+    def payload(self, prompt: Optional[str] = None, messages: Optional[list] = None) -> dict:
+        """
+        Returns payload of the request as dict, e.g. for logging.
+
+        :param prompt: The text prompt for the bot.
+        :type prompt: str
+        :param messages: A list of messages for the bot.
+        :type messages: list[dict]
+        :return: payload.
+        :rtype: dict
+        :raises ValueError: If not exactly one of 'prompt' or 'messages' is provided.
+        """
+        name, value = self.__message(prompt, messages)
+        return {**self.__params, name: value}
+
+    def encode(self, prompt: Optional[str] = None, messages: Optional[list] = None) -> bytes:
+        """
+        Returns JSON body of the request, only the prompt or messages are encoded.
+
+        :param prompt: The text prompt for the bot.
+        :type prompt: str
+        :param messages: A list of messages for the bot.
+        :type messages: list[dict]
+        :return: JSON body.
+        :rtype: bytes
+        :raises ValueError: If not exactly one of 'prompt' or 'messages' is provided.
+        """
+        name, value = self.__message(prompt, messages)
+        return b"".join((self.__prefix, _KEYS[name], self.__codec.dumps(value), b"}"))
+
+    @staticmethod
+    def __message(prompt: Optional[str], messages: Optional[list]) -> tuple[str, Any]:
+        """
+        Returns name and value of the per-call part of the payload.
+
+        :param prompt: The text prompt for the bot.
+        :type prompt: str
+        :param messages: A list of messages for the bot.
+        :type messages: list[dict]
+        :return: ('prompt', prompt) or ('messages', messages).
+        :rtype: tuple[str, Any]
+        :raises ValueError: If not exactly one of 'prompt' or 'messages' is provided.
+        """
+        if (prompt is None) == (messages is None):
+            raise ValueError("Only one param is required ('prompt' or 'messages')")
+        return ("prompt", prompt) if prompt is not None else ("messages", messages)
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the request.
+
+        :return: representation of the request.
+        :rtype: str
+        """
+        params = ", ".join(f"{name}={value!r}" for name, value in self.__params.items())
+        return f"ChatRequest({params})"
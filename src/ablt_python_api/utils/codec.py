@@ -0,0 +1,120 @@
+"""
+Filename: codec.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains JSON codecs, the fastest installed one (orjson, ujson or stdlib json) is used by default.
+"""
+
+import json
+import warnings
+from os import environ
+from typing import Any, Callable, Optional, Union
+
+CODECS = ("orjson", "ujson", "json")
+
+
+class JSONCodec:
+    """This class represents JSON codec: encoder to bytes and decoder from str or bytes."""
+
+    __slots__ = ("name", "dumps", "loads")
+
+    def __init__(self, name: str, dumps: Callable[[Any], bytes], loads: Callable[[Union[str, bytes]], Any]):
+        """
+        Init JSONCodec class
+
+        :param name: name of the codec.
+        :type name: str
+        :param dumps: function to encode object to JSON bytes.
+        :type dumps: Callable
+        :param loads: function to decode JSON str or bytes, it should raise ValueError on malformed JSON.
+        :type loads: Callable
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the codec.
+
+        :return: representation of the codec.
+        :rtype: str
+        """
+        return f"JSONCodec({self.name!r})"
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """
+    Encodes object to compact JSON with stdlib json.
+
+    :param obj: object to encode.
+    :type obj: Any
+    :return: JSON bytes.
+    :rtype: bytes
+    """
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """
+    Returns JSON codec by name or the fastest installed one.
+
+    :param name: 'orjson', 'ujson', 'json' or None to select automatically (may be set by ABLT_JSON_CODEC env).
+    :type name: str
+    :return: JSON codec.
+    :rtype: JSONCodec
+    :raises ValueError: If codec name is unknown.
+    :raises ImportError: If requested codec isn't installed.
+    """
+    name = name or environ.get("ABLT_JSON_CODEC")
+    if name is None:
+        for codec_name in CODECS:
+            try:
+                return get_codec(codec_name)
+            except ImportError:
+                continue
+    if name == "orjson":
+        import orjson  # pylint: disable=import-outside-toplevel
+
+        return JSONCodec("orjson", orjson.dumps, orjson.loads)
+    if name == "ujson":
+        import ujson  # pylint: disable=import-outside-toplevel
+
+        def _ujson_dumps(obj: Any) -> bytes:
+            """
+            Encodes object to JSON with ujson.
+
+            :param obj: object to encode.
+            :type obj: Any
+            :return: JSON bytes.
+            :rtype: bytes
+            """
+            return ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+        return JSONCodec("ujson", _ujson_dumps, ujson.loads)
+    if name == "json":
+        return JSONCodec("json", _stdlib_dumps, json.loads)
+    raise ValueError(f"Unknown JSON codec: {name}, use one of {CODECS}")
+
+
+def _get_default_codec() -> JSONCodec:
+    """
+    Returns default JSON codec: set by ABLT_JSON_CODEC env or the fastest installed one. Unknown or not installed codec
+    of the env doesn't break import of the package, stdlib json is used instead.
+
+    :return: JSON codec.
+    :rtype: JSONCodec
+    """
+    try:
+        return get_codec()
+    except (ValueError, ImportError) as err:
+        warnings.warn(f"JSON codec of ABLT_JSON_CODEC env isn't available ({err}), stdlib json is used", RuntimeWarning)
+        return get_codec("json")
+
+
+default_codec = _get_default_codec()
@@ -0,0 +1,411 @@
+"""
+Filename: columnar.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains columnar storage of statistics items with rollups, moving averages and top days.
+"""
+
+import heapq
+from array import array
+from collections import defaultdict
+from datetime import date
+from typing import Any, Iterable, Optional, Union
+
+from .statistics import STAT_FIELDS
+
+BACKENDS = ("numpy", "array")
+PERIODS = ("day", "week", "month", "user")
+
+
+def _format_key(period: str, key: int) -> Union[str, int]:
+    """
+    Formats rollup key.
+
+    :param period: 'day', 'week', 'month' or 'user'.
+    :type period: str
+    :param key: day ordinal, ordinal of Monday, month number (year * 12 + month - 1) or user id.
+    :type key: int
+    :return: date of the day or Monday in format YYYY-MM-DD, month in format YYYY-MM or user id.
+    :rtype: str | int
+    """
+    if period in ("day", "week"):
+        return date.fromordinal(key).isoformat()
+    if period == "month":
+        return f"{key // 12:04d}-{key % 12 + 1:02d}"
+    return key
+
+
+class StatisticsColumns:
+    """
+    This class keeps statistics items of one or many users column by column.
+
+    Every column is compact array of 64-bit integers: user id, day (ordinal), month and a column per counter.
+    With NumPy rollups are vectorized over zero-copy views of the arrays, without it they run in tight loops
+    over the arrays, which is still much faster than loops over dicts or pydantic objects.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Init StatisticsColumns class
+
+        :param backend: 'numpy', 'array' or None to use NumPy if it's installed.
+        :type backend: str
+        :raises ValueError: If backend is unknown.
+        :raises ImportError: If NumPy is requested, but isn't installed.
+        """
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}, use one of {BACKENDS}")
+        self.__np: Any = None
+        if backend in (None, "numpy"):
+            try:
+                import numpy  # pylint: disable=import-outside-toplevel
+
+                self.__np = numpy
+            except ImportError:
+                if backend == "numpy":
+                    raise
+        self.backend = "numpy" if self.__np is not None else "array"
+        self.__users = array("q")
+        self.__days = array("q")
+        self.__months = array("q")
+        self.__columns = {field: array("q") for field in STAT_FIELDS}
+
+    @classmethod
+    def from_statistics(
+        cls, statistics: Union[dict, Any], user_id: int = -1, backend: Optional[str] = None
+    ) -> "StatisticsColumns":
+        """
+        Creates columns from get_usage_statistics output.
+
+        :param statistics: statistics (StatisticsSchema dict or model).
+        :type statistics: dict | StatisticsSchema
+        :param user_id: The id of the user the statistics belong to. Default is -1.
+        :type user_id: int
+        :param backend: 'numpy', 'array' or None to use NumPy if it's installed.
+        :type backend: str
+        :return: columns.
+        :rtype: StatisticsColumns
+        """
+        return cls(backend).add(statistics, user_id)
+
+    @classmethod
+    def from_users(
+        cls, statistics_by_user: dict[int, Union[dict, Any]], backend: Optional[str] = None
+    ) -> "StatisticsColumns":
+        """
+        Creates columns from statistics of many users.
+
+        :param statistics_by_user: statistics (StatisticsSchema dict or model) by user id, None values are skipped.
+        :type statistics_by_user: dict[int, dict | StatisticsSchema]
+        :param backend: 'numpy', 'array' or None to use NumPy if it's installed.
+        :type backend: str
+        :return: columns.
+        :rtype: StatisticsColumns
+        """
+        columns = cls(backend)
+        for user_id, statistics in statistics_by_user.items():
+            columns.add(statistics, user_id)
+        return columns
+
+    def add(self, statistics: Union[dict, Any, None], user_id: int = -1) -> "StatisticsColumns":
+        """
+        Appends statistics items of the user.
+
+        :param statistics: statistics (StatisticsSchema dict or model) or just list of items (dicts, models or
+                           StatisticItemRecord), None is skipped.
+        :type statistics: dict | StatisticsSchema | list | None
+        :param user_id: The id of the user the statistics belong to. Default is -1.
+        :type user_id: int
+        :return: self.
+        :rtype: StatisticsColumns
+        """
+        if statistics is None:
+            return self
+        if isinstance(statistics, dict):
+            items: Iterable = statistics.get("items") or ()
+        else:
+            items = getattr(statistics, "items", statistics)
+        columns = [(self.__columns[field], field) for field in STAT_FIELDS]
+        for item in items:
+            if not isinstance(item, dict):
+                # Models and records (StatisticItemRecord) are read by attributes without conversion to dict
+                item = {field: getattr(item, field) for field in (*STAT_FIELDS, "date")}
+            day = item["date"]
+            if isinstance(day, str):
+                day = date.fromisoformat(day)
+            self.__users.append(user_id)
+            self.__days.append(day.toordinal())
+            self.__months.append(day.year * 12 + day.month - 1)
+            for column, field in columns:
+                column.append(item.get(field, 0))
+        return self
+
+    def __len__(self) -> int:
+        """
+        Returns number of items.
+
+        :return: number of items.
+        :rtype: int
+        """
+        return len(self.__days)
+
+    def users(self) -> list[int]:
+        """
+        Returns ids of users.
+
+        :return: sorted ids of users.
+        :rtype: list[int]
+        """
+        return sorted(set(self.__users))
+
+    def column(self, field: str) -> Any:
+        """
+        Returns copy of the column.
+
+        :param field: counter, e.g. 'total_tokens', or 'user_id', 'day' (ordinal), 'month' (year * 12 + month - 1).
+        :type field: str
+        :return: NumPy array or array of integers, depending on backend.
+        :rtype: numpy.ndarray | array
+        """
+        source = {"user_id": self.__users, "day": self.__days, "month": self.__months}.get(field)
+        source = self.__columns[field] if source is None else source
+        if self.__np is not None:
+            return self.__np.array(source, dtype=self.__np.int64)
+        return array("q", source)
+
+    def total(self, user_id: Optional[int] = None) -> dict:
+        """
+        Returns total statistics.
+
+        :param user_id: The id of the user to get total for. By default, total of all users is returned.
+        :type user_id: int
+        :return: total statistics (StatisticTotalSchema).
+        :rtype: dict
+        """
+        if user_id is None:
+            return {field: int(sum(self.__columns[field])) for field in STAT_FIELDS}
+        return self.rollup("user").get(user_id, dict.fromkeys(STAT_FIELDS, 0))
+
+    def rollup(self, period: str = "month", per_user: bool = False) -> dict:
+        """
+        Sums counters by period.
+
+        :param period: 'day', 'week' (starting on Monday), 'month' or 'user'. Default is 'month'.
+        :type period: str
+        :param per_user: sum by user and period, keys are (user_id, period) pairs then. Default is False.
+        :type per_user: bool
+        :return: totals (StatisticTotalSchema dicts) by date (YYYY-MM-DD), month (YYYY-MM) or user id, ordered by key.
+        :rtype: dict
+        :raises ValueError: If period is unknown.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}, use one of {PERIODS}")
+        per_user = per_user and period != "user"
+        if self.__np is not None:
+            keys, sums = self.__rollup_numpy(period, per_user)
+        else:
+            keys, sums = self.__rollup_array(period, per_user)
+        formatted: dict = {}
+        result = {}
+        for key, values in zip(keys, sums):
+            period_key = key[1] if per_user else key
+            label = formatted.get(period_key)
+            if label is None:
+                label = formatted[period_key] = _format_key(period, period_key)
+            result[(key[0], label) if per_user else label] = dict(zip(STAT_FIELDS, values))
+        return result
+
+    def __period_keys(self, period: str) -> Iterable[int]:
+        """
+        Returns period key of every item.
+
+        :param period: 'day', 'week', 'month' or 'user'.
+        :type period: str
+        :return: keys.
+        :rtype: Iterable[int]
+        """
+        if period == "week":
+            # Day 1 (0001-01-01) is Monday
+            return (day - (day - 1) % 7 for day in self.__days)
+        return {"day": self.__days, "month": self.__months, "user": self.__users}[period]
+
+    def __rollup_array(self, period: str, per_user: bool) -> tuple[list, list]:
+        """
+        Sums counters by period in loops over arrays.
+
+        :param period: 'day', 'week', 'month' or 'user'.
+        :type period: str
+        :param per_user: sum by user and period.
+        :type per_user: bool
+        :return: sorted keys and sums of counters for each key.
+        :rtype: tuple[list, list]
+        """
+        keys: list = list(self.__period_keys(period))
+        if per_user:
+            keys = list(zip(self.__users, keys))
+        groups: dict = {}
+        for key in keys:
+            groups.setdefault(key, len(groups))
+        group_of_row = [groups[key] for key in keys]
+        sums = [[0] * len(groups) for _ in STAT_FIELDS]
+        for field_sums, field in zip(sums, STAT_FIELDS):
+            for group, value in zip(group_of_row, self.__columns[field]):
+                field_sums[group] += value
+        ordered = sorted(groups)
+        return ordered, [[field_sums[groups[key]] for field_sums in sums] for key in ordered]
+
+    def __rollup_numpy(self, period: str, per_user: bool) -> tuple[list, list]:
+        """
+        Sums counters by period with NumPy.
+
+        :param period: 'day', 'week', 'month' or 'user'.
+        :type period: str
+        :param per_user: sum by user and period.
+        :type per_user: bool
+        :return: sorted keys and sums of counters for each key.
+        :rtype: tuple[list, list]
+        """
+        np = self.__np
+        if not self.__days:
+            return [], []
+        days = np.frombuffer(self.__days, dtype=np.int64)
+        if period == "week":
+            keys = days - (days - 1) % 7
+        elif period == "day":
+            keys = days
+        else:
+            keys = np.frombuffer(self.__months if period == "month" else self.__users, dtype=np.int64)
+        key_min = int(keys.min())
+        if per_user:
+            # (user, key) pair is packed into single integer, so it's grouped like plain key
+            users = np.frombuffer(self.__users, dtype=np.int64)
+            user_min, key_span = int(users.min()), int(keys.max()) - key_min + 1
+            unique, inverse = self.__group((users - user_min) * key_span + (keys - key_min))
+            unique_keys = list(zip((unique // key_span + user_min).tolist(), (unique % key_span + key_min).tolist()))
+        else:
+            unique, inverse = self.__group(keys - key_min)
+            unique_keys = (unique + key_min).tolist()
+        sums = np.empty((len(unique_keys), len(STAT_FIELDS)), dtype=np.int64)
+        for position, field in enumerate(STAT_FIELDS):
+            # Weights are summed as float64, it's exact for sums up to 2^53
+            sums[:, position] = np.bincount(
+                inverse, weights=np.frombuffer(self.__columns[field], dtype=np.int64), minlength=len(unique_keys)
+            ).round()
+        return unique_keys, sums.tolist()
+
+    def __group(self, offsets: Any) -> tuple[Any, Any]:
+        """
+        Groups non-negative integer keys.
+
+        :param offsets: keys, minimal key is 0.
+        :type offsets: numpy.ndarray
+        :return: sorted unique keys and group number of every key.
+        :rtype: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        np = self.__np
+        span = int(offsets.max()) + 1
+        if span > 4 * len(offsets) + 1024:
+            unique, inverse = np.unique(offsets, return_inverse=True)
+            return unique, inverse.reshape(-1)
+        # Dense keys (days, weeks, months, users) are grouped in linear time without sorting
+        unique = np.flatnonzero(np.bincount(offsets, minlength=span))
+        groups = np.zeros(span, dtype=np.int64)
+        groups[unique] = np.arange(len(unique))
+        return unique, groups[offsets]
+
+    def __daily(self, field: str, user_id: Optional[int]) -> tuple[list[int], list[int]]:
+        """
+        Returns daily sums of the counter for every day from the first till the last one.
+
+        :param field: counter, e.g. 'total_tokens'.
+        :type field: str
+        :param user_id: The id of the user, by default all users are summed.
+        :type user_id: int
+        :return: day ordinals and sums, days without items are zeros.
+        :rtype: tuple[list[int], list[int]]
+        """
+        if field not in self.__columns:
+            raise ValueError(f"Unknown field: {field}, use one of {STAT_FIELDS}")
+        values = self.__columns[field]
+        if self.__np is not None:
+            np = self.__np
+            if not self.__days:
+                return [], []
+            days = np.frombuffer(self.__days, dtype=np.int64)
+            weights = np.frombuffer(values, dtype=np.int64)
+            if user_id is not None:
+                mask = np.frombuffer(self.__users, dtype=np.int64) == user_id
+                days, weights = days[mask], weights[mask]
+            if days.size == 0:
+                return [], []
+            first = int(days.min())
+            sums = np.bincount(days - first, weights=weights).round().astype(np.int64)
+            return list(range(first, first + len(sums))), sums.tolist()
+        daily: defaultdict = defaultdict(int)
+        if user_id is None:
+            for day, value in zip(self.__days, values):
+                daily[day] += value
+        else:
+            for day, user, value in zip(self.__days, self.__users, values):
+                if user == user_id:
+                    daily[day] += value
+        if not daily:
+            return [], []
+        first, last = min(daily), max(daily)
+        return list(range(first, last + 1)), [daily.get(day, 0) for day in range(first, last + 1)]
+
+    def moving_average(
+        self, field: str = "total_tokens", window: int = 7, user_id: Optional[int] = None
+    ) -> list[tuple[str, float]]:
+        """
+        Returns trailing moving average of daily sums, days without items are counted as zeros.
+
+        :param field: counter, e.g. 'total_tokens'. Default is 'total_tokens'.
+        :type field: str
+        :param window: number of days in window. Default is 7.
+        :type window: int
+        :param user_id: The id of the user, by default all users are summed.
+        :type user_id: int
+        :return: (date, average) pairs for days which have full window behind them.
+        :rtype: list[tuple[str, float]]
+        """
+        if window < 1:
+            raise ValueError("window should be at least 1 day")
+        days, sums = self.__daily(field, user_id)
+        if len(sums) < window:
+            return []
+        if self.__np is not None:
+            cumulative = self.__np.cumsum([0] + sums)
+            averages = ((cumulative[window:] - cumulative[:-window]) / window).tolist()
+        else:
+            averages = []
+            running = sum(sums[:window])
+            averages.append(running / window)
+            for position in range(window, len(sums)):
+                running += sums[position] - sums[position - window]
+                averages.append(running / window)
+        return [(date.fromordinal(day).isoformat(), average) for day, average in zip(days[window - 1 :], averages)]
+
+    def top_days(
+        self, n: int = 10, field: str = "total_tokens", user_id: Optional[int] = None
+    ) -> list[tuple[str, int]]:
+        """
+        Returns days with the highest usage.
+
+        :param n: number of days. Default is 10.
+        :type n: int
+        :param field: counter, e.g. 'total_tokens'. Default is 'total_tokens'.
+        :type field: str
+        :param user_id: The id of the user, by default all users are summed.
+        :type user_id: int
+        :return: (date, sum) pairs ordered by sum (descending), then by date.
+        :rtype: list[tuple[str, int]]
+        """
+        days, sums = self.__daily(field, user_id)
+        top = heapq.nsmallest(n, zip(days, sums), key=lambda pair: (-pair[1], pair[0]))
+        return [(date.fromordinal(day).isoformat(), value) for day, value in top]
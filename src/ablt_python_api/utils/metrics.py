@@ -0,0 +1,561 @@
+"""
+Filename: metrics.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains zero-dependency metrics registry (counters, gauges, histograms) with Prometheus text exposition
+and metrics of API wrappers: requests by endpoint and status, errors, retries, connection reuse and chat streams.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .request_trace import RequestTrace
+    from .stream import StreamInfo
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+
+def _format_value(value: float) -> str:
+    """
+    Formats sample value for Prometheus text format.
+
+    :param value: value.
+    :type value: float
+    :return: formatted value.
+    :rtype: str
+    """
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    """
+    Formats labels for Prometheus text format.
+
+    :param names: names of labels.
+    :type names: tuple
+    :param values: values of labels.
+    :type values: tuple
+    :return: labels in braces, or empty string if there are no labels.
+    :rtype: str
+    """
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """This class is base of metrics: values are kept per tuple of label values."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()):
+        """
+        Init Metric class
+
+        :param name: name of metric, e.g. 'ablt_requests_total'.
+        :type name: str
+        :param documentation: help text of metric.
+        :type documentation: str
+        :param labelnames: names of labels.
+        :type labelnames: tuple
+        """
+        if not _NAME.fullmatch(name) or not all(_NAME.fullmatch(label) for label in labelnames):
+            raise ValueError(f"Invalid name of metric or its labels: {name} {labelnames}")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _check(self, labels: tuple) -> None:
+        """
+        Checks values of labels, it's called only for new combination of labels.
+
+        :param labels: values of labels.
+        :type labels: tuple
+        :raises ValueError: If number of values doesn't match number of labels.
+        """
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {labels}")
+
+    def _add(self, amount: float, labels: tuple) -> None:
+        """
+        Adds amount to value.
+
+        :param amount: amount.
+        :type amount: float
+        :param labels: values of labels.
+        :type labels: tuple
+        """
+        with self._lock:
+            value = self._values.get(labels)
+            if value is None:
+                self._check(labels)
+                value = 0
+            self._values[labels] = value + amount
+
+    def get(self, labels: tuple = ()) -> Any:
+        """
+        Returns value of metric.
+
+        :param labels: values of labels.
+        :type labels: tuple
+        :return: value, 0 if it wasn't changed.
+        :rtype: Any
+        """
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[tuple[str, tuple, tuple, float]]:
+        """
+        Returns samples of metric.
+
+        :return: list of (name, label names, label values, value).
+        :rtype: list[tuple]
+        """
+        with self._lock:
+            values = list(self._values.items())
+        return [(self.name, self.labelnames, labels, value) for labels, value in values]
+
+    def snapshot(self) -> list[dict]:
+        """
+        Returns values of metric.
+
+        :return: list of dicts with 'labels' (dict) and 'value'.
+        :rtype: list[dict]
+        """
+        with self._lock:
+            values = list(self._values.items())
+        return [{"labels": dict(zip(self.labelnames, labels)), "value": value} for labels, value in values]
+
+
+class Counter(Metric):
+    """This class is counter, its values only grow."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, labels: tuple = ()) -> None:
+        """
+        Increments counter.
+
+        :param amount: non-negative amount. Default is 1.
+        :type amount: float
+        :param labels: values of labels.
+        :type labels: tuple
+        """
+        if amount < 0:
+            raise ValueError("Counter can't be decreased")
+        self._add(amount, labels)
+
+
+class Gauge(Metric):
+    """This class is gauge, its values may go up and down."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, labels: tuple = ()) -> None:
+        """
+        Increments gauge.
+
+        :param amount: amount, may be negative. Default is 1.
+        :type amount: float
+        :param labels: values of labels.
+        :type labels: tuple
+        """
+        self._add(amount, labels)
+
+    def dec(self, amount: float = 1, labels: tuple = ()) -> None:
+        """
+        Decrements gauge.
+
+        :param amount: amount. Default is 1.
+        :type amount: float
+        :param labels: values of labels.
+        :type labels: tuple
+        """
+        self._add(-amount, labels)
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        """
+        Sets value of gauge.
+
+        :param value: value.
+        :type value: float
+        :param labels: values of labels.
+        :type labels: tuple
+        """
+        with self._lock:
+            if labels not in self._values:
+                self._check(labels)
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    """This class is histogram: counts of observations by buckets, their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Init Histogram class
+
+        :param name: name of metric, e.g. 'ablt_request_duration_seconds'.
+        :type name: str
+        :param documentation: help text of metric.
+        :type documentation: str
+        :param labelnames: names of labels.
+        :type labelnames: tuple
+        :param buckets: sorted upper bounds of buckets, +Inf bucket is added. Default is DEFAULT_BUCKETS (seconds).
+        :type buckets: tuple
+        """
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            raise ValueError("Buckets should be sorted and unique")
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(float(bucket) for bucket in buckets)
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        """
+        Observes value.
+
+        :param value: value, e.g. duration in seconds.
+        :type value: float
+        :param labels: values of labels.
+        :type labels: tuple
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                self._check(labels)
+                # Counts of buckets (not cumulative, the last one is +Inf), sum and count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> list[tuple[str, tuple, tuple, float]]:
+        """
+        Returns samples of metric: cumulative buckets, sum and count.
+
+        :return: list of (name, label names, label values, value).
+        :rtype: list[tuple]
+        """
+        with self._lock:
+            values = [(labels, list(counts), total, count) for labels, (counts, total, count) in self._values.items()]
+        samples: list[tuple[str, tuple, tuple, float]] = []
+        bucket_labelnames = self.labelnames + ("le",)
+        for labels, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", bucket_labelnames, labels + (_format_value(bound),), cumulative))
+            samples.append((f"{self.name}_sum", self.labelnames, labels, total))
+            samples.append((f"{self.name}_count", self.labelnames, labels, count))
+        return samples
+
+    def get(self, labels: tuple = ()) -> Optional[dict]:
+        """
+        Returns value of histogram.
+
+        :param labels: values of labels.
+        :type labels: tuple
+        :return: dict with cumulative 'buckets', 'sum' and 'count', None if there were no observations.
+        :rtype: dict | None
+        """
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                return None
+            counts, total, count = list(state[0]), state[1], state[2]
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            buckets[_format_value(bound)] = cumulative
+        return {"buckets": buckets, "sum": total, "count": count}
+
+    def snapshot(self) -> list[dict]:
+        """
+        Returns values of metric.
+
+        :return: list of dicts with 'labels' (dict) and 'value' (dict with cumulative 'buckets', 'sum' and 'count').
+        :rtype: list[dict]
+        """
+        with self._lock:
+            labels_list = list(self._values)
+        return [{"labels": dict(zip(self.labelnames, labels)), "value": self.get(labels)} for labels in labels_list]
+
+
+class MetricsRegistry:
+    """This class keeps metrics and renders them in Prometheus text format or as dict."""
+
+    def __init__(self):
+        """Init MetricsRegistry class"""
+        self.__metrics: dict[str, Metric] = {}
+        self.__lock = threading.Lock()
+
+    def __get_or_create(self, kind: type, name: str, *args: Any) -> Any:
+        """
+        Returns registered metric or registers new one.
+
+        :param kind: class of metric.
+        :type kind: type
+        :param name: name of metric.
+        :type name: str
+        :param args: other params of metric.
+        :return: metric.
+        :rtype: Metric
+        :raises ValueError: If metric with the same name, but of other type or labels is registered.
+        """
+        with self.__lock:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = self.__metrics[name] = kind(name, *args)
+            elif not isinstance(metric, kind) or metric.labelnames != tuple(args[1]):
+                raise ValueError(
+                    f"Metric {name} is already registered as {metric.kind} with labels {metric.labelnames}"
+                )
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple = ()) -> Counter:
+        """
+        Returns counter, it's registered on first call.
+
+        :param name: name of metric, e.g. 'ablt_requests_total'.
+        :type name: str
+        :param documentation: help text of metric.
+        :type documentation: str
+        :param labelnames: names of labels.
+        :type labelnames: tuple
+        :return: counter.
+        :rtype: Counter
+        """
+        return self.__get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple = ()) -> Gauge:
+        """
+        Returns gauge, it's registered on first call.
+
+        :param name: name of metric, e.g. 'ablt_requests_in_flight'.
+        :type name: str
+        :param documentation: help text of metric.
+        :type documentation: str
+        :param labelnames: names of labels.
+        :type labelnames: tuple
+        :return: gauge.
+        :rtype: Gauge
+        """
+        return self.__get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """
+        Returns histogram, it's registered on first call.
+
+        :param name: name of metric, e.g. 'ablt_request_duration_seconds'.
+        :type name: str
+        :param documentation: help text of metric.
+        :type documentation: str
+        :param labelnames: names of labels.
+        :type labelnames: tuple
+        :param buckets: sorted upper bounds of buckets. Default is DEFAULT_BUCKETS (seconds).
+        :type buckets: tuple
+        :return: histogram.
+        :rtype: Histogram
+        """
+        return self.__get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """
+        Returns registered metric.
+
+        :param name: name of metric.
+        :type name: str
+        :return: metric or None if there is no such metric.
+        :rtype: Metric | None
+        """
+        return self.__metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Renders metrics in Prometheus text exposition format (see CONTENT_TYPE), e.g. for /metrics endpoint.
+
+        :return: metrics as text.
+        :rtype: str
+        """
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        lines = []
+        for metric in metrics:
+            documentation = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {metric.name} {documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labelnames, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def snapshot(self) -> dict:
+        """
+        Returns metrics as dict.
+
+        :return: dict of metric name to dict with 'type', 'help' and 'values' (list of dicts with 'labels' and
+                 'value').
+        :rtype: dict
+        """
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        return {
+            metric.name: {"type": metric.kind, "help": metric.documentation, "values": metric.snapshot()}
+            for metric in metrics
+        }
+
+
+class APIMetrics:
+    """
+    This class feeds metrics of API wrapper to registry, it listens to traces of requests and finished chat streams.
+    Metrics are shared by API wrappers, which use the same registry.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, registry: MetricsRegistry):
+        """
+        Init APIMetrics class
+
+        :param registry: registry to keep metrics.
+        :type registry: MetricsRegistry
+        """
+        self.registry = registry
+        self.requests = registry.counter(
+            "ablt_requests_total",
+            "Requests to aBLT API by method, endpoint and status",
+            ("method", "endpoint", "status"),
+        )
+        self.request_duration = registry.histogram(
+            "ablt_request_duration_seconds", "Duration of requests including read of the body", ("method", "endpoint")
+        )
+        self.in_flight = registry.gauge("ablt_requests_in_flight", "Requests in progress, each holds pooled connection")
+        self.connections = registry.counter(
+            "ablt_connections_total", "Connections taken from the pool by reuse of pooled one", ("reused",)
+        )
+        self.errors = registry.counter("ablt_errors_total", "Failed requests by type of error", ("type",))
+        self.retries = registry.counter("ablt_retries_total", "Retries by operation", ("operation",))
+        self.stream_duration = registry.histogram("ablt_stream_duration_seconds", "Duration of chat responses")
+        self.time_to_first_token = registry.histogram(
+            "ablt_stream_time_to_first_token_seconds", "Time from the request till the first message of chat response"
+        )
+        self.stream_events = registry.histogram(
+            "ablt_stream_events", "Server-sent events per streamed chat response", buckets=COUNT_BUCKETS
+        )
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares listeners, metrics of the same registry are the same, so tracer notifies only one of them.
+
+        :param other: other object.
+        :type other: object
+        :return: True if other feeds the same registry.
+        :rtype: bool
+        """
+        return isinstance(other, APIMetrics) and other.registry is self.registry
+
+    def __hash__(self) -> int:
+        """
+        Returns hash of listener.
+
+        :return: hash of the registry.
+        :rtype: int
+        """
+        return id(self.registry)
+
+    def trace_started(self, _trace: "RequestTrace") -> None:
+        """
+        Counts request in progress.
+
+        :param _trace: trace of the request.
+        :type _trace: RequestTrace
+        """
+        self.in_flight.inc()
+
+    def trace_finished(self, trace: "RequestTrace") -> None:
+        """
+        Counts finished request.
+
+        :param trace: trace of the request.
+        :type trace: RequestTrace
+        """
+        self.in_flight.dec()
+        endpoint = urlsplit(trace.url).path
+        status = "error" if trace.status is None else str(trace.status)
+        self.requests.inc(labels=(trace.method, endpoint, status))
+        self.request_duration.observe(trace.total, (trace.method, endpoint))  # type: ignore[arg-type]
+        if trace.reused is not None:
+            self.connections.inc(labels=("true" if trace.reused else "false",))
+        if trace.error is not None:
+            self.errors.inc(labels=(trace.error,))
+
+    def retry(self, operation: str) -> None:
+        """
+        Counts retry.
+
+        :param operation: name of retried operation, e.g. 'health_check'.
+        :type operation: str
+        """
+        self.retries.inc(labels=(operation,))
+
+    def stream_finished(self, stream: "StreamInfo") -> None:
+        """
+        Observes finished chat response.
+
+        :param stream: chat response stream.
+        :type stream: StreamInfo
+        """
+        if stream.duration is not None:
+            self.stream_duration.observe(stream.duration)
+        if stream.time_to_first_token is not None:
+            self.time_to_first_token.observe(stream.time_to_first_token)
+        if stream.events:
+            self.stream_events.observe(stream.events)
+
+    def on_finish(self, callback: Optional[Callable[["StreamInfo"], None]] = None) -> Callable[["StreamInfo"], None]:
+        """
+        Returns callback for chat response stream, which observes it and calls user's callback.
+
+        :param callback: user's callback.
+        :type callback: Callable[[StreamInfo], None]
+        :return: callback.
+        :rtype: Callable[[StreamInfo], None]
+        """
+        if callback is None:
+            return self.stream_finished
+
+        def on_finish(stream: "StreamInfo") -> None:
+            """
+            Observes chat response and calls user's callback.
+
+            :param stream: chat response stream.
+            :type stream: StreamInfo
+            """
+            self.stream_finished(stream)
+            callback(stream)
+
+        return on_finish
@@ -0,0 +1,337 @@
+"""
+Filename: request_trace.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains per-request timing breakdown (DNS, connection acquire, connect, TLS, time to headers, body) for
+both API wrappers: aiohttp TraceConfig for async one and traced transport adapter for sync one.
+"""
+
+import threading
+from collections import deque
+from time import perf_counter, time
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .traced_adapter import TracedHTTPAdapter
+
+TRACE_FIELDS = (
+    "method",
+    "url",
+    "status",
+    "request_id",
+    "error",
+    "timestamp",
+    "reused",
+    "dns",
+    "acquire",
+    "connect",
+    "tls",
+    "headers",
+    "body",
+    "total",
+)
+
+
+class RequestTrace:
+    """
+    This class keeps timing of single HTTP request in seconds: 'acquire' (wait for pooled connection), 'dns', 'connect'
+    (TCP connect, with TLS handshake for async API wrapper), 'tls', 'headers' (time to headers, since the start), 'body'
+    (read of the body) and 'total'. Missed phases are None, e.g. connect of reused connection or DNS of sync API wrapper
+    (it's included to connect there).
+    """
+
+    __slots__ = TRACE_FIELDS + ("started_at",)
+
+    def __init__(self, method: str, url: str):
+        """
+        Init RequestTrace class
+
+        :param method: HTTP method.
+        :type method: str
+        :param url: URL of the request.
+        :type url: str
+        """
+        self.method = method
+        self.url = url
+        self.status: Optional[int] = None
+        self.request_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.timestamp = time()
+        self.reused: Optional[bool] = None
+        self.dns: Optional[float] = None
+        self.acquire: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.headers: Optional[float] = None
+        self.body: Optional[float] = None
+        self.total: Optional[float] = None
+        self.started_at = perf_counter()
+
+    def elapsed(self) -> float:
+        """
+        Returns time in seconds since the start of the request.
+
+        :return: elapsed time in seconds.
+        :rtype: float
+        """
+        return perf_counter() - self.started_at
+
+    def to_dict(self) -> dict:
+        """
+        Returns trace as structured event.
+
+        :return: dict with method, url, status, request_id, error, timestamp (unix time), reused and times of phases.
+        :rtype: dict
+        """
+        return {field: getattr(self, field) for field in TRACE_FIELDS}
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of trace.
+
+        :return: representation.
+        :rtype: str
+        """
+        return f"RequestTrace({self.method} {self.url} {self.status}, total={self.total})"
+
+
+class RequestTracer:
+    """
+    This class collects timing breakdown of requests made by API wrappers (health check, bots, chat, statistics),
+    tagged with x-request-id of the response.
+    """
+
+    def __init__(self, on_trace: Optional[Callable[[RequestTrace], None]] = None, max_traces: int = 1000):
+        """
+        Init RequestTracer class
+
+        :param on_trace: callback, which is called with each finished trace, e.g. to export it.
+        :type on_trace: Callable[[RequestTrace], None]
+        :param max_traces: number of the latest traces to keep, 0 to keep none (callback only). Default is 1000.
+        :type max_traces: int
+        """
+        if max_traces < 0:
+            raise ValueError("max_traces should be non-negative")
+        self.on_trace = on_trace
+        self.traces: deque[RequestTrace] = deque(maxlen=max_traces)
+        # Objects with 'trace_started' and 'trace_finished' methods, e.g. APIMetrics, see add_listener
+        self.listeners: list = []
+        self.__listener_counts: dict = {}
+        self.__lock = threading.Lock()
+
+    def add_listener(self, listener: Any) -> None:
+        """
+        Adds listener of traces. Listener equal to added one (e.g. APIMetrics of the same registry) isn't added again,
+        so requests aren't counted twice, it's kept till each adding is removed.
+
+        :param listener: object with 'trace_started' and 'trace_finished' methods, e.g. APIMetrics.
+        """
+        with self.__lock:
+            count = self.__listener_counts.get(listener, 0)
+            self.__listener_counts[listener] = count + 1
+            if not count:
+                # List is replaced, not changed, so requests of other threads iterate over consistent one
+                self.listeners = [*self.listeners, listener]
+
+    def remove_listener(self, listener: Any) -> None:
+        """
+        Removes listener of traces added by add_listener.
+
+        :param listener: listener to remove.
+        """
+        with self.__lock:
+            count = self.__listener_counts.pop(listener, 0)
+            if count > 1:
+                self.__listener_counts[listener] = count - 1
+            elif count:
+                self.listeners = [item for item in self.listeners if item != listener]
+
+    def start(self, method: str, url: str) -> RequestTrace:
+        """
+        Starts trace of the request.
+
+        :param method: HTTP method.
+        :type method: str
+        :param url: URL of the request.
+        :type url: str
+        :return: trace.
+        :rtype: RequestTrace
+        """
+        trace = RequestTrace(method, url)
+        for listener in self.listeners:
+            listener.trace_started(trace)
+        return trace
+
+    def finish(self, trace: RequestTrace, error: Optional[BaseException] = None) -> None:
+        """
+        Finishes trace: calculates body read and total time, keeps the trace and notifies listeners and callback, only
+        once.
+
+        :param trace: trace of the request.
+        :type trace: RequestTrace
+        :param error: exception of failed request.
+        :type error: BaseException
+        """
+        if trace.total is not None:
+            return
+        trace.total = trace.elapsed()
+        if trace.headers is not None:
+            trace.body = trace.total - trace.headers
+        if error is not None:
+            trace.error = type(error).__name__
+        self.traces.append(trace)
+        for listener in self.listeners:
+            listener.trace_finished(trace)
+        if self.on_trace is not None:
+            self.on_trace(trace)
+
+    def events(self) -> list[dict]:
+        """
+        Returns kept traces as structured events.
+
+        :return: list of dicts, see RequestTrace.to_dict.
+        :rtype: list[dict]
+        """
+        return [trace.to_dict() for trace in self.traces]
+
+    def clear(self) -> None:
+        """Drops kept traces."""
+        self.traces.clear()
+
+    def adapter(self, **kwargs: Any) -> "TracedHTTPAdapter":
+        """
+        Returns transport adapter for requests session, which traces requests made through it.
+
+        :param kwargs: params of requests.adapters.HTTPAdapter, e.g. 'pool_maxsize'.
+        :return: adapter to mount to session.
+        :rtype: TracedHTTPAdapter
+        """
+        # requests is imported on demand, async API wrapper doesn't need it
+        from .traced_adapter import TracedHTTPAdapter  # pylint: disable=import-outside-toplevel
+
+        return TracedHTTPAdapter(self, **kwargs)
+
+    def trace_config(self) -> "aiohttp.TraceConfig":
+        """
+        Returns aiohttp trace config, which traces requests of session. TLS handshake isn't reported by aiohttp
+        separately, so it's included to 'connect' time.
+
+        :return: trace config to pass to aiohttp.ClientSession.
+        :rtype: aiohttp.TraceConfig
+        """
+        import aiohttp  # pylint: disable=import-outside-toplevel
+
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(self.__on_request_start)
+        config.on_dns_resolvehost_start.append(self.__on_dns_start)
+        config.on_dns_resolvehost_end.append(self.__on_dns_end)
+        config.on_connection_create_start.append(self.__on_connection_create_start)
+        config.on_connection_create_end.append(self.__on_connection_create_end)
+        config.on_connection_reuseconn.append(self.__on_connection_reuse)
+        config.on_request_end.append(self.__on_request_end)
+        config.on_request_exception.append(self.__on_request_exception)
+        config.freeze()
+        return config
+
+    async def __on_request_start(self, _session, context, params) -> None:
+        """
+        Starts trace of aiohttp request.
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param params: params of the signal.
+        """
+        context.trace = self.start(params.method, str(params.url))
+
+    @staticmethod
+    async def __on_dns_start(_session, context, _params) -> None:
+        """
+        Marks start of DNS resolution.
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param _params: params of the signal.
+        """
+        context.dns_started_at = context.trace.elapsed()
+
+    @staticmethod
+    async def __on_dns_end(_session, context, _params) -> None:
+        """
+        Marks end of DNS resolution.
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param _params: params of the signal.
+        """
+        context.trace.dns = context.trace.elapsed() - context.dns_started_at
+
+    @staticmethod
+    async def __on_connection_create_start(_session, context, _params) -> None:
+        """
+        Marks start of new connection, the wait for pooled connection is over.
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param _params: params of the signal.
+        """
+        context.trace.acquire = context.trace.elapsed()
+
+    @staticmethod
+    async def __on_connection_create_end(_session, context, _params) -> None:
+        """
+        Marks end of new connection (DNS, TCP connect and TLS handshake).
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param _params: params of the signal.
+        """
+        trace = context.trace
+        trace.reused = False
+        trace.connect = trace.elapsed() - trace.acquire - (trace.dns or 0.0)
+
+    @staticmethod
+    async def __on_connection_reuse(_session, context, _params) -> None:
+        """
+        Marks reuse of pooled connection.
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param _params: params of the signal.
+        """
+        context.trace.reused = True
+        context.trace.acquire = context.trace.elapsed()
+
+    async def __on_request_end(self, _session, context, params) -> None:
+        """
+        Marks receiving of response headers, the trace is finished when connection is released (body is read).
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param params: params of the signal.
+        """
+        trace = context.trace
+        trace.headers = trace.elapsed()
+        trace.status = params.response.status
+        trace.request_id = params.response.headers.get("x-request-id")
+        connection = params.response.connection
+        if connection is None:
+            self.finish(trace)
+        else:
+            connection.add_callback(lambda: self.finish(trace))
+
+    async def __on_request_exception(self, _session, context, params) -> None:
+        """
+        Finishes trace of failed request.
+
+        :param _session: aiohttp session.
+        :param context: trace context of the request.
+        :param params: params of the signal.
+        """
+        self.finish(context.trace, params.exception)
@@ -0,0 +1,83 @@
+"""
+Filename: retry.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains retry policy (exponential backoff with jitter) for aBLT API.
+"""
+
+import random
+from typing import Iterator
+
+
+class RetryPolicy:
+    """This class describes how many times and how long to wait between attempts to reach aBLT API"""
+
+    def __init__(
+        self,
+        max_attempts: int = 10,
+        initial_delay: float = 1.0,
+        max_delay: float = 15.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        max_total_wait: float = 50.0,
+    ):
+        """
+        Init RetryPolicy class
+
+        :param max_attempts: maximum number of attempts (including the first one). Default is 10.
+        :type max_attempts: int
+        :param initial_delay: delay in seconds before the first retry. Default is 1 second.
+        :type initial_delay: float
+        :param max_delay: upper limit for a single delay in seconds. Default is 15 seconds.
+        :type max_delay: float
+        :param multiplier: factor to grow delay after each retry. Default is 2.
+        :type multiplier: float
+        :param jitter: fraction of delay to randomize (0 - no jitter, 1 - full jitter). Default is 0.5.
+        :type jitter: float
+        :param max_total_wait: upper limit for all delays in seconds. Default is 50 seconds.
+        :type max_total_wait: float
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts should be at least 1")
+        if not 0 <= jitter <= 1:
+            raise ValueError("jitter should be between 0 and 1")
+        self.max_attempts = max_attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_total_wait = max_total_wait
+
+    def get_delay(self, retry: int) -> float:
+        """
+        Calculates delay before the retry.
+
+        :param retry: number of the retry, starting from 1.
+        :type retry: int
+        :return: delay in seconds.
+        :rtype: float
+        """
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (retry - 1))
+        if self.jitter:
+            delay -= delay * self.jitter * random.random()
+        return delay
+
+    def delays(self) -> Iterator[float]:
+        """
+        Yields delays between attempts until attempts or total wait budget are exhausted.
+
+        :return: delays in seconds.
+        :rtype: Iterator[float]
+        """
+        total_wait = 0.0
+        for retry in range(1, self.max_attempts):
+            delay = min(self.get_delay(retry), self.max_total_wait - total_wait)
+            if delay <= 0:
+                return
+            total_wait += delay
+            yield delay
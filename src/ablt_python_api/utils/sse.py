@@ -0,0 +1,210 @@
+"""
+Filename: sse.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains incremental decoder for server-sent events (SSE) streams.
+"""
+
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional
+
+DONE_MARKER = "[DONE]"
+
+
+class SSEEvent:
+    """This class represents single server-sent event."""
+
+    __slots__ = ("data", "event", "id", "retry")
+
+    def __init__(self, data: str, event: str = "message", event_id: str = "", retry: Optional[int] = None):
+        """
+        Init SSEEvent class
+
+        :param data: event data, multiple 'data:' lines are joined with new line.
+        :type data: str
+        :param event: event type, default is 'message'.
+        :type event: str
+        :param event_id: last event id.
+        :type event_id: str
+        :param retry: reconnection time in milliseconds, if it was sent by server.
+        :type retry: int
+        """
+        self.data = data
+        self.event = event
+        self.id = event_id
+        self.retry = retry
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the event.
+
+        :return: representation of the event.
+        :rtype: str
+        """
+        return f"SSEEvent(event={self.event!r}, data={self.data!r}, id={self.id!r})"
+
+
+class SSEDecoder:
+    """
+    This class decodes server-sent events from raw bytes chunks.
+
+    Chunks may be split anywhere (even inside a line or a multibyte character), the incomplete tail is buffered
+    until the next chunk arrives, so every byte is decoded only once.
+    """
+
+    def __init__(self, split_data: bool = False):
+        """
+        Init SSEDecoder class
+
+        :param split_data: dispatch each 'data:' line as separate event, like aBLT stream was parsed before, even if
+                           lines aren't separated with blank line. By default, lines are joined till blank line, as
+                           SSE specification says.
+        :type split_data: bool
+        """
+        self.__split_data = split_data
+        self.__buffer = bytearray()
+        # CR was the last byte of previous chunk, so LF at the start of the next one is the rest of CRLF
+        self.__skip_lf = False
+        self.__data: List[str] = []
+        self.__event = ""
+        self.__last_event_id = ""
+        self.__retry: Optional[int] = None
+
+    def feed(self, chunk: bytes) -> List[SSEEvent]:
+        """
+        Feeds the next chunk of the stream to the decoder.
+
+        :param chunk: raw bytes received from the stream.
+        :type chunk: bytes
+        :return: events completed by this chunk.
+        :rtype: list[SSEEvent]
+        """
+        if not chunk:
+            return []
+        if self.__skip_lf:
+            self.__skip_lf = False
+            if chunk[:1] == b"\n":
+                chunk = chunk[1:]
+        # Buffer has no complete lines, so only the new chunk is searched for the end of the last line
+        end = max(chunk.rfind(b"\n"), chunk.rfind(b"\r"))
+        buffer = self.__buffer
+        buffer += chunk
+        if end < 0:
+            return []
+        end += len(buffer) - len(chunk)
+        self.__skip_lf = buffer[end] == 0x0D
+        # Complete lines never end inside multibyte character, so they are decoded at once
+        text = buffer[: end + 1].decode("utf-8", "replace")
+        del buffer[: end + 1]
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        events: List[SSEEvent] = []
+        data = self.__data
+        for line in text[:-1].split("\n"):
+            if line[:5] == "data:":
+                # Fast path, almost all lines are data lines
+                data.append(line[6:] if line[5:6] == " " else line[5:])
+                if self.__split_data:
+                    self.__dispatch(events)
+            elif line:
+                self.__process_field(line)
+                if self.__split_data and data:
+                    self.__dispatch(events)
+            elif data:
+                self.__dispatch(events)
+            else:
+                self.__event = ""
+        return events
+
+    def flush(self) -> List[SSEEvent]:
+        """
+        Processes the rest of the buffer at the end of the stream, including the event without trailing blank line.
+
+        :return: remaining events.
+        :rtype: list[SSEEvent]
+        """
+        tail, self.__buffer = bytes(self.__buffer), bytearray()
+        self.__skip_lf = False
+        return self.feed(tail + b"\n\n")
+
+    def __dispatch(self, events: List[SSEEvent]) -> None:
+        """
+        Completes the event with collected data.
+
+        :param events: list to add the event to.
+        :type events: list[SSEEvent]
+        """
+        data = self.__data
+        events.append(
+            SSEEvent(
+                data[0] if len(data) == 1 else "\n".join(data),
+                self.__event or "message",
+                self.__last_event_id,
+                self.__retry,
+            )
+        )
+        data.clear()
+        self.__event = ""
+
+    def __process_field(self, line: str) -> None:
+        """
+        Processes single non-data line of the stream.
+
+        :param line: line without line terminator.
+        :type line: str
+        """
+        if line.startswith(":"):
+            return
+        field, _, value = line.partition(":")
+        if value.startswith(" "):
+            value = value[1:]
+        if field == "data":
+            self.__data.append(value)
+        elif field == "event":
+            self.__event = value
+        elif field == "id":
+            if "\x00" not in value:
+                self.__last_event_id = value
+        elif field == "retry":
+            if value.isdigit():
+                self.__retry = int(value)
+
+
+def iter_events(chunks: Iterable[bytes], split_data: bool = False) -> Iterator[SSEEvent]:
+    """
+    Decodes server-sent events from iterable of raw chunks.
+
+    :param chunks: raw bytes chunks of the stream.
+    :type chunks: Iterable[bytes]
+    :param split_data: dispatch each 'data:' line as separate event, see SSEDecoder.
+    :type split_data: bool
+    :return: decoded events.
+    :rtype: Iterator[SSEEvent]
+    """
+    decoder = SSEDecoder(split_data)
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+
+async def aiter_events(chunks: AsyncIterable[bytes], split_data: bool = False) -> AsyncIterator[SSEEvent]:
+    """
+    Decodes server-sent events from async iterable of raw chunks.
+
+    :param chunks: raw bytes chunks of the stream.
+    :type chunks: AsyncIterable[bytes]
+    :param split_data: dispatch each 'data:' line as separate event, see SSEDecoder.
+    :type split_data: bool
+    :return: decoded events.
+    :rtype: AsyncIterator[SSEEvent]
+    """
+    decoder = SSEDecoder(split_data)
+    async for chunk in chunks:
+        for event in decoder.feed(chunk):
+            yield event
+    for event in decoder.flush():
+        yield event
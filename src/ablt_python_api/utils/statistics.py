@@ -0,0 +1,100 @@
+"""
+Filename: statistics.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains helpers to split usage statistics requests into date windows and merge their results.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, Optional, Union
+
+STAT_FIELDS = (
+    "original_tokens",
+    "enchancement_tokens",
+    "response_tokens",
+    "total_tokens",
+    "original_words",
+    "enchancement_words",
+    "response_words",
+    "total_words",
+)
+WINDOWS = ("week", "month")
+
+
+def split_date_range(start_date: str, end_date: str, window: Union[str, int]) -> list[tuple[str, str]]:
+    """
+    Splits date range into consecutive windows.
+
+    :param start_date: start date in format YYYY-MM-DD.
+    :type start_date: str
+    :param end_date: end date in format YYYY-MM-DD (inclusive).
+    :type end_date: str
+    :param window: 'week' (Monday to Sunday), 'month' (calendar month) or number of days.
+    :type window: str | int
+    :return: list of (start_date, end_date) pairs covering the range, empty if start date is after end date.
+    :rtype: list[tuple[str, str]]
+    :raises ValueError: If dates or window are invalid.
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    # Number of days of fixed window, 0 for calendar ones
+    days: int = 0
+    if isinstance(window, int):
+        if window < 1:
+            raise ValueError("window should be at least 1 day")
+        days = window
+    elif window not in WINDOWS:
+        raise ValueError(f"Unknown window: {window}, use one of {WINDOWS} or number of days")
+    ranges = []
+    while start <= end:
+        if window == "week":
+            window_end = start + timedelta(days=6 - start.weekday())
+        elif window == "month":
+            next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+            window_end = next_month - timedelta(days=1)
+        else:
+            window_end = start + timedelta(days=days - 1)
+        window_end = min(window_end, end)
+        ranges.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return ranges
+
+
+def sum_statistics(items: Iterable[dict]) -> dict:
+    """
+    Sums statistics items.
+
+    :param items: statistics items (StatisticItemSchema or StatisticTotalSchema dicts).
+    :type items: Iterable[dict]
+    :return: total statistics (StatisticTotalSchema).
+    :rtype: dict
+    """
+    total = dict.fromkeys(STAT_FIELDS, 0)
+    for item in items:
+        for field in STAT_FIELDS:
+            total[field] += item.get(field, 0)
+    return total
+
+
+def merge_statistics(parts: Iterable[Optional[dict]]) -> Optional[dict]:
+    """
+    Merges statistics for consecutive date windows into single statistics.
+
+    :param parts: statistics (StatisticsSchema dicts) for each window, later parts override items for the same date.
+    :type parts: Iterable[dict | None]
+    :return: statistics (StatisticsSchema) with items ordered by date and total recomputed from items,
+             None if any part is missing.
+    :rtype: dict | None
+    """
+    by_date: dict[str, dict] = {}
+    for part in parts:
+        if part is None:
+            return None
+        for item in part.get("items") or ():
+            by_date[item.get("date", "")] = item
+    items = [by_date[day] for day in sorted(by_date)]
+    return {"total": sum_statistics(items), "items": items}
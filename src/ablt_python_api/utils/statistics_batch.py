@@ -0,0 +1,310 @@
+"""
+Filename: statistics_batch.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains concurrent fetching of usage statistics for many users with running combined total.
+"""
+
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, Optional
+
+from .batch import BatchInfo, afan_out, fan_out
+from .statistics import STAT_FIELDS, sum_statistics
+
+
+class UserStatisticsResult:
+    """This class represents statistics of single user in batch."""
+
+    __slots__ = ("user_id", "statistics", "error", "duration")
+
+    def __init__(
+        self,
+        user_id: int,
+        statistics: Optional[dict] = None,
+        error: Optional[BaseException] = None,
+        duration: float = 0.0,
+    ):
+        """
+        Init UserStatisticsResult class
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param statistics: statistics (StatisticsSchema dict), None if request failed (see API log for details).
+        :type statistics: dict
+        :param error: exception raised by the request, if any.
+        :type error: BaseException
+        :param duration: duration of the request in seconds.
+        :type duration: float
+        """
+        self.user_id = user_id
+        self.statistics = statistics
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self) -> bool:
+        """
+        Returns True if the request succeeded.
+
+        :return: True if there are statistics and no error.
+        :rtype: bool
+        """
+        return self.error is None and self.statistics is not None
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the result.
+
+        :return: representation of the result.
+        :rtype: str
+        """
+        return (
+            f"UserStatisticsResult(user_id={self.user_id}, ok={self.ok}, duration={self.duration:.3f}, "
+            f"error={self.error!r})"
+        )
+
+
+class StatisticsBatchInfo(BatchInfo):
+    """This class keeps aggregate statistics of the batch and combined total of succeeded users."""
+
+    def __init__(self):
+        """Init StatisticsBatchInfo class"""
+        super().__init__()
+        self.total = dict.fromkeys(STAT_FIELDS, 0)
+        self.failed_users: list[int] = []
+
+    def _record_user(self, result: UserStatisticsResult, statistics: Optional[dict]) -> None:
+        """
+        Records result of the request and adds statistics of the user to combined total.
+
+        :param result: result of the request.
+        :type result: UserStatisticsResult
+        :param statistics: statistics dict of the user (StatisticsSchema) before conversion.
+        :type statistics: dict
+        """
+        self._record(result.ok)
+        if not result.ok or statistics is None:
+            self.failed_users.append(result.user_id)
+            return
+        total = statistics.get("total") or sum_statistics(statistics.get("items") or ())
+        for field in STAT_FIELDS:
+            self.total[field] += total.get(field, 0)
+
+
+class AsyncStatisticsBatch(StatisticsBatchInfo):
+    """This class is async iterator over statistics of users fetched concurrently, in order of completion."""
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Awaitable[Optional[dict]]],
+        user_ids: Iterable[int],
+        concurrency: int = 10,
+        convert: Optional[Callable[[dict], Any]] = None,
+    ):
+        """
+        Init AsyncStatisticsBatch class
+
+        :param fetch: coroutine function returning statistics (StatisticsSchema dict) of the user or None.
+        :type fetch: Callable
+        :param user_ids: ids of the users.
+        :type user_ids: Iterable[int]
+        :param concurrency: maximum number of simultaneous requests. Default is 10.
+        :type concurrency: int
+        :param convert: function to convert statistics dict of the user after it's added to combined total.
+        :type convert: Callable
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency should be at least 1")
+        super().__init__()
+        self.__fetch = fetch
+        self.__user_ids = user_ids
+        self.__convert = convert
+        self.__concurrency = concurrency
+        self.__results: Optional[AsyncIterator[UserStatisticsResult]] = None
+
+    def __aiter__(self) -> "AsyncStatisticsBatch":
+        """
+        Returns async iterator.
+
+        :return: self.
+        :rtype: AsyncStatisticsBatch
+        """
+        return self
+
+    async def __anext__(self) -> UserStatisticsResult:
+        """
+        Returns next result.
+
+        :return: statistics of the next completed user.
+        :rtype: UserStatisticsResult
+        """
+        if self.__results is None:
+            self.__results = self.__run()
+        return await self.__results.__anext__()
+
+    async def aclose(self) -> None:
+        """Cancels requests in progress."""
+        if self.__results is not None:
+            await self.__results.aclose()  # type: ignore[attr-defined]
+
+    async def combined_total(self) -> dict:
+        """
+        Fetches statistics of the remaining users and returns combined total.
+
+        :return: total (StatisticTotalSchema) of all succeeded users, failed ones are listed in 'failed_users'.
+        :rtype: dict
+        """
+        async for _ in self:
+            pass
+        return self.total
+
+    async def __execute(self, user_id: int) -> tuple[UserStatisticsResult, Optional[dict]]:
+        """
+        Fetches statistics of the user.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :return: result of the request and statistics dict before conversion.
+        :rtype: tuple[UserStatisticsResult, dict | None]
+        """
+        started_at = perf_counter()
+        result = UserStatisticsResult(user_id)
+        statistics = None
+        try:
+            statistics = await self.__fetch(user_id)
+            convert = self.__convert
+            result.statistics = statistics if statistics is None or convert is None else convert(statistics)
+        except Exception as error:  # pylint: disable=broad-except
+            result.error = error
+        result.duration = perf_counter() - started_at
+        return result, statistics
+
+    async def __run(self) -> AsyncIterator[UserStatisticsResult]:
+        """
+        Runs workers and yields results as they are completed.
+
+        :return: results of the requests.
+        :rtype: AsyncIterator[UserStatisticsResult]
+        """
+        self.started_at = perf_counter()
+        results = afan_out(self.__execute, self.__user_ids, self.__concurrency, ordered=False)
+        try:
+            async for result, statistics in results:
+                self._record_user(result, statistics)
+                yield result
+        finally:
+            self.finished_at = perf_counter()
+            await results.aclose()
+
+
+class StatisticsBatch(StatisticsBatchInfo):
+    """This class is iterator over statistics of users fetched in thread pool, in order of completion."""
+
+    def __init__(
+        self,
+        fetch: Callable[[int], Optional[dict]],
+        user_ids: Iterable[int],
+        max_workers: int = 10,
+        convert: Optional[Callable[[dict], Any]] = None,
+    ):
+        """
+        Init StatisticsBatch class
+
+        :param fetch: function returning statistics (StatisticsSchema dict) of the user or None.
+        :type fetch: Callable
+        :param user_ids: ids of the users.
+        :type user_ids: Iterable[int]
+        :param max_workers: maximum number of threads (simultaneous requests). Default is 10.
+        :type max_workers: int
+        :param convert: function to convert statistics dict of the user after it's added to combined total.
+        :type convert: Callable
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers should be at least 1")
+        super().__init__()
+        self.__fetch = fetch
+        self.__user_ids = user_ids
+        self.__convert = convert
+        self.__max_workers = max_workers
+        self.__results: Optional[Iterator[UserStatisticsResult]] = None
+
+    def __iter__(self) -> "StatisticsBatch":
+        """
+        Returns iterator.
+
+        :return: self.
+        :rtype: StatisticsBatch
+        """
+        return self
+
+    def __next__(self) -> UserStatisticsResult:
+        """
+        Returns next result.
+
+        :return: statistics of the next completed user.
+        :rtype: UserStatisticsResult
+        """
+        if self.__results is None:
+            self.__results = self.__run()
+        return next(self.__results)
+
+    def close(self) -> None:
+        """Cancels requests which are not started yet, requests in progress are finished in background."""
+        if self.__results is not None:
+            self.__results.close()  # type: ignore[attr-defined]
+
+    def combined_total(self) -> dict:
+        """
+        Fetches statistics of the remaining users and returns combined total.
+
+        :return: total (StatisticTotalSchema) of all succeeded users, failed ones are listed in 'failed_users'.
+        :rtype: dict
+        """
+        for _ in self:
+            pass
+        return self.total
+
+    def __execute(self, user_id: int) -> tuple[UserStatisticsResult, Optional[dict]]:
+        """
+        Fetches statistics of the user in worker thread.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :return: result of the request and statistics dict before conversion.
+        :rtype: tuple[UserStatisticsResult, dict | None]
+        """
+        started_at = perf_counter()
+        result = UserStatisticsResult(user_id)
+        statistics = None
+        try:
+            statistics = self.__fetch(user_id)
+            convert = self.__convert
+            result.statistics = statistics if statistics is None or convert is None else convert(statistics)
+        except Exception as error:  # pylint: disable=broad-except
+            result.error = error
+        result.duration = perf_counter() - started_at
+        return result, statistics
+
+    def __run(self) -> Iterator[UserStatisticsResult]:
+        """
+        Submits users to the thread pool (no more than twice the number of workers at once) and yields results.
+
+        :return: results of the requests.
+        :rtype: Iterator[UserStatisticsResult]
+        """
+        self.started_at = perf_counter()
+        results = fan_out(
+            self.__execute, self.__user_ids, self.__max_workers, ordered=False, thread_name_prefix="ablt-stats"
+        )
+        try:
+            for result, statistics in results:
+                self._record_user(result, statistics)
+                yield result
+        finally:
+            self.finished_at = perf_counter()
+            results.close()
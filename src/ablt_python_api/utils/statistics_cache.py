@@ -0,0 +1,243 @@
+"""
+Filename: statistics_cache.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains cache of usage statistics for finalized (past) days, in memory with optional SQLite backing.
+"""
+
+from datetime import date, timedelta
+from hashlib import sha256
+from threading import RLock
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from .codec import JSONCodec, default_codec
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def _iter_days(start: date, end: date) -> Iterator[date]:
+    """
+    Yields days of the range.
+
+    :param start: start date.
+    :type start: date
+    :param end: end date (inclusive).
+    :type end: date
+    :return: days.
+    :rtype: Iterator[date]
+    """
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+class StatisticsCache:
+    """
+    This class keeps statistics items by (scope, user_id, date).
+
+    Usage for past days never changes, so such days are stored permanently, while today (and future days) are
+    always fetched again. Days without usage item in the response are remembered too, so they aren't requested again.
+    Scope identifies the account (bearer token and base API URL, see scope_of), since default user id -1 means user of
+    the token, so cache may be shared between tokens, processes and APIs.
+    """
+
+    def __init__(self, path: Optional[str] = None, grace_days: int = 0, json_codec: Optional[JSONCodec] = None):
+        """
+        Init StatisticsCache class
+
+        :param path: path to SQLite database to keep statistics between runs. By default, statistics are kept in memory.
+        :type path: str
+        :param grace_days: number of past days which are still fetched again (e.g. if API timezone differs).
+                           Default is 0.
+        :type grace_days: int
+        :param json_codec: JSON codec to store items in SQLite, by default the fastest installed one is used.
+        :type json_codec: JSONCodec
+        """
+        if grace_days < 0:
+            raise ValueError("grace_days should be non-negative")
+        self.grace_days = grace_days
+        self.__codec = default_codec if json_codec is None else json_codec
+        self.__lock = RLock()
+        self.__days: dict[tuple[str, int], dict[str, Optional[dict]]] = {}
+        self.__connection: Optional["sqlite3.Connection"] = None
+        if path is not None:
+            # SQLite is imported on demand, in-memory cache and API wrappers don't need it
+            import sqlite3  # pylint: disable=import-outside-toplevel
+
+            self.__connection = sqlite3.connect(path, check_same_thread=False)
+            with self.__connection:
+                self.__connection.execute(
+                    "CREATE TABLE IF NOT EXISTS statistics_days (scope TEXT NOT NULL, user_id INTEGER NOT NULL, "
+                    "date TEXT NOT NULL, item BLOB, PRIMARY KEY (scope, user_id, date)) WITHOUT ROWID"
+                )
+
+    @staticmethod
+    def scope_of(bearer_token: str, base_api_url: str) -> str:
+        """
+        Returns scope of the account, the token isn't kept as is.
+
+        :param bearer_token: The bearer token for authentication.
+        :type bearer_token: str
+        :param base_api_url: The base API URL.
+        :type base_api_url: str
+        :return: SHA-256 hex digest of base API URL and bearer token.
+        :rtype: str
+        """
+        return sha256(f"{base_api_url.rstrip('/')}\n{bearer_token}".encode("utf-8")).hexdigest()
+
+    def first_open_day(self) -> date:
+        """
+        Returns the first day which isn't finalized yet.
+
+        :return: today minus grace days, this day and later ones are never cached.
+        :rtype: date
+        """
+        return date.today() - timedelta(days=self.grace_days)
+
+    def __user_days(self, user_id: int, scope: str) -> dict[str, Optional[dict]]:
+        """
+        Returns cached days of the user, they are loaded from SQLite on first access.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param scope: scope of the account.
+        :type scope: str
+        :return: items by date, None for days without usage item.
+        :rtype: dict[str, dict | None]
+        """
+        days = self.__days.get((scope, user_id))
+        if days is None:
+            days = {}
+            if self.__connection is not None:
+                rows = self.__connection.execute(
+                    "SELECT date, item FROM statistics_days WHERE scope = ? AND user_id = ?", (scope, user_id)
+                )
+                for day, item in rows:
+                    days[day] = None if item is None else self.__codec.loads(item)
+            self.__days[(scope, user_id)] = days
+        return days
+
+    def missing_ranges(self, user_id: int, start_date: str, end_date: str, scope: str = "") -> list[tuple[str, str]]:
+        """
+        Returns ranges which should be fetched: not cached past days, today and future days.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param start_date: start date in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: end date in format YYYY-MM-DD (inclusive).
+        :type end_date: str
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: list of (start_date, end_date) pairs, empty if everything is cached or start date is after end date.
+        :rtype: list[tuple[str, str]]
+        :raises ValueError: If dates are invalid.
+        """
+        start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+        if start > end:
+            return []
+        first_open_day = self.first_open_day()
+        ranges = []
+        range_start: Optional[date] = None
+        with self.__lock:
+            days = self.__user_days(user_id, scope)
+            for day in _iter_days(start, min(end, first_open_day - timedelta(days=1))):
+                if day.isoformat() not in days:
+                    range_start = day if range_start is None else range_start
+                elif range_start is not None:
+                    ranges.append((range_start.isoformat(), (day - timedelta(days=1)).isoformat()))
+                    range_start = None
+        if end >= first_open_day and range_start is None:
+            range_start = max(start, first_open_day)
+        if range_start is not None:
+            ranges.append((range_start.isoformat(), end.isoformat()))
+        return ranges
+
+    def get_items(self, user_id: int, start_date: str, end_date: str, scope: str = "") -> list[dict]:
+        """
+        Returns cached items of the range.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param start_date: start date in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: end date in format YYYY-MM-DD (inclusive).
+        :type end_date: str
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: items (StatisticItemSchema dicts) ordered by date.
+        :rtype: list[dict]
+        """
+        with self.__lock:
+            days = self.__user_days(user_id, scope)
+            items = (
+                days.get(day.isoformat())
+                for day in _iter_days(date.fromisoformat(start_date), date.fromisoformat(end_date))
+            )
+            return [item for item in items if item is not None]
+
+    def put(self, user_id: int, start_date: str, end_date: str, items: list[dict], scope: str = "") -> None:
+        """
+        Stores finalized days of fetched range.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param start_date: start date of fetched range in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: end date of fetched range in format YYYY-MM-DD (inclusive).
+        :type end_date: str
+        :param items: fetched items (StatisticItemSchema dicts).
+        :type items: list[dict]
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        """
+        by_date = {item.get("date"): item for item in items}
+        last_day = min(date.fromisoformat(end_date), self.first_open_day() - timedelta(days=1))
+        rows = [
+            (day.isoformat(), by_date.get(day.isoformat()))
+            for day in _iter_days(date.fromisoformat(start_date), last_day)
+        ]
+        if not rows:
+            return
+        with self.__lock:
+            self.__user_days(user_id, scope).update(rows)
+            if self.__connection is not None:
+                with self.__connection:
+                    self.__connection.executemany(
+                        "INSERT OR REPLACE INTO statistics_days (scope, user_id, date, item) VALUES (?, ?, ?, ?)",
+                        (
+                            (scope, user_id, day, None if item is None else self.__codec.dumps(item))
+                            for day, item in rows
+                        ),
+                    )
+
+    def clear(self, user_id: Optional[int] = None, scope: Optional[str] = None) -> None:
+        """
+        Drops cached statistics.
+
+        :param user_id: The id of the user to drop statistics for. By default, statistics of all users are dropped.
+        :type user_id: int
+        :param scope: scope of the account to drop statistics for, see scope_of. By default, all scopes are dropped.
+        :type scope: str
+        """
+        with self.__lock:
+            for key in [key for key in self.__days if scope in (None, key[0]) and user_id in (None, key[1])]:
+                del self.__days[key]
+            if self.__connection is not None:
+                with self.__connection:
+                    self.__connection.execute(
+                        "DELETE FROM statistics_days WHERE (? IS NULL OR scope = ?) AND (? IS NULL OR user_id = ?)",
+                        (scope, scope, user_id, user_id),
+                    )
+
+    def close(self) -> None:
+        """Closes SQLite database, if any."""
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
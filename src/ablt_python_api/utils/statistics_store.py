@@ -0,0 +1,243 @@
+"""
+Filename: statistics_store.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains local SQLite mirror of usage statistics with per-user sync watermark and offline queries.
+"""
+
+from datetime import date, datetime, timedelta
+from threading import RLock
+from typing import Iterable, Optional
+
+from .statistics import STAT_FIELDS, sum_statistics
+from .statistics_cache import StatisticsCache
+
+_COLUMNS = ", ".join(STAT_FIELDS)
+_SUMS = ", ".join(f"COALESCE(SUM({field}), 0)" for field in STAT_FIELDS)
+
+
+class StatisticsStore:
+    """
+    This class keeps usage statistics of users in SQLite database, so reports are built without requests to API.
+
+    Each user has a watermark: the last finalized (past) day which is synced. Sync requests only days after it,
+    today's statistics are stored too, but they are requested again on the next sync.
+
+    Users are kept by scope of the account (bearer token and base API URL, see scope_of), since default user id -1
+    means user of the token, so clients of different accounts may share one database.
+    """
+
+    # Scope is the same as of statistics cache
+    scope_of = staticmethod(StatisticsCache.scope_of)
+
+    def __init__(self, path: str = ":memory:", grace_days: int = 0):
+        """
+        Init StatisticsStore class
+
+        :param path: path to SQLite database. By default, database is kept in memory.
+        :type path: str
+        :param grace_days: number of past days which are still synced again (e.g. if API timezone differs).
+                           Default is 0.
+        :type grace_days: int
+        """
+        if grace_days < 0:
+            raise ValueError("grace_days should be non-negative")
+        self.grace_days = grace_days
+        # SQLite is imported on demand, so import of API wrappers doesn't load it
+        import sqlite3  # pylint: disable=import-outside-toplevel
+
+        self.__lock = RLock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        with self.__connection:
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS statistics_items (scope TEXT NOT NULL, user_id INTEGER NOT NULL, "
+                f"date TEXT NOT NULL, {', '.join(f'{field} INTEGER NOT NULL' for field in STAT_FIELDS)}, "
+                "PRIMARY KEY (scope, user_id, date)) WITHOUT ROWID"
+            )
+            self.__connection.execute(
+                "CREATE TABLE IF NOT EXISTS statistics_watermarks (scope TEXT NOT NULL, user_id INTEGER NOT NULL, "
+                "synced_until TEXT, PRIMARY KEY (scope, user_id)) WITHOUT ROWID"
+            )
+
+    def first_open_day(self) -> date:
+        """
+        Returns the first day which isn't finalized yet.
+
+        :return: today minus grace days, watermark never reaches this day.
+        :rtype: date
+        """
+        return date.today() - timedelta(days=self.grace_days)
+
+    def get_watermark(self, user_id: int = -1, scope: str = "") -> Optional[str]:
+        """
+        Returns the last finalized day synced for the user.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: date in format YYYY-MM-DD or None if the user was never synced.
+        :rtype: str | None
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT synced_until FROM statistics_watermarks WHERE scope = ? AND user_id = ?", (scope, user_id)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def users(self, scope: str = "") -> list[int]:
+        """
+        Returns synced users.
+
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: ids of the users in ascending order.
+        :rtype: list[int]
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT user_id FROM statistics_watermarks WHERE scope = ? ORDER BY user_id", (scope,)
+            ).fetchall()
+        return [user_id for (user_id,) in rows]
+
+    def put(self, user_id: int, start_date: str, end_date: str, items: Iterable[dict], scope: str = "") -> int:
+        """
+        Replaces statistics of the synced range and moves the watermark of the user forward.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param start_date: start date of synced range in format YYYY-MM-DD.
+        :type start_date: str
+        :param end_date: end date of synced range in format YYYY-MM-DD (inclusive).
+        :type end_date: str
+        :param items: fetched items (StatisticItemSchema dicts).
+        :type items: Iterable[dict]
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: number of stored items.
+        :rtype: int
+        """
+        rows = [
+            (scope, user_id, item["date"], *(item.get(field, 0) for field in STAT_FIELDS))
+            for item in items
+            if start_date <= item.get("date", "") <= end_date
+        ]
+        synced_until = min(date.fromisoformat(end_date), self.first_open_day() - timedelta(days=1)).isoformat()
+        with self.__lock, self.__connection:
+            self.__connection.execute(
+                "DELETE FROM statistics_items WHERE scope = ? AND user_id = ? AND date BETWEEN ? AND ?",
+                (scope, user_id, start_date, end_date),
+            )
+            self.__connection.executemany(
+                f"INSERT INTO statistics_items (scope, user_id, date, {_COLUMNS}) "
+                f"VALUES (?, ?, ?{', ?' * len(STAT_FIELDS)})",
+                rows,
+            )
+            # Watermark never moves back, so stale sync of old range doesn't cause refetch of the whole history
+            self.__connection.execute(
+                "INSERT INTO statistics_watermarks (scope, user_id, synced_until) VALUES (?, ?, ?) "
+                "ON CONFLICT (scope, user_id) "
+                "DO UPDATE SET synced_until = MAX(COALESCE(synced_until, ''), excluded.synced_until)",
+                (scope, user_id, synced_until),
+            )
+        return len(rows)
+
+    def get_usage_statistics(
+        self, user_id: int = -1, start_date: str = "", end_date: str = "9999-12-31", scope: str = ""
+    ) -> dict:
+        """
+        Returns stored statistics of the range, like API does.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param start_date: start date in format YYYY-MM-DD. By default, from the first stored day.
+        :type start_date: str
+        :param end_date: end date in format YYYY-MM-DD (inclusive). By default, till the last stored day.
+        :type end_date: str
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: statistics (StatisticsSchema) with items ordered by date.
+        :rtype: dict
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                f"SELECT date, {_COLUMNS} FROM statistics_items WHERE scope = ? AND user_id = ? "
+                "AND date BETWEEN ? AND ? ORDER BY date",
+                (scope, user_id, start_date, end_date),
+            ).fetchall()
+        items = [{**dict(zip(STAT_FIELDS, row[1:])), "date": row[0]} for row in rows]
+        return {"total": sum_statistics(items), "items": items}
+
+    # pylint: disable=redefined-outer-name
+    def get_statistics_for_a_day(
+        self, date: Optional[str] = None, user_id: int = -1, scope: str = ""
+    ) -> Optional[dict]:
+        """
+        Returns stored statistics for a day.
+
+        :param date: day in format YYYY-MM-DD. By default, today.
+        :type date: str
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: dict (StatisticItemSchema) with statistics for a day, None if there is no usage for the day.
+        :rtype: dict | None
+        """
+        date = datetime.now().strftime("%Y-%m-%d") if date is None else date
+        with self.__lock:
+            row = self.__connection.execute(
+                f"SELECT {_COLUMNS} FROM statistics_items WHERE scope = ? AND user_id = ? AND date = ?",
+                (scope, user_id, date),
+            ).fetchone()
+        return None if row is None else {**dict(zip(STAT_FIELDS, row)), "date": date}
+
+    def get_statistics_total(
+        self, user_id: int = -1, start_date: str = "", end_date: str = "9999-12-31", scope: str = ""
+    ) -> dict:
+        """
+        Returns total of stored statistics of the range.
+
+        :param user_id: The id of the user.
+        :type user_id: int
+        :param start_date: start date in format YYYY-MM-DD. By default, from the first stored day.
+        :type start_date: str
+        :param end_date: end date in format YYYY-MM-DD (inclusive). By default, till the last stored day.
+        :type end_date: str
+        :param scope: scope of the account, see scope_of. Default is empty scope.
+        :type scope: str
+        :return: dict (StatisticTotalSchema) with total statistics.
+        :rtype: dict
+        """
+        with self.__lock:
+            row = self.__connection.execute(
+                f"SELECT {_SUMS} FROM statistics_items WHERE scope = ? AND user_id = ? AND date BETWEEN ? AND ?",
+                (scope, user_id, start_date, end_date),
+            ).fetchone()
+        return dict(zip(STAT_FIELDS, row))
+
+    def clear(self, user_id: Optional[int] = None, scope: Optional[str] = None) -> None:
+        """
+        Drops stored statistics and watermarks, so the next sync starts from scratch.
+
+        :param user_id: The id of the user to drop statistics for. By default, statistics of all users are dropped.
+        :type user_id: int
+        :param scope: scope of the account to drop statistics for, see scope_of. By default, all scopes are dropped.
+        :type scope: str
+        """
+        with self.__lock, self.__connection:
+            for table in ("statistics_items", "statistics_watermarks"):
+                self.__connection.execute(
+                    f"DELETE FROM {table} WHERE (? IS NULL OR scope = ?) AND (? IS NULL OR user_id = ?)",
+                    (scope, scope, user_id, user_id),
+                )
+
+    def close(self) -> None:
+        """Closes SQLite database."""
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,377 @@
+"""
+Filename: stream.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains iterators over chat responses, which keep metadata and timing of the stream.
+"""
+
+from time import perf_counter
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+from .exceptions import DoneException
+
+if TYPE_CHECKING:
+    from ..records import ChatChunk
+
+
+class StreamInfo:
+    """This class keeps metadata of chat response stream."""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        raise_on_done: bool = True,
+        timing: bool = False,
+        on_finish: Optional[Callable[["StreamInfo"], None]] = None,
+    ):
+        """
+        Init StreamInfo class
+
+        :param raise_on_done: raise DoneException when the bot is done (legacy behaviour), otherwise just stop.
+        :type raise_on_done: bool
+        :param timing: record arrival time of each message (time to first token, gaps between messages).
+        :type timing: bool
+        :param on_finish: callback, which is called with the stream when it's finished or closed, enables timing.
+        :type on_finish: Callable[[StreamInfo], None]
+        """
+        self.raise_on_done = raise_on_done
+        self.timing = timing or on_finish is not None
+        self.on_finish = on_finish
+        self.done = False
+        self.chunks = 0
+        self.bytes = 0
+        self.events = 0
+        self.messages = 0
+        self.started_at: Optional[float] = None
+        self.request_sent_at: Optional[float] = None
+        self.headers_at: Optional[float] = None
+        self.first_message_at: Optional[float] = None
+        self.last_message_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.gaps: list[float] = []
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Returns duration of the stream in seconds: from the first iteration till the end (or till now).
+
+        :return: duration in seconds or None if iteration wasn't started.
+        :rtype: float | None
+        """
+        if self.started_at is None:
+            return None
+        return (self.finished_at if self.finished_at is not None else perf_counter()) - self.started_at
+
+    @property
+    def time_to_headers(self) -> Optional[float]:
+        """
+        Returns time in seconds from sending of the request till receiving of response headers.
+
+        :return: time in seconds or None if headers weren't received.
+        :rtype: float | None
+        """
+        if self.request_sent_at is None or self.headers_at is None:
+            return None
+        return self.headers_at - self.request_sent_at
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """
+        Returns time in seconds from sending of the request (or start of iteration) till the first message.
+
+        :return: time in seconds or None if timing is disabled or there were no messages.
+        :rtype: float | None
+        """
+        started_at = self.request_sent_at if self.request_sent_at is not None else self.started_at
+        if started_at is None or self.first_message_at is None:
+            return None
+        return self.first_message_at - started_at
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """
+        Returns generation rate: messages (tokens) per second after the first one.
+
+        :return: messages per second or None if timing is disabled or there were less than 2 messages.
+        :rtype: float | None
+        """
+        if self.first_message_at is None or self.last_message_at is None:
+            return None
+        elapsed = self.last_message_at - self.first_message_at
+        return (self.messages - 1) / elapsed if elapsed > 0 else None
+
+    def metrics(self) -> dict:
+        """
+        Returns timing and totals of the stream, times are in seconds, missed values are None.
+
+        :return: dict with 'time_to_headers', 'time_to_first_token', 'duration', 'gap_mean', 'gap_p50', 'gap_p95',
+                 'gap_max', 'tokens_per_second', 'messages', 'events', 'chunks' and 'bytes'.
+        :rtype: dict
+        """
+        gaps = sorted(self.gaps)
+        return {
+            "time_to_headers": self.time_to_headers,
+            "time_to_first_token": self.time_to_first_token,
+            "duration": self.duration,
+            "gap_mean": sum(gaps) / len(gaps) if gaps else None,
+            "gap_p50": gaps[(len(gaps) - 1) // 2] if gaps else None,
+            "gap_p95": gaps[int((len(gaps) - 1) * 0.95)] if gaps else None,
+            "gap_max": gaps[-1] if gaps else None,
+            "tokens_per_second": self.tokens_per_second,
+            "messages": self.messages,
+            "events": self.events,
+            "chunks": self.chunks,
+            "bytes": self.bytes,
+        }
+
+    def mark_request_sent(self) -> None:
+        """Marks sending of the request."""
+        self.request_sent_at = perf_counter()
+
+    def mark_headers_received(self) -> None:
+        """Marks receiving of response headers."""
+        self.headers_at = perf_counter()
+
+    def track_chunks(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Counts raw chunks and bytes of the response.
+
+        :param chunks: raw chunks.
+        :type chunks: Iterable[bytes]
+        :return: the same chunks.
+        :rtype: Iterator[bytes]
+        """
+        for chunk in chunks:
+            self.chunks += 1
+            self.bytes += len(chunk)
+            yield chunk
+
+    async def atrack_chunks(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """
+        Counts raw chunks and bytes of the response.
+
+        :param chunks: raw chunks.
+        :type chunks: AsyncIterable[bytes]
+        :return: the same chunks.
+        :rtype: AsyncIterator[bytes]
+        """
+        async for chunk in chunks:
+            self.chunks += 1
+            self.bytes += len(chunk)
+            yield chunk
+
+    def _start(self) -> None:
+        """Marks the start of iteration."""
+        if self.started_at is None:
+            self.started_at = perf_counter()
+
+    def _track_message(self) -> None:
+        """Records arrival time of message, it's called only if timing is enabled."""
+        now = perf_counter()
+        if self.last_message_at is None:
+            self.first_message_at = now
+        else:
+            self.gaps.append(now - self.last_message_at)
+        self.last_message_at = now
+
+    def _finish(self, raise_done: bool = True) -> None:
+        """
+        Marks the end of iteration and calls 'on_finish' callback.
+
+        :param raise_done: raise DoneException if the bot is done and legacy behaviour is requested.
+        :type raise_done: bool
+        :raises DoneException: If the bot is done and legacy behaviour is requested.
+        """
+        if self.finished_at is None:
+            self.finished_at = perf_counter()
+            if self.on_finish is not None:
+                self.on_finish(self)
+            if raise_done and self.done and self.raise_on_done:
+                raise DoneException
+
+
+class ChatStream(StreamInfo):
+    """This class is iterator over chat response messages."""
+
+    def __init__(
+        self,
+        raise_on_done: bool = True,
+        timing: bool = False,
+        on_finish: Optional[Callable[[StreamInfo], None]] = None,
+    ):
+        """
+        Init ChatStream class
+
+        :param raise_on_done: raise DoneException when the bot is done (legacy behaviour), otherwise just stop.
+        :type raise_on_done: bool
+        :param timing: record arrival time of each message (time to first token, gaps between messages).
+        :type timing: bool
+        :param on_finish: callback, which is called with the stream when it's finished or closed, enables timing.
+        :type on_finish: Callable[[StreamInfo], None]
+        """
+        super().__init__(raise_on_done, timing, on_finish)
+        self.__source: Optional[Iterator[str]] = None
+
+    def attach(self, source: Iterator[str]) -> "ChatStream":
+        """
+        Attaches source of messages.
+
+        :param source: generator of messages, it should set 'done' flag and return when the bot is done.
+        :type source: Iterator[str]
+        :return: self.
+        :rtype: ChatStream
+        """
+        self.__source = source
+        return self
+
+    def __iter__(self) -> "ChatStream":
+        """
+        Returns iterator.
+
+        :return: self.
+        :rtype: ChatStream
+        """
+        return self
+
+    def __next__(self) -> str:
+        """
+        Returns next message.
+
+        :return: next message.
+        :rtype: str
+        :raises DoneException: If the bot is done and legacy behaviour is requested.
+        """
+        self._start()
+        if self.__source is None:
+            # Request was rejected before sending, empty stream is finished at once
+            self._finish(raise_done=False)
+            raise StopIteration
+        try:
+            message = next(self.__source)
+        except StopIteration:
+            self._finish()
+            raise
+        except Exception:
+            self._finish(raise_done=False)
+            raise
+        self.messages += 1
+        if self.timing:
+            self._track_message()
+        return message
+
+    def iter_chunks(self) -> Iterator["ChatChunk"]:
+        """
+        Returns messages as lightweight records with their number and arrival time.
+
+        :return: records of messages.
+        :rtype: Iterator[ChatChunk]
+        :raises DoneException: If the bot is done and legacy behaviour is requested.
+        """
+        # Records (and pydantic schemas behind them) are imported on demand, to keep import of streams cheap
+        from ..records import ChatChunk  # pylint: disable=import-outside-toplevel
+
+        for message in self:
+            yield ChatChunk(self.messages - 1, message, perf_counter() - self.started_at)  # type: ignore[operator]
+
+    def close(self) -> None:
+        """Stops the stream and releases the connection."""
+        close = getattr(self.__source, "close", None)
+        if close is not None:
+            close()
+        self._finish(raise_done=False)
+
+
+class AsyncChatStream(StreamInfo):
+    """This class is async iterator over chat response messages."""
+
+    def __init__(
+        self,
+        raise_on_done: bool = True,
+        timing: bool = False,
+        on_finish: Optional[Callable[[StreamInfo], None]] = None,
+    ):
+        """
+        Init AsyncChatStream class
+
+        :param raise_on_done: raise DoneException when the bot is done (legacy behaviour), otherwise just stop.
+        :type raise_on_done: bool
+        :param timing: record arrival time of each message (time to first token, gaps between messages).
+        :type timing: bool
+        :param on_finish: callback, which is called with the stream when it's finished or closed, enables timing.
+        :type on_finish: Callable[[StreamInfo], None]
+        """
+        super().__init__(raise_on_done, timing, on_finish)
+        self.__source: Optional[AsyncIterator[str]] = None
+
+    def attach(self, source: AsyncIterator[str]) -> "AsyncChatStream":
+        """
+        Attaches source of messages.
+
+        :param source: async generator of messages, it should set 'done' flag and return when the bot is done.
+        :type source: AsyncIterator[str]
+        :return: self.
+        :rtype: AsyncChatStream
+        """
+        self.__source = source
+        return self
+
+    def __aiter__(self) -> "AsyncChatStream":
+        """
+        Returns async iterator.
+
+        :return: self.
+        :rtype: AsyncChatStream
+        """
+        return self
+
+    async def __anext__(self) -> str:
+        """
+        Returns next message.
+
+        :return: next message.
+        :rtype: str
+        :raises DoneException: If the bot is done and legacy behaviour is requested.
+        """
+        self._start()
+        if self.__source is None:
+            # Request was rejected before sending, empty stream is finished at once
+            self._finish(raise_done=False)
+            raise StopAsyncIteration
+        try:
+            message = await self.__source.__anext__()
+        except StopAsyncIteration:
+            self._finish()
+            raise
+        except Exception:
+            self._finish(raise_done=False)
+            raise
+        self.messages += 1
+        if self.timing:
+            self._track_message()
+        return message
+
+    async def aiter_chunks(self) -> AsyncIterator["ChatChunk"]:
+        """
+        Returns messages as lightweight records with their number and arrival time.
+
+        :return: records of messages.
+        :rtype: AsyncIterator[ChatChunk]
+        :raises DoneException: If the bot is done and legacy behaviour is requested.
+        """
+        # Records (and pydantic schemas behind them) are imported on demand, to keep import of streams cheap
+        from ..records import ChatChunk  # pylint: disable=import-outside-toplevel
+
+        async for message in self:
+            yield ChatChunk(self.messages - 1, message, perf_counter() - self.started_at)  # type: ignore[operator]
+
+    async def aclose(self) -> None:
+        """Stops the stream and releases the connection."""
+        close = getattr(self.__source, "aclose", None)
+        if close is not None:
+            await close()
+        self._finish(raise_done=False)
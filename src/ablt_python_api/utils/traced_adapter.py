@@ -0,0 +1,161 @@
+"""
+Filename: traced_adapter.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains transport adapter for requests, which traces requests: connection acquire, connect (DNS and TCP),
+TLS handshake, time to headers and body read.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+if TYPE_CHECKING:
+    from .request_trace import RequestTrace, RequestTracer
+
+# Tracer and trace of the request, which is being sent by current thread, connections are opened in the same thread
+_current = threading.local()
+
+
+class _TracedConnectionMixin:
+    """This class reports time of DNS resolution and TCP connect of new connection to trace of current request."""
+
+    def _new_conn(self) -> Any:
+        """
+        Opens socket and records its time.
+
+        :return: socket.
+        """
+        trace: Optional["RequestTrace"] = getattr(_current, "trace", None)
+        if trace is None:
+            return super()._new_conn()  # type: ignore[misc]
+        trace.reused = False
+        started_at = trace.elapsed()
+        sock = super()._new_conn()  # type: ignore[misc]
+        trace.connect = trace.elapsed() - started_at
+        return sock
+
+
+class TracedHTTPConnection(_TracedConnectionMixin, HTTPConnection):
+    """This class is HTTP connection, which reports connect time to trace of current request."""
+
+
+class TracedHTTPSConnection(_TracedConnectionMixin, HTTPSConnection):
+    """This class is HTTPS connection, which reports connect and TLS handshake time to trace of current request."""
+
+    def connect(self) -> None:
+        """Connects and records time of TLS handshake."""
+        trace: Optional["RequestTrace"] = getattr(_current, "trace", None)
+        if trace is None:
+            super().connect()
+            return
+        started_at = trace.elapsed()
+        super().connect()
+        trace.tls = trace.elapsed() - started_at - (trace.connect or 0.0)
+
+
+class _TracedPoolMixin:
+    """This class records connection acquire time and finishes trace when connection is returned to the pool."""
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        """
+        Takes connection from the pool and binds trace of current request to it.
+
+        :param timeout: time to wait for free connection.
+        :type timeout: float
+        :return: connection.
+        """
+        conn = super()._get_conn(timeout)  # type: ignore[misc]
+        trace: Optional["RequestTrace"] = getattr(_current, "trace", None)
+        if trace is not None:
+            trace.acquire = trace.elapsed()
+            # New connections are connected later, they reset it
+            trace.reused = True
+            conn.ablt_trace = (_current.tracer, trace)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        """
+        Returns connection to the pool, response body is read (or dropped) at this moment, so trace is finished.
+
+        :param conn: connection.
+        """
+        traced: Optional[tuple["RequestTracer", "RequestTrace"]] = getattr(conn, "ablt_trace", None)
+        if traced is not None:
+            conn.ablt_trace = None
+            tracer, trace = traced
+            # Failed requests are finished by adapter, which knows the error
+            if trace.headers is not None:
+                tracer.finish(trace)
+        super()._put_conn(conn)  # type: ignore[misc]
+
+
+class TracedHTTPConnectionPool(_TracedPoolMixin, HTTPConnectionPool):
+    """This class is pool of traced HTTP connections."""
+
+    ConnectionCls = TracedHTTPConnection
+
+
+class TracedHTTPSConnectionPool(_TracedPoolMixin, HTTPSConnectionPool):
+    """This class is pool of traced HTTPS connections."""
+
+    ConnectionCls = TracedHTTPSConnection
+
+
+class TracedHTTPAdapter(HTTPAdapter):
+    """This class is transport adapter for requests session, which traces each request."""
+
+    def __init__(self, tracer: "RequestTracer", **kwargs: Any):
+        """
+        Init TracedHTTPAdapter class
+
+        :param tracer: tracer to collect traces.
+        :type tracer: RequestTracer
+        :param kwargs: params of requests.adapters.HTTPAdapter, e.g. 'pool_maxsize'.
+        """
+        self.tracer = tracer
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initializes pool manager with traced connection pools.
+
+        :param args: positional params of pool manager.
+        :param kwargs: keyword params of pool manager.
+        """
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TracedHTTPConnectionPool, "https": TracedHTTPSConnectionPool}
+
+    def send(self, request, *args: Any, **kwargs: Any):  # pylint: disable=arguments-differ
+        """
+        Sends request and records time to headers, the trace is finished when the body is read.
+
+        :param request: prepared request.
+        :param args: positional params of HTTPAdapter.send.
+        :param kwargs: keyword params of HTTPAdapter.send.
+        :return: response.
+        """
+        trace = self.tracer.start(request.method, request.url)
+        _current.tracer, _current.trace = self.tracer, trace
+        try:
+            response = super().send(request, *args, **kwargs)
+        except Exception as err:
+            self.tracer.finish(trace, err)
+            raise
+        finally:
+            _current.tracer, _current.trace = None, None
+        trace.headers = trace.elapsed()
+        trace.status = response.status_code
+        trace.request_id = response.headers.get("x-request-id")
+        if getattr(response.raw, "connection", None) is None:
+            # Connection is already returned to the pool (e.g. response without body)
+            self.tracer.finish(trace)
+        return response
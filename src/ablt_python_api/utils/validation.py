@@ -0,0 +1,214 @@
+"""
+Filename: validation.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains validation modes of API responses: raw dicts, lazily validated models or strict models.
+Pydantic and schemas are imported only when models are built, so 'off' mode doesn't pay for them.
+"""
+
+from functools import lru_cache
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional
+
+from .codec import JSONCodec, default_codec
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel, TypeAdapter
+
+VALIDATION_MODES = ("off", "lazy", "strict")
+
+
+def resolve_schema(schema: Any) -> Any:
+    """
+    Returns schema (model class) by its name in schemas module, other schemas and types are returned as is.
+
+    :param schema: name of schema, e.g. 'BotSchema', schema (model class) or type.
+    :type schema: Any
+    :return: schema (model class) or type.
+    :rtype: Any
+    """
+    if isinstance(schema, str):
+        return getattr(import_module("..schemas", __package__), schema)
+    return schema
+
+
+@lru_cache(maxsize=None)
+def get_adapter(schema: Any) -> "TypeAdapter":
+    """
+    Returns type adapter for the schema, adapters are built once, since building of validator is expensive.
+
+    :param schema: schema (model class or its name) or type, e.g. List[BotSchema].
+    :type schema: Any
+    :return: type adapter.
+    :rtype: TypeAdapter
+    """
+    from pydantic import TypeAdapter  # pylint: disable=import-outside-toplevel
+
+    return TypeAdapter(resolve_schema(schema))
+
+
+class LazyModel:
+    """This class wraps response dict and validates it with the schema on the first attribute access."""
+
+    __slots__ = ("__schema", "__data", "__model")
+
+    def __init__(self, schema: Any, data: dict):
+        """
+        Init LazyModel class
+
+        :param schema: schema (model class or its name) of the data.
+        :type schema: type[BaseModel] | str
+        :param data: response dict.
+        :type data: dict
+        """
+        self.__schema = resolve_schema(schema)
+        self.__data = data
+        self.__model: Optional["BaseModel"] = None
+
+    @property
+    def raw(self) -> dict:
+        """
+        Returns response dict without validation.
+
+        :return: response dict.
+        :rtype: dict
+        """
+        return self.__data
+
+    @property
+    def is_validated(self) -> bool:
+        """
+        Returns True if the data is already validated.
+
+        :return: True if the model is built.
+        :rtype: bool
+        """
+        return self.__model is not None
+
+    def validate(self) -> "BaseModel":
+        """
+        Validates the data once and returns the model.
+
+        :return: model.
+        :rtype: BaseModel
+        :raises pydantic.ValidationError: If the data doesn't match the schema.
+        """
+        if self.__model is None:
+            self.__model = self.__schema.model_validate(self.__data)
+        return self.__model
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Returns attribute of the model, the data is validated on the first access.
+
+        :param name: name of the attribute.
+        :type name: str
+        :return: value of the attribute.
+        :rtype: Any
+        :raises pydantic.ValidationError: If the data doesn't match the schema.
+        """
+        if name.startswith("_LazyModel__"):
+            # Slots aren't set yet, e.g. on copy, don't validate
+            raise AttributeError(name)
+        return getattr(self.validate(), name)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        Compares with other lazy model or model.
+
+        :param other: other object.
+        :type other: object
+        :return: True if models are equal.
+        :rtype: bool
+        """
+        if isinstance(other, LazyModel):
+            other = other.validate()
+        return self.validate() == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """
+        Returns representation of the lazy model.
+
+        :return: representation of the lazy model.
+        :rtype: str
+        """
+        return f"LazyModel({self.__schema.__name__}, validated={self.is_validated})"
+
+
+class ResponseValidator:
+    """This class converts API responses to results according to validation mode."""
+
+    def __init__(self, mode: str = "off", json_codec: Optional[JSONCodec] = None):
+        """
+        Init ResponseValidator class
+
+        :param mode: 'off' (raw dicts), 'lazy' (LazyModel, validated on attribute access) or 'strict'
+                     (models validated at once, from response bytes where possible). Default is 'off'.
+        :type mode: str
+        :param json_codec: JSON codec for 'off' and 'lazy' modes, by default the fastest installed one is used.
+        :type json_codec: JSONCodec
+        """
+        if mode not in VALIDATION_MODES:
+            raise ValueError(f"Unknown validation mode: {mode}, use one of {VALIDATION_MODES}")
+        self.mode = mode
+        self.__codec = default_codec if json_codec is None else json_codec
+
+    def loads(self, content: bytes, schema: Any) -> Any:
+        """
+        Parses response body: in strict mode it's validated directly from bytes, otherwise it's decoded to dict.
+
+        :param content: response body.
+        :type content: bytes
+        :param schema: schema (model class or its name) or type of the response, e.g. List[BotSchema].
+        :type schema: Any
+        :return: model in strict mode, dict otherwise.
+        :rtype: Any
+        :raises pydantic.ValidationError: If the response doesn't match the schema in strict mode.
+        """
+        if self.mode == "strict":
+            return get_adapter(schema).validate_json(content)
+        return self.__codec.loads(content)
+
+    def typed(self, data: Any, schema: Any) -> Any:
+        """
+        Converts response dict to result.
+
+        :param data: response dict or model (it's returned as is), None is returned as is.
+        :type data: Any
+        :param schema: schema (model class or its name) of the response.
+        :type schema: type[BaseModel] | str
+        :return: dict, LazyModel or model depending on mode.
+        :rtype: Any
+        :raises pydantic.ValidationError: If the data doesn't match the schema in strict mode.
+        """
+        if data is None or self.mode == "off" or not isinstance(data, dict):
+            return data
+        if self.mode == "lazy":
+            return LazyModel(schema, data)
+        return get_adapter(schema).validate_python(data)
+
+    def typed_many(self, items: Iterable[dict], schema: Any) -> list:
+        """
+        Converts list of response dicts to results.
+
+        :param items: response dicts.
+        :type items: Iterable[dict]
+        :param schema: schema (model class or its name) of each item.
+        :type schema: type[BaseModel] | str
+        :return: list of dicts, LazyModel or models depending on mode.
+        :rtype: list
+        :raises pydantic.ValidationError: If any item doesn't match the schema in strict mode.
+        """
+        if self.mode == "off":
+            return list(items)
+        schema = resolve_schema(schema)
+        if self.mode == "lazy":
+            return [LazyModel(schema, item) for item in items]
+        return get_adapter(List[schema]).validate_python(items)  # type: ignore[valid-type]
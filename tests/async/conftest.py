@@ -5,20 +5,23 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 05.12.2023
+Last Modified: 18.10.2026
 
 Description:
 This file contains pytest fixtures for async API.
 """
 
+import logging
 import random
 from datetime import datetime, timedelta
 from os import environ
 from typing import Optional
 
 import pytest
+import pytest_asyncio
 
 from src.ablt_python_api.ablt_api_async import ABLTApi
+from src.ablt_python_api.pytest_plugin import MOCK_BEARER_TOKEN
 
 
 @pytest.fixture(scope="session")
@@ -32,6 +35,24 @@ def api():
     return ABLTApi(bearer_token=environ["ABLT_BEARER_TOKEN"])
 
 
+@pytest_asyncio.fixture()
+async def mock_api(mock_server):
+    """
+    This fixture returns async API connected to mock of aBLT API, it overrides sync fixture of the plugin.
+
+    :param mock_server: mock server fixture
+    :return: ABLTApi instance
+    :rtype: ABLTApi
+    """
+    async with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN,
+        base_api_url=mock_server.url,
+        logger=logging.getLogger("ablt-mock-api"),
+        lazy=True,
+    ) as async_api:
+        yield async_api
+
+
 @pytest.fixture()
 def random_date_generator():
     """
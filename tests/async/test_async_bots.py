@@ -5,18 +5,22 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 06.11.2023
-Last Modified: 20.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for async bots.
 """
 
+import asyncio
 from random import choice
 from secrets import token_hex
 
 import pytest
 
+from src.ablt_python_api.ablt_api_async import ABLTApi
+from src.ablt_python_api.pytest_plugin import MOCK_BEARER_TOKEN
 from src.ablt_python_api.schemas import BotSchema
+from src.ablt_python_api.utils.bot_cache import BotCache
 from tests.test_data import ensured_bots, KEY_LENGTH
 
 
@@ -124,3 +128,96 @@ async def test_async_bots_name_not_exist(api):
     """
     bot_by_name = await api.find_bot_by_name(bot_name=choice(("", token_hex(KEY_LENGTH))))
     assert bot_by_name is None
+
+
+@pytest.mark.asyncio
+async def test_async_bots_cache(mock_server, mock_api):
+    """
+    This method tests for async bots: fresh catalog is cached, forced refresh is revalidated, invalidated is downloaded.
+
+    :param mock_server: mock_server fixture
+    :param mock_api: mock_api fixture
+    """
+    bots = await mock_api.get_bots()
+    index = await mock_api.get_bot_index()
+    bot_requests = mock_server.requests["/v1/bots"]
+    assert await mock_api.get_bots() == bots
+    assert mock_server.requests["/v1/bots"] == bot_requests
+    assert await mock_api.get_bots(force_refresh=True) == bots
+    assert await mock_api.get_bot_index() is index
+    assert mock_server.requests["/v1/bots"] == bot_requests + 1
+    mock_api.invalidate_bots()
+    assert await mock_api.get_bots() == bots
+    assert await mock_api.get_bot_index() is not index
+    assert mock_server.requests["/v1/bots"] == bot_requests + 2
+
+
+@pytest.mark.asyncio
+async def test_async_bots_cache_ttl(mock_server):
+    """
+    This method tests for async bots: expired catalog is revalidated, disabled cache downloads catalog each time.
+
+    :param mock_server: mock_server fixture
+    """
+    async with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, bot_cache=BotCache(ttl=0.1, stale_ttl=0)
+    ) as api:
+        index = await api.get_bot_index()
+        bot_requests = mock_server.requests["/v1/bots"]
+        assert await api.get_bot_index() is index
+        assert mock_server.requests["/v1/bots"] == bot_requests
+        await asyncio.sleep(0.2)
+        assert await api.get_bot_index() is index
+        assert mock_server.requests["/v1/bots"] == bot_requests + 1
+    async with ABLTApi(bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, bot_cache=BotCache(ttl=0)) as api:
+        bots = await api.get_bots()
+        bot_requests = mock_server.requests["/v1/bots"]
+        assert await api.get_bots() == bots
+        assert await api.get_bots() == bots
+        assert mock_server.requests["/v1/bots"] == bot_requests + 2
+
+
+@pytest.mark.asyncio
+async def test_async_bots_find_bots_by_model(mock_api):
+    """
+    This method tests for async bots: find bots by model.
+
+    :param mock_api: mock_api fixture
+    """
+    bots = await mock_api.get_bots()
+    any_bot = BotSchema.model_validate(choice(bots))
+    bots_by_model = await mock_api.find_bots_by_model(model=any_bot.model)
+    assert bots_by_model == [bot for bot in bots if bot["model"] == any_bot.model]
+    assert not await mock_api.find_bots_by_model(model=token_hex(KEY_LENGTH))
+
+
+@pytest.mark.asyncio
+async def test_async_bots_find_bot_by_name_case_insensitive(mock_api):
+    """
+    This method tests for async bots: find bot by name case-insensitively.
+
+    :param mock_api: mock_api fixture
+    """
+    any_bot = BotSchema.model_validate(choice(await mock_api.get_bots()))
+    bot_by_name = BotSchema.model_validate(
+        await mock_api.find_bot_by_name(bot_name=any_bot.name.swapcase(), case_sensitive=False)
+    )
+    assert bot_by_name.name.casefold() == any_bot.name.casefold()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("validation", ["lazy", "strict"])
+async def test_async_bots_validation(mock_api, validation):
+    """
+    This method tests for async bots: typed bots are the same as validated raw ones.
+
+    :param mock_api: mock_api fixture
+    :param validation: validation mode
+    """
+    bots = [BotSchema.model_validate(bot) for bot in await mock_api.get_bots()]
+    typed_api = await ABLTApi.create(
+        base_api_url=mock_api.get_base_api_url(), bearer_token=mock_api.get_bearer_token(), validation=validation
+    )
+    typed_bots = await typed_api.get_bots()
+    assert typed_bots == bots
+    assert await typed_api.find_bot_by_slug(bots[0].slug) == bots[0]
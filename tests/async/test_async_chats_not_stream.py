@@ -5,11 +5,12 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 16.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for async chats (non-streaming mode).
 """
+
 # pylint: disable=R0801
 from logging import ERROR
 from random import choice, randint
@@ -260,3 +261,22 @@ async def test_async_chats_not_stream_use_search(api):
     :param api: api fixture (returns ABLTApi instance)
     """
     return api  # TBD
+
+
+@pytest.mark.asyncio
+async def test_async_chats_not_stream_chat_many(mock_api):
+    """
+    This method tests for async chat many: all requests are completed, failed ones don't abort the batch
+
+    :param mock_api: mock_api fixture (returns ABLTApi instance)
+    """
+    bot = choice([BotSchema.model_validate(bot_dict) for bot_dict in await mock_api.get_bots()])
+    requests = [{"bot_uid": bot.uid, "prompt": question, "max_words": MIN_WORDS} for question in sample_questions]
+    requests.append({"prompt": choice(sample_questions)})
+    batch = mock_api.chat_many(requests, concurrency=3)
+    results = [result async for result in batch]
+    assert [result.index for result in results] == list(range(len(requests)))
+    assert all(result.ok for result in results[:-1])
+    assert not results[-1].ok
+    assert batch.completed == len(requests) and batch.failed == 1
+    assert batch.throughput > 0
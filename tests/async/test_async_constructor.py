@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 03.11.2023
-Last Modified: 05.12.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for async constructor.
@@ -18,6 +18,7 @@ import pytest
 from aiohttp import client_exceptions
 
 from src.ablt_python_api.ablt_api_async import ABLTApi
+from src.ablt_python_api.utils.retry import RetryPolicy
 from tests.test_data import KEY_LENGTH
 
 
@@ -95,3 +96,30 @@ def test_async_constructor_default_init_with_incorrect_logger():
     """Test against constructor with incorrect logger."""
     with pytest.raises(AttributeError):
         ABLTApi(bearer_token=token_hex(KEY_LENGTH), logger=token_hex(KEY_LENGTH))
+
+
+@pytest.mark.asyncio
+async def test_async_constructor_lazy_init_with_invalid_url():
+    """Test against lazy constructor with invalid url: health is checked on first request only."""
+    api = ABLTApi(
+        bearer_token=token_hex(KEY_LENGTH),
+        base_api_url=f"https://{token_hex(KEY_LENGTH)}",
+        retry_policy=RetryPolicy(max_attempts=1),
+        lazy=True,
+    )
+    with pytest.raises(ConnectionError):
+        await api.get_bots()
+    await api.aclose()
+
+
+@pytest.mark.asyncio
+async def test_async_constructor_create(caplog):
+    """
+    Test against async factory.
+
+    :param caplog: caplog pytest fixture
+    """
+    caplog.set_level(INFO)
+    api = await ABLTApi.create(bearer_token=token_hex(KEY_LENGTH))
+    assert "ABLT chat API is working like a charm" in caplog.text
+    await api.aclose()
@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 06.11.2023
-Last Modified: 30.01.2024
+Last Modified: 18.10.2026
 
 Description:
 This file tests for async other helper stuff.
@@ -19,7 +19,6 @@ from aiohttp import client_exceptions
 from src.ablt_python_api.ablt_api_async import ABLTApi
 from tests.test_data import KEY_LENGTH
 
-
 test_api = ABLTApi(bearer_token=token_hex(KEY_LENGTH))
 
 
@@ -170,3 +169,18 @@ async def test_async_other_set_logger():
     test_api.set_logger(new_logger=token_hex(KEY_LENGTH))
     with pytest.raises(AttributeError):
         await test_api.health_check()
+
+
+@pytest.mark.asyncio
+async def test_async_other_context_manager(caplog):
+    """
+    This method tests for async other: context manager with own pooled session.
+
+    :param caplog: caplog pytest fixture
+    """
+    caplog.set_level("INFO")
+    async with ABLTApi(bearer_token=token_hex(KEY_LENGTH), pool_limit=1) as api:
+        assert await api.health_check()
+        assert await api.health_check()
+    assert "ABLT chat API is working like a charm" in caplog.text
+    await api.aclose()
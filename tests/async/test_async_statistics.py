@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 06.11.2023
-Last Modified: 17.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for async bots.
@@ -18,7 +18,10 @@ from secrets import token_hex
 
 import pytest
 
+from src.ablt_python_api.ablt_api_async import ABLTApi
 from src.ablt_python_api.schemas import StatisticsSchema, StatisticItemSchema, StatisticTotalSchema
+from src.ablt_python_api.utils.statistics_cache import StatisticsCache
+from src.ablt_python_api.utils.statistics_store import StatisticsStore
 from tests.test_data import (
     LOWER_USER_ID,
     UPPER_USER_ID,
@@ -237,3 +240,134 @@ async def test_async_statistics_wrong_user_id_total(api, caplog):
     response = await api.get_statistics_total(user_id=token_hex(KEY_LENGTH))
     assert response is None
     assert "Error: user_id should be int" in caplog.text
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("window", ["week", "month", 10])
+async def test_async_statistics_split_range(mock_api, window):
+    """
+    This method tests for async statistics: split range is the same as the whole range
+
+    :param mock_api: mock_api fixture
+    :param window: window to split range
+    """
+    user_id = randint(LOWER_USER_ID, UPPER_USER_ID)
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=DATE_TEST_PERIOD)).strftime("%Y-%m-%d")
+    whole = StatisticsSchema.model_validate(
+        await mock_api.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+    )
+    split = StatisticsSchema.model_validate(
+        await mock_api.get_usage_statistics(
+            user_id=user_id, start_date=start_date, end_date=end_date, window=window, concurrency=4
+        )
+    )
+    assert split.items == whole.items
+    assert split.total == whole.total
+
+
+@pytest.mark.asyncio
+async def test_async_statistics_cache(mock_server, mock_api, tmp_path):
+    """
+    This method tests for async statistics: cached statistics are the same as fetched ones, past days are fetched once
+
+    :param mock_server: mock_server fixture
+    :param mock_api: mock_api fixture
+    :param tmp_path: pytest tmp_path fixture
+    """
+    user_id = randint(LOWER_USER_ID, UPPER_USER_ID)
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=DATE_TEST_PERIOD)).strftime("%Y-%m-%d")
+    whole = StatisticsSchema.model_validate(
+        await mock_api.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+    )
+    cached_api = await ABLTApi.create(
+        base_api_url=mock_api.get_base_api_url(),
+        bearer_token=mock_api.get_bearer_token(),
+        statistics_cache=StatisticsCache(str(tmp_path / "statistics.db")),
+    )
+    stat_requests = mock_server.requests["/v1/user/usage-statistics"]
+    for _ in range(2):
+        cached = StatisticsSchema.model_validate(
+            await cached_api.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+        )
+        assert cached.items == whole.items
+        assert cached.total == whole.total
+    # Only today is requested again
+    assert mock_server.requests["/v1/user/usage-statistics"] == stat_requests + 2
+
+
+@pytest.mark.asyncio
+async def test_async_statistics_for_users(mock_api):
+    """
+    This method tests for async statistics: combined total of many users is the same as sum of their totals
+
+    :param mock_api: mock_api fixture
+    """
+    user_ids = list({randint(LOWER_USER_ID, UPPER_USER_ID) for _ in range(5)})
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=DATE_TEST_PERIOD)).strftime("%Y-%m-%d")
+    batch = mock_api.get_usage_statistics_for_users(user_ids, start_date=start_date, end_date=end_date, concurrency=3)
+    total = await batch.combined_total()
+    assert not batch.failed_users
+    assert batch.succeeded == len(user_ids)
+    totals = [
+        await mock_api.get_statistics_total(user_id=user_id, start_date=start_date, end_date=end_date)
+        for user_id in user_ids
+    ]
+    assert StatisticTotalSchema.model_validate(total)
+    assert total == {field: sum(item[field] for item in totals) for field in total}
+
+
+@pytest.mark.asyncio
+async def test_async_statistics_sync_store(mock_server, mock_api):
+    """
+    This method tests for async statistics: synced store is the same as API, synced days aren't requested again
+
+    :param mock_server: mock_server fixture
+    :param mock_api: mock_api fixture
+    """
+    user_id = randint(LOWER_USER_ID, UPPER_USER_ID)
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=DATE_TEST_PERIOD)).strftime("%Y-%m-%d")
+    store = StatisticsStore()
+    scope = store.scope_of(mock_api.get_bearer_token(), mock_api.get_base_api_url())
+    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+    stat_requests = mock_server.requests.get("/v1/user/usage-statistics", 0)
+    assert await mock_api.sync_usage_statistics(store, user_id=user_id, start_date=start_date) is not None
+    assert store.get_watermark(user_id, scope) == yesterday
+    assert await mock_api.sync_usage_statistics(store, user_id=user_id) is not None
+    assert store.get_watermark(user_id, scope) == yesterday
+    assert mock_server.requests["/v1/user/usage-statistics"] == stat_requests + 2
+    whole = await mock_api.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+    assert StatisticsSchema.model_validate(
+        store.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date, scope=scope)
+    ) == StatisticsSchema.model_validate(whole)
+    assert store.get_statistics_total(user_id, start_date, end_date, scope) == whole["total"]
+    assert store.get_statistics_for_a_day(end_date, user_id, scope) == await mock_api.get_statistics_for_a_day(
+        end_date, user_id
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("validation", ["lazy", "strict"])
+async def test_async_statistics_validation(mock_api, validation):
+    """
+    This method tests for async statistics: typed statistics are the same as validated raw ones.
+
+    :param mock_api: mock_api fixture
+    :param validation: validation mode
+    """
+    user_id = randint(LOWER_USER_ID, UPPER_USER_ID)
+    end_date = datetime.now().strftime("%Y-%m-%d")
+    start_date = (datetime.now() - timedelta(days=DATE_TEST_PERIOD)).strftime("%Y-%m-%d")
+    whole = StatisticsSchema.model_validate(
+        await mock_api.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+    )
+    typed_api = await ABLTApi.create(
+        base_api_url=mock_api.get_base_api_url(), bearer_token=mock_api.get_bearer_token(), validation=validation
+    )
+    typed = await typed_api.get_usage_statistics(user_id=user_id, start_date=start_date, end_date=end_date)
+    assert typed == whole
+    assert typed.total == whole.total
+    assert await typed_api.get_statistics_total(user_id, start_date, end_date) == whole.total
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: conftest.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file contains pytest fixtures shared by all tests: local mock of aBLT API.
+"""
+
+# pylint: disable=unused-import
+from src.ablt_python_api.pytest_plugin import mock_api, mock_server  # noqa: F401
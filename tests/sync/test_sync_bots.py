@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 20.11.2023
-Last Modified: 20.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for sync bots.
@@ -13,10 +13,14 @@ This file tests for sync bots.
 
 from random import choice
 from secrets import token_hex
+from time import sleep
 
 import pytest
 
+from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.pytest_plugin import MOCK_BEARER_TOKEN
 from src.ablt_python_api.schemas import BotSchema
+from src.ablt_python_api.utils.bot_cache import BotCache
 from tests.test_data import ensured_bots, KEY_LENGTH
 
 
@@ -124,3 +128,96 @@ def test_sync_bots_name_not_exist(api):
     """
     bot_by_name = api.find_bot_by_name(bot_name=choice(("", token_hex(KEY_LENGTH))))
     assert bot_by_name is None
+
+
+@pytest.mark.sync
+def test_sync_bots_cache(mock_server, mock_api):
+    """
+    This method tests for sync bots: fresh catalog is cached, forced refresh is revalidated, invalidated is downloaded.
+
+    :param mock_server: mock_server fixture
+    :param mock_api: mock_api fixture
+    """
+    bots = mock_api.get_bots()
+    index = mock_api.get_bot_index()
+    bot_requests = mock_server.requests["/v1/bots"]
+    assert mock_api.get_bots() == bots
+    assert mock_server.requests["/v1/bots"] == bot_requests
+    assert mock_api.get_bots(force_refresh=True) == bots
+    assert mock_api.get_bot_index() is index
+    assert mock_server.requests["/v1/bots"] == bot_requests + 1
+    mock_api.invalidate_bots()
+    assert mock_api.get_bots() == bots
+    assert mock_api.get_bot_index() is not index
+    assert mock_server.requests["/v1/bots"] == bot_requests + 2
+
+
+@pytest.mark.sync
+def test_sync_bots_cache_ttl(mock_server):
+    """
+    This method tests for sync bots: expired catalog is revalidated, disabled cache downloads catalog each time.
+
+    :param mock_server: mock_server fixture
+    """
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, bot_cache=BotCache(ttl=0.1, stale_ttl=0)
+    ) as api:
+        index = api.get_bot_index()
+        bot_requests = mock_server.requests["/v1/bots"]
+        assert api.get_bot_index() is index
+        assert mock_server.requests["/v1/bots"] == bot_requests
+        sleep(0.2)
+        assert api.get_bot_index() is index
+        assert mock_server.requests["/v1/bots"] == bot_requests + 1
+    with ABLTApi(bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, bot_cache=BotCache(ttl=0)) as api:
+        bots = api.get_bots()
+        bot_requests = mock_server.requests["/v1/bots"]
+        assert api.get_bots() == bots
+        assert api.get_bots() == bots
+        assert mock_server.requests["/v1/bots"] == bot_requests + 2
+
+
+@pytest.mark.sync
+def test_sync_bots_find_bots_by_model(mock_api):
+    """
+    This method tests for sync bots: find bots by model.
+
+    :param mock_api: mock_api fixture
+    """
+    bots = mock_api.get_bots()
+    any_bot = BotSchema.model_validate(choice(bots))
+    bots_by_model = mock_api.find_bots_by_model(model=any_bot.model)
+    assert bots_by_model == [bot for bot in bots if bot["model"] == any_bot.model]
+    assert not mock_api.find_bots_by_model(model=token_hex(KEY_LENGTH))
+
+
+@pytest.mark.sync
+def test_sync_bots_find_bot_by_name_case_insensitive(mock_api):
+    """
+    This method tests for sync bots: find bot by name case-insensitively.
+
+    :param mock_api: mock_api fixture
+    """
+    any_bot = BotSchema.model_validate(choice(mock_api.get_bots()))
+    bot_by_name = BotSchema.model_validate(
+        mock_api.find_bot_by_name(bot_name=any_bot.name.swapcase(), case_sensitive=False)
+    )
+    assert bot_by_name.name.casefold() == any_bot.name.casefold()
+
+
+@pytest.mark.sync
+@pytest.mark.parametrize("validation", ["lazy", "strict"])
+def test_sync_bots_validation(mock_api, validation):
+    """
+    This method tests for sync bots: typed bots are the same as validated raw ones.
+
+    :param mock_api: mock_api fixture
+    :param validation: validation mode
+    """
+    bots = [BotSchema.model_validate(bot) for bot in mock_api.get_bots()]
+    typed_api = ABLTApi(
+        base_api_url=mock_api.get_base_api_url(), bearer_token=mock_api.get_bearer_token(), validation=validation
+    )
+    typed_bots = typed_api.get_bots()
+    assert typed_bots == bots
+    assert typed_api.find_bot_by_slug(bots[0].slug) == bots[0]
@@ -5,11 +5,12 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 20.11.2023
-Last Modified: 20.11.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for sync chats (streaming mode).
 """
+
 # pylint: disable=R0801
 from logging import ERROR
 from random import choice, randint
@@ -17,6 +18,7 @@ from random import choice, randint
 import pytest
 
 from src.ablt_python_api.schemas import BotSchema, StatisticsSchema
+from src.ablt_python_api.utils.chat_request import ChatRequest
 from src.ablt_python_api.utils.exceptions import DoneException
 from tests.test_data import (
     sample_questions,
@@ -250,3 +252,36 @@ def test_sync_chats_stream_use_search(api):
     :param api: api fixture (returns ABLTApi instance)
     """
     return api  # TBD
+
+
+@pytest.mark.sync
+def test_sync_chats_stream_without_done_exception(mock_api):
+    """
+    This method tests for sync chat stream which ends without DoneException and keeps metadata
+
+    :param mock_api: mock_api fixture (returns ABLTApi instance)
+    """
+    bot = choice([BotSchema.model_validate(bot_dict) for bot_dict in mock_api.get_bots()])
+    chat_stream = mock_api.chat(
+        bot_uid=bot.uid, prompt=choice(sample_questions), max_words=MIN_WORDS, stream=True, raise_on_done=False
+    )
+    response = "".join(chat_stream)
+    assert response
+    assert chat_stream.done
+    assert chat_stream.messages > 0 and chat_stream.events > chat_stream.messages
+    assert chat_stream.chunks > 0 and chat_stream.bytes > len(response)
+    assert chat_stream.duration > 0
+
+
+@pytest.mark.sync
+def test_sync_chats_stream_reused_request(mock_api):
+    """
+    This method tests for sync chats with reused request (pre-encoded bot and params)
+
+    :param mock_api: mock_api fixture (returns ABLTApi instance)
+    """
+    bot = choice([BotSchema.model_validate(bot_dict) for bot_dict in mock_api.get_bots()])
+    request = ChatRequest(bot_uid=bot.uid, max_words=MIN_WORDS, stream=True)
+    for prompt in sample_questions[:2]:
+        response = "".join(mock_api.chat(prompt=prompt, request=request, raise_on_done=False))
+        assert response
@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 20.11.2023
-Last Modified: 05.12.2023
+Last Modified: 18.10.2026
 
 Description:
 This file tests for sync constructor.
@@ -17,6 +17,7 @@ from secrets import token_hex
 import pytest
 
 from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.utils.retry import RetryPolicy
 from tests.test_data import KEY_LENGTH
 
 
@@ -104,3 +105,16 @@ def test_sync_constructor_default_init_with_incorrect_logger():
             bearer_token=token_hex(KEY_LENGTH),
             logger=token_hex(KEY_LENGTH),
         )
+
+
+@pytest.mark.sync
+def test_sync_constructor_lazy_init_with_invalid_url():
+    """Test against lazy constructor with invalid url: health is checked on first request only."""
+    api = ABLTApi(
+        bearer_token=token_hex(KEY_LENGTH),
+        base_api_url=f"https://{token_hex(KEY_LENGTH)}",
+        retry_policy=RetryPolicy(max_attempts=1),
+        lazy=True,
+    )
+    with pytest.raises(ConnectionError):
+        api.get_bots()
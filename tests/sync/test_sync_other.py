@@ -5,7 +5,7 @@ Author: Iliya Vereshchagin
 Copyright (c) 2023 aBLT.ai. All rights reserved.
 
 Created: 20.11.2023
-Last Modified: 30.01.2024
+Last Modified: 18.10.2026
 
 Description:
 This file tests for sync other helper stuff.
@@ -168,3 +168,17 @@ def test_sync_other_set_logger():
     test_api.set_logger(new_logger=token_hex(KEY_LENGTH))
     with pytest.raises(AttributeError):
         test_api.health_check()
+
+
+@pytest.mark.sync
+def test_sync_other_context_manager(caplog):
+    """
+    This method tests for other: context manager with own pooled session.
+
+    :param caplog: caplog pytest fixture
+    """
+    caplog.set_level("INFO")
+    with ABLTApi(bearer_token=token_hex(KEY_LENGTH), pool_connections=1, pool_maxsize=1) as api:
+        assert api.health_check()
+        assert api.health_check()
+    assert "ABLT chat API is working like a charm" in caplog.text
@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: __init__.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file describes entry point for aBLT chat API utils tests.
+"""
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_batch.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for batch execution of chat requests.
+"""
+
+import asyncio
+import itertools
+import random
+import threading
+from time import sleep
+
+import pytest
+
+from src.ablt_python_api.utils.batch import AsyncChatBatch, ChatBatch, afan_out, fan_out
+
+
+class FakeChat:
+    """This class emulates chat method of async API."""
+
+    def __init__(self):
+        """Init FakeChat class"""
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, prompt, raise_on_done=True, fail=False):
+        """
+        This method emulates chat stream.
+
+        :param prompt: prompt
+        :param raise_on_done: raise DoneException flag, should be False for batches
+        :param fail: raise error instead of response
+        :return: messages
+        """
+        assert raise_on_done is False
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(random.random() / 100)
+            if fail:
+                raise ConnectionError(prompt)
+            yield prompt
+            yield "!"
+        finally:
+            self.running -= 1
+
+
+class FakeSyncChat:
+    """This class emulates chat method of sync API."""
+
+    def __init__(self):
+        """Init FakeSyncChat class"""
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, prompt, raise_on_done=True, timeout=None, fail=False, delay=None):
+        """
+        This method emulates chat stream.
+
+        :param prompt: prompt
+        :param raise_on_done: raise DoneException flag, should be False for batches
+        :param timeout: request timeout
+        :param fail: raise error instead of response
+        :param delay: delay between messages
+        :return: messages
+        """
+        assert raise_on_done is False
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            sleep(random.random() / 100 if delay is None else delay)
+            if fail:
+                raise ConnectionError(prompt)
+            yield prompt
+            sleep(0 if delay is None else delay)
+            yield "!"
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_utils_batch_sync(ordered):
+    """
+    This method tests for sync batch: bounded number of threads, captured errors, order and statistics.
+
+    :param ordered: yield results in order of requests
+    """
+    chat = FakeSyncChat()
+    requests = [{"prompt": str(index), "fail": index % 10 == 0} for index in range(50)]
+    batch = ChatBatch(chat, requests, max_workers=4, ordered=ordered)
+    results = list(batch)
+    assert chat.max_running <= 4
+    assert sorted(result.index for result in results) == list(range(50))
+    if ordered:
+        assert [result.index for result in results] == list(range(50))
+    for result in results:
+        if result.index % 10 == 0:
+            assert not result.ok and isinstance(result.error, ConnectionError)
+        else:
+            assert result.ok and result.response == f"{result.index}!"
+    assert (batch.completed, batch.succeeded, batch.failed) == (50, 45, 5)
+    assert batch.throughput > 0
+
+
+def test_utils_batch_sync_timeout():
+    """This method tests for sync batch: slow request exceeds timeout and doesn't abort the batch."""
+    requests = [{"prompt": "slow", "delay": 0.2}, {"prompt": "fast", "delay": 0}]
+    results = list(ChatBatch(FakeSyncChat(), requests, max_workers=2, timeout=0.1))
+    assert isinstance(results[0].error, TimeoutError)
+    assert results[1].ok and results[1].response == "fast!"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_utils_batch_async(ordered):
+    """
+    This method tests for async batch: bounded concurrency, captured errors, order and statistics.
+
+    :param ordered: yield results in order of requests
+    """
+    chat = FakeChat()
+    requests = [{"prompt": str(index), "fail": index % 10 == 0} for index in range(50)]
+    batch = AsyncChatBatch(chat, requests, concurrency=5, ordered=ordered)
+    results = [result async for result in batch]
+    assert chat.max_running == 5
+    assert sorted(result.index for result in results) == list(range(50))
+    if ordered:
+        assert [result.index for result in results] == list(range(50))
+    for result in results:
+        if result.index % 10 == 0:
+            assert not result.ok and isinstance(result.error, ConnectionError)
+        else:
+            assert result.ok and result.response == f"{result.index}!"
+    assert (batch.completed, batch.succeeded, batch.failed) == (50, 45, 5)
+    assert batch.throughput > 0
+
+
+@pytest.mark.asyncio
+async def test_utils_batch_async_close():
+    """This method tests for async batch: requests in progress are cancelled on close."""
+    chat = FakeChat()
+    batch = AsyncChatBatch(chat, ({"prompt": str(index)} for index in range(1000)), concurrency=3)
+    async for result in batch:
+        if result.index == 10:
+            break
+    await batch.aclose()
+    await asyncio.sleep(0)
+    assert chat.running == 0
+    assert batch.completed < 1000
+
+
+def test_utils_batch_invalid_concurrency():
+    """This method tests for batches: invalid concurrency."""
+    with pytest.raises(ValueError):
+        AsyncChatBatch(FakeChat(), [], concurrency=0)
+    with pytest.raises(ValueError):
+        ChatBatch(FakeSyncChat(), [], max_workers=0)
+
+
+def test_utils_batch_fan_out():
+    """This method tests for fan-out in thread pool: order of results and lazy endless items."""
+    assert list(fan_out(lambda number: number * 2, range(20), max_workers=4)) == list(range(0, 40, 2))
+    assert sorted(fan_out(lambda number: number * 2, range(20), max_workers=4, ordered=False)) == list(range(0, 40, 2))
+    started = []
+
+    def execute(number):
+        """
+        This function records started item.
+
+        :param number: item
+        :return: item
+        """
+        started.append(number)
+        return number
+
+    results = fan_out(execute, iter(int, 1), max_workers=2)
+    assert [next(results) for _ in range(3)] == [0, 0, 0]
+    results.close()
+    sleep(0.01)
+    assert len(started) <= 2 * 2 + 3
+
+
+@pytest.mark.asyncio
+async def test_utils_batch_afan_out():
+    """This method tests for fan-out by asyncio workers: order of results and bounded concurrency."""
+    running = []
+    max_running = []
+
+    async def execute(number):
+        """
+        This function emulates request.
+
+        :param number: item
+        :return: doubled item
+        """
+        running.append(number)
+        max_running.append(len(running))
+        await asyncio.sleep(random.random() / 100)
+        running.remove(number)
+        return number * 2
+
+    assert [result async for result in afan_out(execute, range(20), concurrency=4)] == list(range(0, 40, 2))
+    results = [result async for result in afan_out(execute, range(20), concurrency=4, ordered=False)]
+    assert sorted(results) == list(range(0, 40, 2)) and not running
+    assert max(max_running) == 4
+
+
+@pytest.mark.asyncio
+async def test_utils_batch_afan_out_window():
+    """This method tests for fan-out by asyncio workers: slow item bounds taken items, closing waits for workers."""
+    started = []
+    finished = []
+
+    async def execute(number):
+        """
+        This function emulates request, the first one is slow, the later ones hang.
+
+        :param number: item
+        :return: item
+        """
+        started.append(number)
+        try:
+            await asyncio.sleep(0.05 if number == 0 else 0 if number < 4 else 10)
+        finally:
+            finished.append(number)
+        return number
+
+    results = afan_out(execute, itertools.count(), concurrency=2)
+    assert await results.__anext__() == 0
+    # Items behind the slow one hold the window, so the endless items aren't taken
+    assert len(started) <= 2 * 2 + 1
+    await asyncio.sleep(0.01)
+    await results.aclose()
+    assert 4 in started and sorted(finished) == sorted(started)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_bot_cache.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for bot catalog cache.
+"""
+
+from time import sleep
+
+import pytest
+
+from src.ablt_python_api.utils.bot_cache import BotCache
+
+BOTS = [{"uid": "1", "slug": "omni", "name": "Omni"}]
+
+
+def test_utils_bot_cache_fresh_and_stale():
+    """This method tests for bot cache: catalog is fresh within ttl, stale within stale_ttl, then expired."""
+    cache = BotCache(ttl=0.05, stale_ttl=0.05)
+    assert cache.get() is None and cache.age is None
+    cache.store(BOTS)
+    assert cache.is_fresh and cache.get() == BOTS
+    sleep(0.06)
+    assert not cache.is_fresh
+    assert cache.get() == BOTS
+    assert cache.get(allow_stale=False) is None
+    sleep(0.05)
+    assert cache.get() is None
+
+
+def test_utils_bot_cache_returns_copy():
+    """This method tests for bot cache: caller can't change cached catalog."""
+    cache = BotCache()
+    cache.store(list(BOTS)).bots.clear()
+    cache.get().append({})
+    assert cache.get() == BOTS
+    assert cache.get_index().by_slug("omni") == BOTS[0]
+
+
+def test_utils_bot_cache_validators():
+    """This method tests for bot cache: conditional headers, revalidation and invalidation."""
+    cache = BotCache()
+    assert not cache.validators()
+    cache.store(BOTS, '"v1"', "Sun, 18 Oct 2026 10:00:00 GMT")
+    assert cache.validators() == {"If-None-Match": '"v1"', "If-Modified-Since": "Sun, 18 Oct 2026 10:00:00 GMT"}
+    age = cache.age
+    assert cache.revalidated().bots == BOTS
+    assert cache.age <= age
+    cache.invalidate()
+    assert not cache.validators()
+    assert cache.revalidated() is None
+    assert cache.get() is None
+
+
+def test_utils_bot_cache_disabled():
+    """This method tests for bot cache: zero ttl disables cache, stale catalog isn't served."""
+    cache = BotCache(ttl=0)
+    assert cache.store(BOTS).bots == BOTS
+    assert cache.get() is None and cache.get_index() is None
+    assert not cache.validators() and not cache.is_fresh
+    cache = BotCache(ttl=60)
+    cache.store(BOTS)
+    cache.ttl = 0
+    assert cache.get() is None
+
+
+def test_utils_bot_cache_single_refresh():
+    """This method tests for bot cache: only one background refresh at once."""
+    cache = BotCache()
+    assert cache.begin_refresh()
+    assert not cache.begin_refresh()
+    cache.end_refresh()
+    assert cache.begin_refresh()
+
+
+def test_utils_bot_cache_invalid_ttl():
+    """This method tests for bot cache: negative ttl."""
+    with pytest.raises(ValueError):
+        BotCache(ttl=-1)
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_bot_index.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for bot index.
+"""
+
+import pytest
+
+from src.ablt_python_api.utils.bot_index import BotIndex
+
+BOTS = [
+    {"uid": "1", "slug": "omni", "name": "Omni", "model": "gpt-4"},
+    {"uid": "2", "slug": "miles", "name": "Miles Hiker", "model": "gpt-3.5"},
+    {"uid": "3", "slug": "miles-2", "name": "Miles Hiker", "model": "gpt-4"},
+    {"uid": "4", "slug": "mila", "name": "mila", "model": "claude"},
+]
+
+
+@pytest.fixture(name="index")
+def index_fixture():
+    """
+    This fixture returns index of sample bots.
+
+    :return: bot index
+    """
+    return BotIndex(BOTS)
+
+
+def test_utils_bot_index_same_as_linear_search(index):
+    """This method tests for bot index: lookups return the same bot as linear search (the first one)."""
+    for key, lookup in (("uid", index.by_uid), ("slug", index.by_slug), ("name", index.by_name)):
+        for bot in BOTS:
+            assert lookup(bot[key]) is next(item for item in BOTS if item[key] == bot[key])
+        assert lookup("unknown") is None
+    assert index.by_name("Miles Hiker")["uid"] == "2"
+    assert len(index) == 4 and index.bots == BOTS
+
+
+def test_utils_bot_index_case_insensitive_name(index):
+    """This method tests for bot index: case-insensitive name lookup."""
+    assert index.by_name("OMNI") is None
+    assert index.by_name("OMNI", case_sensitive=False)["uid"] == "1"
+    assert index.by_name("miles hiker", case_sensitive=False)["uid"] == "2"
+
+
+def test_utils_bot_index_model(index):
+    """This method tests for bot index: multi-valued model index."""
+    assert [bot["uid"] for bot in index.by_model("gpt-4")] == ["1", "3"]
+    assert not index.by_model("unknown")
+    assert index.models() == ["gpt-4", "gpt-3.5", "claude"]
+    index.by_model("gpt-4").clear()
+    assert len(index.by_model("gpt-4")) == 2
+
+
+def test_utils_bot_index_missed_fields():
+    """This method tests for bot index: bots without uid, slug, name or model aren't indexed by them."""
+    index = BotIndex([{"uid": "1"}, {"slug": "omni", "name": None, "model": None}])
+    assert len(index) == 2 and index.by_uid("1") == {"uid": "1"}
+    assert index.by_slug("omni")["name"] is None
+    for lookup in (index.by_uid, index.by_slug, index.by_name):
+        assert lookup(None) is None
+    assert not index.models() and not index.by_model(None)
+
+
+@pytest.mark.parametrize(
+    "prefix, expected",
+    [("mil", ["4", "2", "3"]), ("MILES", ["2", "3"]), ("o", ["1"]), ("", ["4", "2", "3", "1"]), ("x", [])],
+)
+def test_utils_bot_index_name_prefix(index, prefix, expected):
+    """
+    This method tests for bot index: case-insensitive prefix lookup, results are ordered by name.
+
+    :param index: index fixture
+    :param prefix: name prefix
+    :param expected: expected uids
+    """
+    assert [bot["uid"] for bot in index.by_name_prefix(prefix)] == expected
+
+
+def test_utils_bot_index_empty():
+    """This method tests for bot index: empty index and bots without some fields."""
+    assert not BotIndex().bots
+    index = BotIndex([{"uid": "1"}])
+    assert index.by_uid("1") == {"uid": "1"}
+    assert not index.by_name_prefix("")
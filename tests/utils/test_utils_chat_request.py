@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_chat_request.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for reusable chat requests.
+"""
+
+import json
+
+import pytest
+
+from src.ablt_python_api.utils.chat_request import ChatRequest
+from src.ablt_python_api.utils.codec import CODECS, get_codec
+
+MESSAGES = [{"role": "system", "content": "Be brief"}, {"role": "user", "content": 'Say "hi" — ünïcode'}]
+
+
+def available_codecs():
+    """
+    This method returns installed JSON codecs.
+
+    :return: list of codecs
+    """
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            continue
+    return codecs
+
+
+@pytest.mark.parametrize("codec", available_codecs(), ids=lambda codec: codec.name)
+@pytest.mark.parametrize("message", [{"prompt": 'Say "hi"\n'}, {"messages": MESSAGES}], ids=["prompt", "messages"])
+def test_utils_chat_request_encode(codec, message):
+    """This method tests for chat request: encoded body equals to payload."""
+    request = ChatRequest(
+        bot_slug="omni", stream=True, language="English", assumptions={"tone": "formal"}, json_codec=codec
+    )
+    body = request.encode(**message)
+    assert isinstance(body, bytes)
+    assert json.loads(body) == request.payload(**message)
+    assert json.loads(body) == {
+        "stream": True,
+        "bot_slug": "omni",
+        "language": "English",
+        "assumptions": {"tone": "formal"},
+        "use_search": False,
+        **message,
+    }
+
+
+def test_utils_chat_request_skips_none_params():
+    """This method tests for chat request: None params are not sent, except stream."""
+    request = ChatRequest(bot_uid="uid", stream=None, use_search=None, user_id=42)
+    assert request.params == {"stream": None, "bot_uid": "uid", "user_id": 42}
+    assert not request.stream
+    assert json.loads(request.encode(prompt="Hi")) == {"stream": None, "bot_uid": "uid", "user_id": 42, "prompt": "Hi"}
+
+
+def test_utils_chat_request_static_part_is_encoded_once():
+    """This method tests for chat request: later changes of params don't affect the request."""
+    assumptions = {"tone": "formal"}
+    request = ChatRequest(bot_slug="omni", assumptions=assumptions)
+    assumptions["tone"] = "casual"
+    request.params["bot_slug"] = "other"
+    assert json.loads(request.encode(prompt="Hi"))["assumptions"] == {"tone": "formal"}
+    assert request.params["bot_slug"] == "omni"
+
+
+@pytest.mark.parametrize("bots", [{}, {"bot_uid": "uid", "bot_slug": "omni"}], ids=["missed", "both"])
+def test_utils_chat_request_wrong_bot(bots):
+    """This method tests for chat request: exactly one of bot_uid or bot_slug is required."""
+    with pytest.raises(ValueError):
+        ChatRequest(**bots)
+
+
+@pytest.mark.parametrize("message", [{}, {"prompt": "Hi", "messages": MESSAGES}], ids=["missed", "both"])
+def test_utils_chat_request_wrong_message(message):
+    """This method tests for chat request: exactly one of prompt or messages is required."""
+    request = ChatRequest(bot_slug="omni")
+    with pytest.raises(ValueError):
+        request.encode(**message)
+    with pytest.raises(ValueError):
+        request.payload(**message)
+
+
+def test_utils_chat_request_repr():
+    """This method tests for chat request: representation lists static params."""
+    assert repr(ChatRequest(bot_slug="omni")) == "ChatRequest(stream=False, bot_slug='omni', use_search=False)"
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_codec.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for JSON codecs.
+"""
+
+import sys
+
+import pytest
+
+from src.ablt_python_api.utils.codec import CODECS, _get_default_codec, default_codec, get_codec
+
+
+def installed_codecs():
+    """
+    This method returns installed codecs.
+
+    :return: list of codecs
+    """
+    codecs = []
+    for name in CODECS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            continue
+    return codecs
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=repr)
+def test_utils_codec_round_trip(codec):
+    """
+    This method tests for codec: encoded payload is decoded back from str and bytes.
+
+    :param codec: JSON codec
+    """
+    payload = {"stream": True, "prompt": 'Привет 🙂 "quoted"', "max_words": 100, "assumptions": None}
+    encoded = codec.dumps(payload)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == payload
+    assert codec.loads(encoded.decode("utf-8")) == payload
+
+
+@pytest.mark.parametrize("codec", installed_codecs(), ids=repr)
+def test_utils_codec_malformed(codec):
+    """
+    This method tests for codec: malformed JSON raises ValueError.
+
+    :param codec: JSON codec
+    """
+    with pytest.raises(ValueError):
+        codec.loads('{"content": "unterminated')
+
+
+def test_utils_codec_default():
+    """This method tests for codec: the fastest installed codec is selected by default."""
+    assert default_codec.name == installed_codecs()[0].name
+
+
+def test_utils_codec_unknown():
+    """This method tests for codec: unknown codec name."""
+    with pytest.raises(ValueError):
+        get_codec("simplejson")
+
+
+@pytest.mark.parametrize("name", ["simplejson", "ujson"], ids=["unknown", "not-installed"])
+def test_utils_codec_default_fallback(monkeypatch, name):
+    """
+    This method tests for codec: unavailable codec of env falls back to stdlib json with warning.
+
+    :param monkeypatch: pytest monkeypatch fixture
+    :param name: codec name of env
+    """
+    monkeypatch.setenv("ABLT_JSON_CODEC", name)
+    # Blocked module raises ImportError on import
+    monkeypatch.setitem(sys.modules, "ujson", None)
+    with pytest.warns(RuntimeWarning):
+        assert _get_default_codec().name == "json"
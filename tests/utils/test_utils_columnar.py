@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_columnar.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for columnar statistics.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.ablt_python_api.schemas import StatisticsSchema, StatisticTotalSchema
+from src.ablt_python_api.utils.columnar import StatisticsColumns
+from src.ablt_python_api.utils.statistics import STAT_FIELDS, sum_statistics
+
+
+def make_statistics(user_id: int, start: date, days: int) -> dict:
+    """
+    This function makes statistics like API does, some days are skipped.
+
+    :param user_id: id of the user, used as seed
+    :param start: start date
+    :param days: number of days
+    :return: statistics dict (StatisticsSchema)
+    """
+    rnd = random.Random(user_id)
+    items = [
+        {**{field: rnd.randint(0, 1000) for field in STAT_FIELDS}, "date": (start + timedelta(days=day)).isoformat()}
+        for day in range(days)
+        if rnd.random() > 0.2
+    ]
+    return {"total": sum_statistics(items), "items": items}
+
+
+@pytest.fixture(name="statistics_by_user")
+def statistics_by_user_fixture():
+    """
+    This fixture returns statistics of few users.
+
+    :return: statistics by user id
+    """
+    return {user_id: make_statistics(user_id, date(2023, 12, 20), 80) for user_id in (-1, 3, 42)}
+
+
+def naive_rollup(statistics_by_user: dict, key) -> dict:
+    """
+    This function sums items in loops over dicts.
+
+    :param statistics_by_user: statistics by user id
+    :param key: function to get key from user id and date
+    :return: totals by key
+    """
+    result: dict = {}
+    for user_id, statistics in statistics_by_user.items():
+        for item in statistics["items"]:
+            total = result.setdefault(key(user_id, date.fromisoformat(item["date"])), dict.fromkeys(STAT_FIELDS, 0))
+            for field in STAT_FIELDS:
+                total[field] += item[field]
+    return dict(sorted(result.items()))
+
+
+def get_backends() -> list:
+    """
+    This function returns available backends.
+
+    :return: backends
+    """
+    try:
+        import numpy  # pylint: disable=import-outside-toplevel,unused-import
+
+        return ["array", "numpy"]
+    except ImportError:
+        return ["array"]
+
+
+@pytest.mark.parametrize("backend", get_backends())
+def test_utils_columnar_rollups(statistics_by_user, backend):
+    """
+    This method tests for columnar statistics: rollups are the same as loops over dicts.
+
+    :param statistics_by_user: statistics fixture
+    :param backend: backend
+    """
+    columns = StatisticsColumns.from_users(statistics_by_user, backend=backend)
+    assert columns.backend == backend
+    assert len(columns) == sum(len(statistics["items"]) for statistics in statistics_by_user.values())
+    assert columns.users() == [-1, 3, 42]
+    expected_by_period = {
+        "day": lambda user_id, day: day.isoformat(),
+        "week": lambda user_id, day: (day - timedelta(days=day.weekday())).isoformat(),
+        "month": lambda user_id, day: day.strftime("%Y-%m"),
+        "user": lambda user_id, day: user_id,
+    }
+    for period, key in expected_by_period.items():
+        assert columns.rollup(period) == naive_rollup(statistics_by_user, key)
+        assert list(columns.rollup(period)) == list(naive_rollup(statistics_by_user, key))
+        assert columns.rollup(period, per_user=True) == naive_rollup(
+            statistics_by_user,
+            lambda user_id, day, key=key, period=period: user_id if period == "user" else (user_id, key(user_id, day)),
+        )
+    assert columns.total() == sum_statistics(item for stats in statistics_by_user.values() for item in stats["items"])
+    assert columns.total(42) == statistics_by_user[42]["total"]
+    assert columns.total(7) == dict.fromkeys(STAT_FIELDS, 0)
+    assert StatisticTotalSchema.model_validate(columns.rollup("month")["2024-01"])
+
+
+@pytest.mark.parametrize("backend", get_backends())
+def test_utils_columnar_moving_average_and_top_days(backend):
+    """
+    This method tests for columnar statistics: moving average fills gaps with zeros, top days are ordered.
+
+    :param backend: backend
+    """
+    items = [
+        {"total_tokens": tokens, "date": day}
+        for tokens, day in ((10, "2024-01-01"), (20, "2024-01-02"), (30, "2024-01-04"), (20, "2024-01-05"))
+    ]
+    columns = StatisticsColumns(backend).add({"items": items}, user_id=1).add({"items": items[:1]}, user_id=2)
+    assert columns.moving_average(window=2) == [
+        ("2024-01-02", 20.0),
+        ("2024-01-03", 10.0),
+        ("2024-01-04", 15.0),
+        ("2024-01-05", 25.0),
+    ]
+    assert columns.moving_average(window=3, user_id=2) == []
+    assert columns.moving_average(window=1, user_id=2) == [("2024-01-01", 10.0)]
+    assert columns.top_days(3) == [("2024-01-04", 30), ("2024-01-01", 20), ("2024-01-02", 20)]
+    assert columns.top_days(1, user_id=2) == [("2024-01-01", 10)]
+    assert not columns.top_days(1, user_id=3)
+    with pytest.raises(ValueError):
+        columns.moving_average(field="unknown")
+
+
+@pytest.mark.parametrize("backend", get_backends())
+def test_utils_columnar_schema_and_empty(backend):
+    """
+    This method tests for columnar statistics: pydantic models are accepted, empty columns.
+
+    :param backend: backend
+    """
+    statistics = make_statistics(1, date(2024, 2, 1), 10)
+    columns = StatisticsColumns.from_statistics(StatisticsSchema.model_validate(statistics), backend=backend)
+    assert columns.total() == statistics["total"]
+    assert list(columns.column("total_tokens")) == [item["total_tokens"] for item in statistics["items"]]
+    empty = StatisticsColumns(backend).add(None)
+    assert not empty.rollup("week") and not empty.top_days() and not empty.moving_average()
+    assert empty.total() == dict.fromkeys(STAT_FIELDS, 0)
+    with pytest.raises(ValueError):
+        empty.rollup("year")
+    with pytest.raises(ValueError):
+        StatisticsColumns("pandas")
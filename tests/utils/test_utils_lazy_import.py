@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_lazy_import.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for lazy import of package entry points.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import src.ablt_python_api as package
+from src.ablt_python_api import utils
+from src.ablt_python_api.ablt_api_async import ABLTApi as AsyncABLTApi
+from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.schemas import BotSchema
+from src.ablt_python_api.utils.statistics_store import StatisticsStore
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def loaded_modules(statement: str) -> set:
+    """
+    This method runs statement in fresh interpreter and returns loaded heavy modules.
+
+    :param statement: statement to run
+    :return: names of loaded modules
+    """
+    code = f"{statement}; import sys; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT / "src", capture_output=True, text=True, check=True
+    ).stdout
+    return set(output.split()) & {"aiohttp", "asyncio", "pydantic", "requests", "sqlite3"}
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("import ablt_python_api", set()),
+        ("import ablt_python_api.utils", set()),
+        ("from ablt_python_api import ABLTApi", {"requests"}),
+        ("from ablt_python_api import ABLTApi_async", {"aiohttp", "asyncio"}),
+        ("from ablt_python_api import BotSchema", {"pydantic"}),
+        ("from ablt_python_api import StatisticsStore", set()),
+        ("from ablt_python_api.utils import StatisticsCache", set()),
+    ],
+)
+def test_utils_lazy_import_loaded_modules(statement, expected):
+    """This method tests for lazy import: entry point loads only modules it needs."""
+    assert loaded_modules(statement) == expected
+
+
+def test_utils_lazy_import_resolves_names():
+    """This method tests for lazy import: public names are the same objects as in submodules."""
+    assert package.ABLTApi is ABLTApi
+    assert package.ABLTApi_async is AsyncABLTApi
+    assert package.BotSchema is BotSchema
+    assert "ABLTApi" in dir(package)
+    assert utils.StatisticsStore is StatisticsStore
+    assert "StatisticsStore" in dir(utils)
+
+
+def test_utils_lazy_import_unknown_name():
+    """This method tests for lazy import: unknown name raises AttributeError."""
+    with pytest.raises(AttributeError):
+        package.UnknownName  # pylint: disable=pointless-statement
+    assert not hasattr(package, "UnknownName")
+    assert not hasattr(utils, "UnknownName")
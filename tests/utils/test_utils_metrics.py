@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_metrics.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for metrics registry and metrics of API wrappers.
+"""
+
+import logging
+
+import pytest
+
+from src.ablt_python_api.ablt_api_async import ABLTApi as AsyncABLTApi
+from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.pytest_plugin import MOCK_BEARER_TOKEN
+from src.ablt_python_api.utils.metrics import MetricsRegistry
+from src.ablt_python_api.utils.request_trace import RequestTracer
+from src.ablt_python_api.utils.retry import RetryPolicy
+
+LOGGER = logging.getLogger("test")
+
+
+def test_utils_metrics_render():
+    """This method tests for metrics registry: Prometheus text format."""
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("endpoint",)).inc(labels=('/v1/"chat"\n',))
+    gauge = registry.gauge("in_flight", "In flight")
+    gauge.inc(3)
+    gauge.dec()
+    histogram = registry.histogram("duration_seconds", "Duration", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{endpoint="/v1/\\"chat\\"\\n"} 1\n'
+        "# HELP in_flight In flight\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 2\n"
+        "# HELP duration_seconds Duration\n"
+        "# TYPE duration_seconds histogram\n"
+        'duration_seconds_bucket{le="0.1"} 1\n'
+        'duration_seconds_bucket{le="1"} 2\n'
+        'duration_seconds_bucket{le="+Inf"} 3\n'
+        "duration_seconds_sum 5.55\n"
+        "duration_seconds_count 3\n"
+    )
+    assert MetricsRegistry().render() == ""
+
+
+def test_utils_metrics_snapshot():
+    """This method tests for metrics registry: dict snapshot."""
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("status",)).inc(2, ("200",))
+    registry.histogram("events", "Events", buckets=(10,)).observe(3)
+    assert registry.snapshot() == {
+        "requests_total": {
+            "type": "counter",
+            "help": "Requests",
+            "values": [{"labels": {"status": "200"}, "value": 2}],
+        },
+        "events": {
+            "type": "histogram",
+            "help": "Events",
+            "values": [{"labels": {}, "value": {"buckets": {"10": 1, "+Inf": 1}, "sum": 3, "count": 1}}],
+        },
+    }
+
+
+def test_utils_metrics_registration():
+    """This method tests for metrics registry: metrics are shared by name, conflicts and wrong labels are errors."""
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("status",))
+    assert registry.counter("requests_total", "Requests", ("status",)) is counter
+    assert registry.get("requests_total") is counter and registry.get("other") is None
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests", ("status",))
+    with pytest.raises(ValueError):
+        registry.counter("requests_total", "Requests", ("endpoint",))
+    with pytest.raises(ValueError):
+        counter.inc(labels=("200", "extra"))
+    with pytest.raises(ValueError):
+        counter.inc(-1, ("200",))
+    with pytest.raises(ValueError):
+        registry.counter("requests-total", "Requests")
+    with pytest.raises(ValueError):
+        registry.histogram("duration_seconds", "Duration", buckets=(1, 0.1))
+    registry.gauge("size", "Size").set(5)
+    assert registry.get("size").get() == 5 and counter.get(("200",)) == 0
+    assert registry.histogram("duration_seconds", "Duration").get() is None
+
+
+def test_utils_metrics_sync_api(mock_server):
+    """This method tests for metrics: requests, connections and chat streams of sync API wrapper."""
+    registry = MetricsRegistry()
+    tracer = RequestTracer()
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=LOGGER, tracer=tracer, metrics=registry
+    ) as api:
+        list(api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False, max_words=5))
+        list(api.chat(bot_slug="unknown", prompt="Hi!"))
+        # Rejected before sending, it's observed without request
+        list(api.chat(bot_slug="mock-bot-0"))
+        api.get_bots()
+    requests = registry.get("ablt_requests_total")
+    assert requests.get(("GET", "/health-check", "200")) == 1
+    assert requests.get(("POST", "/v1/chat", "200")) == 1
+    assert requests.get(("POST", "/v1/chat", "404")) == 1
+    assert requests.get(("GET", "/v1/bots", "200")) == 1
+    assert registry.get("ablt_requests_in_flight").get() == 0
+    assert sum(value["value"] for value in registry.snapshot()["ablt_connections_total"]["values"]) == 4
+    assert len(tracer.traces) == 4
+    snapshot = registry.snapshot()
+    assert snapshot["ablt_stream_events"]["values"][0]["value"]["sum"] == 6
+    assert snapshot["ablt_stream_duration_seconds"]["values"][0]["value"]["count"] == 3
+    assert snapshot["ablt_stream_time_to_first_token_seconds"]["values"][0]["value"]["count"] == 1
+    assert 'ablt_requests_total{method="GET",endpoint="/v1/bots",status="200"} 1' in registry.render()
+
+
+def test_utils_metrics_sync_retries(mock_server):
+    """This method tests for metrics: retries of health check and errors by type."""
+    registry = MetricsRegistry()
+    mock_server.error_rate = 1
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN,
+        base_api_url=mock_server.url,
+        logger=LOGGER,
+        retry_policy=RetryPolicy(max_attempts=3, initial_delay=0.01, jitter=0),
+        lazy=True,
+        metrics=registry,
+    ) as api:
+        with pytest.raises(ConnectionError):
+            api.update_api()
+    assert registry.get("ablt_retries_total").get(("health_check",)) == 2
+    assert registry.get("ablt_requests_total").get(("GET", "/health-check", "500")) == 3
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url="http://127.0.0.1:1", logger=LOGGER, lazy=True, metrics=registry
+    ) as api:
+        assert not api.health_check()
+    assert registry.get("ablt_errors_total").get(("ConnectionError",)) == 1
+    assert registry.get("ablt_requests_total").get(("GET", "/health-check", "error")) == 1
+
+
+def test_utils_metrics_shared_tracer(mock_server):
+    """This method tests for metrics: API wrappers sharing tracer and registry count each request once."""
+    registry = MetricsRegistry()
+    tracer = RequestTracer()
+    params = {
+        "bearer_token": MOCK_BEARER_TOKEN,
+        "base_api_url": mock_server.url,
+        "logger": LOGGER,
+        "tracer": tracer,
+        "metrics": registry,
+        "lazy": True,
+    }
+    with ABLTApi(**params) as first, ABLTApi(**params) as second:
+        assert len(tracer.listeners) == 1
+        first.get_bots()
+        second.get_bots()
+    # Re-created API wrapper doesn't leave listener of the closed one
+    with ABLTApi(**params) as api:
+        api.get_bots()
+    assert registry.get("ablt_requests_total").get(("GET", "/v1/bots", "200")) == 3
+    assert not tracer.listeners
+    # Listeners of other registries are kept apart
+    other = RequestTracer()
+    for metrics in (registry, MetricsRegistry()):
+        ABLTApi(**{**params, "tracer": other, "metrics": metrics})
+    assert len(other.listeners) == 2
+
+
+@pytest.mark.asyncio
+async def test_utils_metrics_async_api(mock_server):
+    """This method tests for metrics: requests and chat streams of async API wrapper."""
+    registry = MetricsRegistry()
+    finished = []
+    async with AsyncABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=LOGGER, lazy=True, metrics=registry
+    ) as api:
+        stream = api.chat(
+            bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False, on_finish=finished.append
+        )
+        async for _ in stream:
+            pass
+    assert finished == [stream]
+    requests = registry.get("ablt_requests_total")
+    assert requests.get(("GET", "/health-check", "200")) == requests.get(("POST", "/v1/chat", "200")) == 1
+    assert registry.get("ablt_connections_total").get(("true",)) == 1
+    assert registry.get("ablt_requests_in_flight").get() == 0
+    assert registry.snapshot()["ablt_stream_events"]["values"][0]["value"]["sum"] == 21
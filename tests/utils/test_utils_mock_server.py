@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_mock_server.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for local mock of aBLT API with both API wrappers.
+"""
+
+import asyncio
+import logging
+from logging import ERROR
+from time import perf_counter
+
+import pytest
+
+from src.ablt_python_api.ablt_api_async import ABLTApi as AsyncABLTApi
+from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.mock_server import MockABLTServer
+from src.ablt_python_api.pytest_plugin import MOCK_BEARER_TOKEN
+from src.ablt_python_api.utils.bot_cache import BotCache
+from src.ablt_python_api.utils.statistics_cache import StatisticsCache
+from src.ablt_python_api.utils.statistics_store import StatisticsStore
+from src.ablt_python_api.utils.statistics import sum_statistics
+
+
+def test_utils_mock_server_health_and_bots(mock_api, mock_server):
+    """This method tests for mock server: health check and bot catalog with ETag revalidation."""
+    assert mock_api.health_check()
+    bots = mock_api.get_bots()
+    assert len(bots) == 10
+    assert mock_api.find_bot_by_slug("mock-bot-3")["uid"] == "mock-uid-3"
+    mock_api.invalidate_bots()
+    assert mock_api.get_bots() == bots
+    assert mock_server.requests["/v1/bots"] >= 1
+
+
+def test_utils_mock_server_bot_cache_disabled(mock_server):
+    """This method tests for mock server: catalog is downloaded on each request if bot cache is disabled."""
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN,
+        base_api_url=mock_server.url,
+        logger=logging.getLogger("test"),
+        lazy=True,
+        bot_cache=BotCache(ttl=0),
+    ) as api:
+        for _ in range(3):
+            assert len(api.get_bots()) == 10
+    assert mock_server.requests["/v1/bots"] == 3
+
+
+@pytest.mark.parametrize("chunk_size", [None, 3], ids=["whole-events", "fragmented"])
+def test_utils_mock_server_chat_stream(mock_api, mock_server, chunk_size):
+    """This method tests for mock server: streaming chat, events may be split across network chunks."""
+    mock_server.chunk_size = chunk_size
+    chat_stream = mock_api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False)
+    assert "".join(chat_stream) == " ".join(f"word{number}" for number in range(20))
+    assert chat_stream.done
+    assert chat_stream.messages == 20
+    assert chat_stream.chunks > 20 if chunk_size else chat_stream.chunks >= 1
+
+
+def test_utils_mock_server_chat_not_stream(mock_api):
+    """This method tests for mock server: chat response in JSON, 'max_words' limits the response."""
+    response = list(mock_api.chat(bot_uid="mock-uid-1", prompt="Hi!", max_words=3))
+    assert response == ["word0 word1 word2"]
+
+
+def test_utils_mock_server_token_rate(mock_api, mock_server):
+    """This method tests for mock server: streamed words are paced by token rate."""
+    mock_server.response_words, mock_server.token_rate = 5, 50
+    started_at = perf_counter()
+    assert len(list(mock_api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False))) == 5
+    assert perf_counter() - started_at >= 5 / 50
+
+
+def test_utils_mock_server_stream_timing(mock_api, mock_server):
+    """This method tests for mock server: timing of stream follows token rate of the server."""
+    mock_server.token_rate = 100
+    finished = []
+    stream = mock_api.chat(
+        bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False, on_finish=finished.append
+    )
+    assert len(list(stream)) == 20
+    metrics = finished[0].metrics()
+    assert metrics["time_to_headers"] < metrics["time_to_first_token"]
+    assert metrics["gap_mean"] >= 0.008
+    assert 50 < metrics["tokens_per_second"] <= 125
+    assert metrics["events"] == 21
+
+
+def test_utils_mock_server_unknown_bot(mock_api, caplog):
+    """This method tests for mock server: unknown bot is reported by API wrapper."""
+    with caplog.at_level(ERROR):
+        assert not list(mock_api.chat(bot_slug="unknown", prompt="Hi!"))
+    assert "Bot not found" in caplog.text
+
+
+def test_utils_mock_server_errors(mock_api, mock_server, caplog):
+    """This method tests for mock server: error responses with configured status."""
+    mock_server.error_rate, mock_server.error_status = 1.0, 503
+    with caplog.at_level(ERROR):
+        assert not list(mock_api.chat(bot_slug="mock-bot-0", prompt="Hi!"))
+    assert "503" in caplog.text and "x-request-id" in caplog.text
+
+
+def test_utils_mock_server_latency(mock_api, mock_server):
+    """This method tests for mock server: each response is delayed by latency."""
+    mock_server.latency = 0.05
+    started_at = perf_counter()
+    assert mock_api.health_check()
+    assert perf_counter() - started_at >= 0.05
+
+
+def test_utils_mock_server_wrong_token(mock_server):
+    """This method tests for mock server: requests with other token are rejected."""
+    with ABLTApi(
+        bearer_token="wrong", base_api_url=mock_server.url, logger=logging.getLogger("test"), lazy=True
+    ) as api:
+        assert not api.health_check()
+
+
+def test_utils_mock_server_statistics(mock_api):
+    """This method tests for mock server: statistics for each day of the range with total."""
+    statistics = mock_api.get_usage_statistics(user_id=42, start_date="2024-01-01", end_date="2024-01-31")
+    assert len(statistics["items"]) == 31
+    assert statistics["total"] == sum_statistics(statistics["items"])
+    assert mock_api.get_statistics_for_a_day(date="2024-01-05", user_id=42) == statistics["items"][4]
+
+
+def test_utils_mock_server_statistics_cache_scopes(mock_server, tmp_path):
+    """
+    This method tests for mock server: shared statistics cache keeps statistics of each API apart.
+
+    :param mock_server: mock server
+    :param tmp_path: pytest tmp_path fixture
+    """
+    cache = StatisticsCache(str(tmp_path / "statistics.db"))
+    other_url = mock_server.url.replace("127.0.0.1", "localhost")
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN,
+        base_api_url=mock_server.url,
+        logger=logging.getLogger("test"),
+        lazy=True,
+        statistics_cache=cache,
+    ) as api:
+        for base_api_url in (mock_server.url, other_url, mock_server.url):
+            api.set_base_api_url(base_api_url)
+            assert len(api.get_usage_statistics(start_date="2024-01-01", end_date="2024-01-02")["items"]) == 2
+    # The first API is served from cache after switch back
+    assert mock_server.requests["/v1/user/usage-statistics"] == 2
+    cache.close()
+
+
+def test_utils_mock_server_statistics_store_scopes(mock_server):
+    """This method tests for mock server: shared statistics store keeps watermarks of each API apart."""
+    store = StatisticsStore()
+    other_url = mock_server.url.replace("127.0.0.1", "localhost")
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=logging.getLogger("test"), lazy=True
+    ) as api:
+        assert api.sync_usage_statistics(store, start_date="2024-01-01") is not None
+        api.set_base_api_url(other_url)
+        # Other API isn't synced yet, so its sync starts from its own start date
+        assert api.sync_usage_statistics(store, start_date="2024-02-01") is not None
+    scopes = [StatisticsStore.scope_of(MOCK_BEARER_TOKEN, url) for url in (mock_server.url, other_url)]
+    assert [store.get_usage_statistics(scope=scope)["items"][0]["date"] for scope in scopes] == [
+        "2024-01-01",
+        "2024-02-01",
+    ]
+    assert store.get_watermark(-1, scopes[0]) == store.get_watermark(-1, scopes[1])
+    store.close()
+
+
+def test_utils_mock_server_payload_size():
+    """This method tests for mock server: size of bot catalog is configurable."""
+    server = MockABLTServer(bots=100, description_size=1000)
+    assert len(server.bots) == 100
+    assert all(len(bot["description"]) == 1000 for bot in server.bots)
+
+
+def test_utils_mock_server_start_twice(mock_server):
+    """This method tests for mock server: started server can't be started again."""
+    with pytest.raises(RuntimeError):
+        mock_server.start()
+
+
+@pytest.mark.asyncio
+async def test_utils_mock_server_async_chat(mock_server):
+    """This method tests for mock server: async API wrapper, streaming and JSON chat."""
+    mock_server.chunk_size = 7
+    async with AsyncABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=logging.getLogger("test"), lazy=True
+    ) as api:
+        stream = api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False, timing=True)
+        assert len([message async for message in stream]) == 20
+        assert len(stream.gaps) == 19 and stream.time_to_first_token >= stream.time_to_headers
+        assert [message async for message in api.chat(bot_slug="mock-bot-0", prompt="Hi!", max_words=2)] == [
+            "word0 word1"
+        ]
+        assert len(await api.get_bots()) == 10
+
+
+def test_utils_mock_server_async_loops(mock_server):
+    """This method tests for mock server: each event loop gets own session of async API wrapper and closes it."""
+    api = AsyncABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=logging.getLogger("test"), lazy=True
+    )
+    sessions = {}
+
+    async def check_health(name: str, close: bool = False):
+        """
+        This function checks API health and keeps sessions of the API.
+
+        :param name: name of the loop
+        :param close: close the API after the check
+        """
+        assert await api.health_check()
+        sessions[name] = dict(api._ABLTApi__sessions)  # pylint: disable=protected-access
+        if close:
+            await api.aclose()
+
+    other_loop = asyncio.new_event_loop()
+    try:
+        other_loop.run_until_complete(check_health("other"))
+        asyncio.run(check_health("run", close=True))
+        # Session of other loop isn't touched by other loops
+        (other_session,) = sessions["other"].values()
+        assert not other_session.closed and len(sessions["run"]) == 2
+        assert all(session.closed for loop, session in sessions["run"].items() if loop is not other_loop)
+        other_loop.run_until_complete(api.aclose())
+        assert other_session.closed
+        assert not api._ABLTApi__sessions  # pylint: disable=protected-access
+    finally:
+        other_loop.close()
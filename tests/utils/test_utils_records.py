@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_records.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for lightweight records of bots, statistics items and chat chunks.
+"""
+
+import copy
+import pickle
+from datetime import date
+
+import pytest
+
+from src.ablt_python_api.records import BotRecord, ChatChunk, StatisticItemRecord
+from src.ablt_python_api.schemas import BotSchema, ChatChunkSchema, StatisticItemSchema
+from src.ablt_python_api.utils.columnar import StatisticsColumns
+from src.ablt_python_api.utils.statistics import STAT_FIELDS
+from src.ablt_python_api.utils.stream import AsyncChatStream, ChatStream
+
+BOT = {
+    "uid": "1",
+    "slug": "bot-1",
+    "model": "gpt-4",
+    "name": "Bot 1",
+    "description": "Bot",
+    "welcome_message": "Hi!",
+    "avatar_url": None,
+}
+ITEM = {**{field: number for number, field in enumerate(STAT_FIELDS)}, "date": "2024-01-02"}
+
+
+def test_utils_records_bot_round_trip():
+    """This method tests for bot record: conversion from/to dict and model."""
+    record = BotRecord.from_dict(BOT)
+    assert record.to_dict() == BOT
+    model = record.to_model()
+    assert isinstance(model, BotSchema)
+    assert model == BotSchema.model_validate(BOT)
+    assert BotRecord.from_model(model) == record
+
+
+def test_utils_records_statistic_item_round_trip():
+    """This method tests for statistic item record: date is parsed and formatted back."""
+    record = StatisticItemRecord.from_dict(ITEM)
+    assert record.date == date(2024, 1, 2)
+    assert record.to_dict() == ITEM
+    model = record.to_model()
+    assert model == StatisticItemSchema.model_validate(ITEM)
+    assert StatisticItemRecord.from_model(model) == record
+
+
+def test_utils_records_statistic_item_missing_counters():
+    """This method tests for statistic item record: missing counters are 0."""
+    record = StatisticItemRecord.from_dict({"date": "2024-01-02"})
+    assert record.total_tokens == 0
+    assert tuple(record)[:-1] == (0,) * len(STAT_FIELDS)
+
+
+def test_utils_records_statistic_item_missing_date():
+    """This method tests for statistic item record: missing date is kept as None."""
+    record = StatisticItemRecord.from_dict({"total_tokens": 3})
+    assert record.date is None
+    assert record.to_dict() == {**dict.fromkeys(STAT_FIELDS, 0), "total_tokens": 3, "date": None}
+
+
+def test_utils_records_conversion_shares_values():
+    """This method tests for records: values are shared with model, not copied."""
+    model = BotSchema.model_validate(BOT)
+    record = BotRecord.from_model(model)
+    assert record.name is model.name
+    assert record.to_model().name is model.name
+
+
+def test_utils_records_no_dict():
+    """This method tests for records: no per-instance dict, unknown attributes can't be set."""
+    record = ChatChunk(0, "Hello")
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        # Attribute name is dynamic, so linters don't report assignment, which is expected to fail
+        setattr(record, "unknown", 1)
+
+
+def test_utils_records_equality_and_hash():
+    """This method tests for records: equality by values and type, hash by values."""
+    assert ChatChunk(0, "Hello", 0.5) == ChatChunk(0, "Hello", 0.5)
+    assert ChatChunk(0, "Hello", 0.5) != ChatChunk(1, "Hello", 0.5)
+    assert ChatChunk(0, "Hello") != (0, "Hello", 0.0)
+    assert len({ChatChunk(0, "Hello"), ChatChunk(0, "Hello")}) == 1
+    index, content, elapsed = ChatChunk(0, "Hello", 0.5)
+    assert (index, content, elapsed) == (0, "Hello", 0.5)
+
+
+def test_utils_records_pickle_and_copy():
+    """This method tests for records: pickle and copy keep values."""
+    record = StatisticItemRecord.from_dict(ITEM)
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert copy.copy(record) == record
+    assert copy.deepcopy(record) == record
+
+
+def test_utils_records_repr():
+    """This method tests for records: representation lists fields."""
+    assert repr(ChatChunk(0, "Hi", 0.5)) == "ChatChunk(index=0, content='Hi', elapsed=0.5)"
+
+
+def test_utils_records_chat_chunk_model():
+    """This method tests for chat chunk: conversion to schema."""
+    assert ChatChunk(1, "Hi", 0.5).to_model() == ChatChunkSchema(index=1, content="Hi", elapsed=0.5)
+
+
+def test_utils_records_columnar():
+    """This method tests for records: statistics columns accept records."""
+    records = StatisticsColumns()
+    records.add([StatisticItemRecord.from_dict(ITEM)], user_id=1)
+    dicts = StatisticsColumns()
+    dicts.add([ITEM], user_id=1)
+    assert records.total() == dicts.total()
+
+
+def test_utils_records_stream_chunks():
+    """This method tests for chat stream: messages as chunks with number and arrival time."""
+    chat_stream = ChatStream(raise_on_done=False)
+    chunks = list(chat_stream.attach(iter(["Hello", " world"])).iter_chunks())
+    assert [(chunk.index, chunk.content) for chunk in chunks] == [(0, "Hello"), (1, " world")]
+    assert 0 <= chunks[0].elapsed <= chunks[1].elapsed
+
+
+@pytest.mark.asyncio
+async def test_utils_records_async_stream_chunks():
+    """This method tests for async chat stream: messages as chunks with number and arrival time."""
+
+    async def source():
+        for message in ("Hello", " world"):
+            yield message
+
+    chat_stream = AsyncChatStream(raise_on_done=False)
+    chunks = [chunk async for chunk in chat_stream.attach(source()).aiter_chunks()]
+    assert [(chunk.index, chunk.content) for chunk in chunks] == [(0, "Hello"), (1, " world")]
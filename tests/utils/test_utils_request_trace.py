@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_request_trace.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for per-request timing breakdown.
+"""
+
+import logging
+
+import pytest
+
+from src.ablt_python_api.ablt_api_async import ABLTApi as AsyncABLTApi
+from src.ablt_python_api.ablt_api_sync import ABLTApi
+from src.ablt_python_api.pytest_plugin import MOCK_BEARER_TOKEN
+from src.ablt_python_api.utils.request_trace import TRACE_FIELDS, RequestTrace, RequestTracer
+
+LOGGER = logging.getLogger("test")
+PATHS = ["/health-check", "/v1/chat", "/v1/chat", "/v1/bots", "/v1/user/usage-statistics"]
+
+
+def check_traces(tracer, url):
+    """
+    This method checks traces of requests made to mock server.
+
+    :param tracer: tracer
+    :param url: base API URL of mock server
+    """
+    assert [trace.url for trace in tracer.traces] == [url + path for path in PATHS]
+    assert [trace.method for trace in tracer.traces] == ["GET", "POST", "POST", "GET", "POST"]
+    for trace in tracer.traces:
+        assert trace.status == 200 and trace.error is None
+        assert len(trace.request_id) == 32
+        assert 0 <= trace.acquire <= trace.headers <= trace.total
+        assert trace.body == pytest.approx(trace.total - trace.headers)
+    first = tracer.traces[0]
+    assert first.reused is False and first.connect >= 0
+    assert tracer.traces[-1].reused is True and tracer.traces[-1].connect is None
+
+
+def test_utils_request_trace_sync(mock_server):
+    """This method tests for request trace: each request of sync API wrapper is traced."""
+    mock_server.token_rate = 200
+    tracer = RequestTracer()
+    with ABLTApi(bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=LOGGER, tracer=tracer) as api:
+        list(api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False, max_words=5))
+        list(api.chat(bot_slug="mock-bot-0", prompt="Hi!"))
+        api.get_bots()
+        api.get_usage_statistics(start_date="2024-01-01", end_date="2024-01-02")
+    check_traces(tracer, mock_server.url)
+    # Streamed words are read after headers
+    assert tracer.traces[1].body >= 0.02
+
+
+def test_utils_request_trace_sync_error():
+    """This method tests for request trace: failed request of sync API wrapper is traced with error."""
+    tracer = RequestTracer()
+    with ABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url="http://127.0.0.1:1", logger=LOGGER, tracer=tracer, lazy=True
+    ) as api:
+        assert not api.health_check()
+    (trace,) = tracer.traces
+    assert (trace.error, trace.status, trace.headers, trace.reused) == ("ConnectionError", None, None, False)
+
+
+@pytest.mark.asyncio
+async def test_utils_request_trace_async(mock_server):
+    """This method tests for request trace: each request of async API wrapper is traced, errors too."""
+    mock_server.token_rate = 200
+    tracer = RequestTracer()
+    async with AsyncABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url=mock_server.url, logger=LOGGER, tracer=tracer, lazy=True
+    ) as api:
+        async for _ in api.chat(bot_slug="mock-bot-0", prompt="Hi!", stream=True, raise_on_done=False, max_words=5):
+            pass
+        async for _ in api.chat(bot_slug="mock-bot-0", prompt="Hi!"):
+            pass
+        await api.get_bots()
+        await api.get_usage_statistics(start_date="2024-01-01", end_date="2024-01-02")
+    check_traces(tracer, mock_server.url)
+    assert tracer.traces[1].body >= 0.02
+    tracer.clear()
+    async with AsyncABLTApi(
+        bearer_token=MOCK_BEARER_TOKEN, base_api_url="http://127.0.0.1:1", logger=LOGGER, tracer=tracer, lazy=True
+    ) as api:
+        assert not await api.health_check()
+    assert tracer.traces[0].error == "ClientConnectorError"
+
+
+def test_utils_request_trace_callback():
+    """This method tests for request trace: callback gets each trace once, only the latest traces are kept."""
+    traces = []
+    tracer = RequestTracer(on_trace=traces.append, max_traces=2)
+    for number in range(3):
+        trace = tracer.start("GET", f"http://localhost/{number}")
+        trace.headers = 0.0
+        tracer.finish(trace)
+        tracer.finish(trace, ValueError())
+    assert [trace.url for trace in traces] == [f"http://localhost/{number}" for number in range(3)]
+    assert [event["url"] for event in tracer.events()] == ["http://localhost/1", "http://localhost/2"]
+    assert list(tracer.events()[0]) == list(TRACE_FIELDS)
+    assert traces[0].error is None and traces[0].body == traces[0].total
+    assert "http://localhost/0" in repr(traces[0])
+
+
+def test_utils_request_trace_wrong_max_traces():
+    """This method tests for request trace: number of kept traces can't be negative."""
+    with pytest.raises(ValueError):
+        RequestTracer(max_traces=-1)
+    assert isinstance(RequestTracer().start("GET", "http://localhost"), RequestTrace)
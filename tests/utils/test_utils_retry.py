@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_retry.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for retry policy.
+"""
+
+import pytest
+
+from src.ablt_python_api.utils.retry import RetryPolicy
+
+
+def test_utils_retry_exponential_delays():
+    """This method tests for retry policy: exponential delays without jitter are capped by max delay."""
+    policy = RetryPolicy(max_attempts=6, initial_delay=1, max_delay=5, multiplier=2, jitter=0, max_total_wait=100)
+    assert list(policy.delays()) == [1, 2, 4, 5, 5]
+
+
+def test_utils_retry_max_total_wait():
+    """This method tests for retry policy: total wait is limited by max total wait."""
+    policy = RetryPolicy(max_attempts=100, initial_delay=1, max_delay=5, jitter=0, max_total_wait=10)
+    delays = list(policy.delays())
+    assert sum(delays) == 10
+    assert delays == [1, 2, 4, 3]
+
+
+def test_utils_retry_jitter():
+    """This method tests for retry policy: jitter never exceeds backoff delay."""
+    policy = RetryPolicy(initial_delay=2, max_delay=2, jitter=1)
+    for retry in range(1, 100):
+        assert 0 <= policy.get_delay(retry) <= 2
+
+
+def test_utils_retry_single_attempt():
+    """This method tests for retry policy: single attempt means no retries."""
+    assert not list(RetryPolicy(max_attempts=1).delays())
+
+
+@pytest.mark.parametrize("params", [{"max_attempts": 0}, {"jitter": -0.1}, {"jitter": 1.1}])
+def test_utils_retry_invalid_params(params):
+    """
+    This method tests for retry policy: invalid params.
+
+    :param params: params for retry policy
+    """
+    with pytest.raises(ValueError):
+        RetryPolicy(**params)
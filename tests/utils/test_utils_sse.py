@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_sse.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for server-sent events decoder.
+"""
+
+import pytest
+
+from src.ablt_python_api.utils.sse import SSEDecoder, iter_events
+
+STREAM = (
+    ": keep-alive comment\r\n"
+    'data: {"content": "Привет"}\r\n\r\n'
+    "event: update\n"
+    "id: 42\n"
+    "retry: 1000\n"
+    'data: {"content":\n'
+    'data: " world"}\n\n'
+    "data: [DONE]\n\n"
+).encode("utf-8")
+
+
+def decode(chunks):
+    """
+    This method decodes chunks and returns tuples for events.
+
+    :param chunks: chunks of the stream
+    :return: list of tuples (event, data, id, retry)
+    """
+    return [(event.event, event.data, event.id, event.retry) for event in iter_events(chunks)]
+
+
+EXPECTED = [
+    ("message", '{"content": "Привет"}', "", None),
+    ("update", '{"content":\n" world"}', "42", 1000),
+    ("message", "[DONE]", "42", 1000),
+]
+
+
+def test_utils_sse_single_chunk():
+    """This method tests for sse decoder: whole stream in single chunk."""
+    assert decode([STREAM]) == EXPECTED
+
+
+@pytest.mark.parametrize("split", range(1, len(STREAM)))
+def test_utils_sse_split_chunks(split):
+    """
+    This method tests for sse decoder: stream split at any position (inside lines, CRLF, multibyte chars).
+
+    :param split: split position
+    """
+    assert decode([STREAM[:split], STREAM[split:]]) == EXPECTED
+
+
+def test_utils_sse_byte_by_byte():
+    """This method tests for sse decoder: stream fed byte by byte."""
+    assert decode([STREAM[i : i + 1] for i in range(len(STREAM))]) == EXPECTED
+
+
+def test_utils_sse_flush_without_blank_line():
+    """This method tests for sse decoder: last event without trailing blank line is dispatched on flush."""
+    decoder = SSEDecoder()
+    assert not decoder.feed(b"data: tail")
+    assert [event.data for event in decoder.flush()] == ["tail"]
+    assert not decoder.flush()
+
+
+def test_utils_sse_event_without_data():
+    """This method tests for sse decoder: event without data is not dispatched."""
+    assert not decode([b"event: ping\n\nid: 1\n\n"])
+
+
+@pytest.mark.parametrize("split_data, expected", [(False, ["a\nb", "c"]), (True, ["a", "b", "c"])])
+def test_utils_sse_split_data(split_data, expected):
+    """
+    This method tests for sse decoder: data lines are joined till blank line or dispatched one by one.
+
+    :param split_data: dispatch each data line as separate event
+    :param expected: data of events
+    """
+    stream = b"data: a\r\ndata: b\r\n\r\nevent: update\r\ndata: c\r\n"
+    for split in range(1, len(stream)):
+        events = list(iter_events([stream[:split], stream[split:]], split_data=split_data))
+        assert [event.data for event in events] == expected
+        assert events[-1].event == "update"
+
+
+def test_utils_sse_long_line():
+    """This method tests for sse decoder: long line split into many chunks is buffered till its end."""
+    decoder = SSEDecoder()
+    assert not decoder.feed(b"data: ")
+    for _ in range(1000):
+        assert not decoder.feed(b"x" * 100)
+    assert not decoder.feed(b"\r")
+    (event,) = decoder.feed(b"\n\n")
+    assert event.data == "x" * 100000
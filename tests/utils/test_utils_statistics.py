@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_statistics.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for statistics helpers.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.ablt_python_api.schemas import StatisticsSchema
+from src.ablt_python_api.utils.statistics import STAT_FIELDS, merge_statistics, split_date_range, sum_statistics
+
+
+def make_statistics(start_date: str, end_date: str) -> dict:
+    """
+    This function makes statistics like API does.
+
+    :param start_date: start date
+    :param end_date: end date
+    :return: statistics dict (StatisticsSchema)
+    """
+    day, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    items = []
+    while day <= end:
+        items.append({**{field: day.day + index for index, field in enumerate(STAT_FIELDS)}, "date": day.isoformat()})
+        day += timedelta(days=1)
+    return {"total": sum_statistics(items), "items": items}
+
+
+@pytest.mark.parametrize(
+    "window, expected",
+    [
+        ("week", [("2024-02-26", "2024-03-03"), ("2024-03-04", "2024-03-10"), ("2024-03-11", "2024-03-12")]),
+        ("month", [("2024-02-26", "2024-02-29"), ("2024-03-01", "2024-03-12")]),
+        (10, [("2024-02-26", "2024-03-06"), ("2024-03-07", "2024-03-12")]),
+        (100, [("2024-02-26", "2024-03-12")]),
+    ],
+)
+def test_utils_statistics_split_date_range(window, expected):
+    """
+    This method tests for statistics: date range is split into calendar windows.
+
+    :param window: window
+    :param expected: expected ranges
+    """
+    assert split_date_range("2024-02-26", "2024-03-12", window) == expected
+
+
+def test_utils_statistics_split_date_range_edge_cases():
+    """This method tests for statistics: single day, reversed range, year end and invalid params."""
+    assert split_date_range("2024-12-31", "2024-12-31", "month") == [("2024-12-31", "2024-12-31")]
+    assert split_date_range("2024-12-30", "2025-01-02", "month") == [
+        ("2024-12-30", "2024-12-31"),
+        ("2025-01-01", "2025-01-02"),
+    ]
+    assert not split_date_range("2024-03-12", "2024-02-26", "week")
+    for window in ("year", 0):
+        with pytest.raises(ValueError):
+            split_date_range("2024-02-26", "2024-03-12", window)
+    with pytest.raises(ValueError):
+        split_date_range("bad_start_date", "2024-03-12", "week")
+
+
+def test_utils_statistics_merge():
+    """This method tests for statistics: merged windows are equal to the whole range."""
+    whole = make_statistics("2023-01-01", "2024-12-31")
+    parts = [make_statistics(*dates) for dates in split_date_range("2023-01-01", "2024-12-31", "month")]
+    merged = merge_statistics(reversed(parts))
+    assert merged == whole
+    assert StatisticsSchema.model_validate(merged)
+
+
+def test_utils_statistics_merge_missing_part():
+    """This method tests for statistics: merge fails if any window failed."""
+    assert merge_statistics([make_statistics("2024-01-01", "2024-01-07"), None]) is None
+    assert merge_statistics([]) == {"total": dict.fromkeys(STAT_FIELDS, 0), "items": []}
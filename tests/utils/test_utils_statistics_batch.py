@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_statistics_batch.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for concurrent fetching of statistics for many users.
+"""
+
+import asyncio
+import random
+import threading
+from time import sleep
+
+import pytest
+
+from src.ablt_python_api.utils.statistics import STAT_FIELDS
+from src.ablt_python_api.utils.statistics_batch import AsyncStatisticsBatch, StatisticsBatch
+
+
+def make_statistics(user_id: int):
+    """
+    This function makes statistics of the user: failed users are multiples of 10, None for multiples of 7.
+
+    :param user_id: id of the user
+    :return: statistics dict (StatisticsSchema) or None
+    """
+    if user_id % 10 == 0:
+        raise ConnectionError(user_id)
+    if user_id % 7 == 0:
+        return None
+    return {"total": dict.fromkeys(STAT_FIELDS, user_id), "items": []}
+
+
+class FakeFetch:
+    """This class emulates get_usage_statistics of the API."""
+
+    def __init__(self):
+        """Init FakeFetch class"""
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, user_id):
+        """
+        This method emulates sync request.
+
+        :param user_id: id of the user
+        :return: statistics
+        """
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            sleep(random.random() / 100)
+            return make_statistics(user_id)
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    async def fetch(self, user_id):
+        """
+        This method emulates async request.
+
+        :param user_id: id of the user
+        :return: statistics
+        """
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(random.random() / 100)
+            return make_statistics(user_id)
+        finally:
+            self.running -= 1
+
+
+def check_results(batch, results) -> None:
+    """
+    This function checks results and combined total of the batch for users 1..50.
+
+    :param batch: batch
+    :param results: results of the batch
+    """
+    assert sorted(result.user_id for result in results) == list(range(1, 51))
+    failed = [user_id for user_id in range(1, 51) if user_id % 10 == 0 or user_id % 7 == 0]
+    for result in results:
+        assert result.ok == (result.user_id not in failed)
+        assert isinstance(result.error, ConnectionError) == (result.user_id % 10 == 0)
+    assert sorted(batch.failed_users) == failed
+    assert batch.total == dict.fromkeys(STAT_FIELDS, sum(set(range(1, 51)) - set(failed)))
+    assert (batch.completed, batch.succeeded, batch.failed) == (50, 50 - len(failed), len(failed))
+
+
+def test_utils_statistics_batch_sync():
+    """This method tests for sync statistics batch: bounded number of threads, captured errors and total."""
+    fetch = FakeFetch()
+    batch = StatisticsBatch(fetch, range(1, 51), max_workers=4)
+    results = list(batch)
+    assert fetch.max_running <= 4
+    check_results(batch, results)
+    assert StatisticsBatch(fetch, range(1, 51), max_workers=4).combined_total() == batch.total
+
+
+@pytest.mark.asyncio
+async def test_utils_statistics_batch_async():
+    """This method tests for async statistics batch: bounded concurrency, captured errors and total."""
+    fetch = FakeFetch()
+    batch = AsyncStatisticsBatch(fetch.fetch, range(1, 51), concurrency=5)
+    results = [result async for result in batch]
+    assert fetch.max_running == 5
+    check_results(batch, results)
+    assert await AsyncStatisticsBatch(fetch.fetch, range(1, 51), concurrency=5).combined_total() == batch.total
+
+
+def test_utils_statistics_batch_convert():
+    """This method tests for statistics batch: statistics are converted, conversion errors are captured."""
+
+    def convert(statistics):
+        """
+        This function converts statistics.
+
+        :param statistics: statistics dict
+        :return: total tokens
+        """
+        if statistics["total"]["total_tokens"] == 3:
+            raise ValueError("invalid statistics")
+        return statistics["total"]["total_tokens"]
+
+    batch = StatisticsBatch(make_statistics, [1, 2, 3], convert=convert)
+    results = {result.user_id: result for result in batch}
+    assert (results[1].statistics, results[2].statistics) == (1, 2)
+    assert isinstance(results[3].error, ValueError) and batch.failed_users == [3]
+    assert batch.total == dict.fromkeys(STAT_FIELDS, 3)
+
+
+@pytest.mark.asyncio
+async def test_utils_statistics_batch_async_close():
+    """This method tests for async statistics batch: requests in progress are cancelled on close."""
+    fetch = FakeFetch()
+    batch = AsyncStatisticsBatch(fetch.fetch, range(1, 1000), concurrency=3)
+    async for _ in batch:
+        if batch.completed == 10:
+            break
+    await batch.aclose()
+    await asyncio.sleep(0)
+    assert fetch.running == 0
+    assert batch.completed == 10
+
+
+def test_utils_statistics_batch_invalid_concurrency():
+    """This method tests for statistics batches: invalid concurrency."""
+    with pytest.raises(ValueError):
+        AsyncStatisticsBatch(FakeFetch().fetch, [], concurrency=0)
+    with pytest.raises(ValueError):
+        StatisticsBatch(FakeFetch(), [], max_workers=0)
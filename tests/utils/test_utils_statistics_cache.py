@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_statistics_cache.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for statistics cache.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.ablt_python_api.utils.statistics_cache import StatisticsCache
+
+
+def day(offset: int) -> str:
+    """
+    This function returns date relative to today.
+
+    :param offset: offset in days
+    :return: date in format YYYY-MM-DD
+    """
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def item(offset: int) -> dict:
+    """
+    This function returns statistics item for a day.
+
+    :param offset: offset in days
+    :return: statistics item
+    """
+    return {"total_tokens": abs(offset), "date": day(offset)}
+
+
+def test_utils_statistics_cache_missing_ranges():
+    """This method tests for statistics cache: only not cached past days, today and future days are missing."""
+    cache = StatisticsCache()
+    assert cache.missing_ranges(1, day(-10), day(2)) == [(day(-10), day(2))]
+    cache.put(1, day(-10), day(2), [item(offset) for offset in range(-10, 3) if offset != -5])
+    assert cache.missing_ranges(1, day(-10), day(2)) == [(day(0), day(2))]
+    assert cache.missing_ranges(1, day(-20), day(-1)) == [(day(-20), day(-11))]
+    assert not cache.missing_ranges(1, day(-10), day(-1))
+    assert not cache.missing_ranges(1, day(2), day(-10))
+    assert cache.missing_ranges(2, day(-3), day(-1)) == [(day(-3), day(-1))]
+    cache.put(1, day(-15), day(-14), [item(-15), item(-14)])
+    assert cache.missing_ranges(1, day(-20), day(0)) == [(day(-20), day(-16)), (day(-13), day(-11)), (day(0), day(0))]
+    with pytest.raises(ValueError):
+        cache.missing_ranges(1, "bad_start_date", day(0))
+
+
+def test_utils_statistics_cache_items():
+    """This method tests for statistics cache: only finalized days are stored, days without items are skipped."""
+    cache = StatisticsCache()
+    cache.put(1, day(-3), day(1), [item(offset) for offset in (-3, -1, 0, 1)])
+    assert cache.get_items(1, day(-5), day(5)) == [item(-3), item(-1)]
+    assert cache.get_items(1, day(-1), day(-1)) == [item(-1)]
+    assert not cache.get_items(2, day(-5), day(5))
+
+
+def test_utils_statistics_cache_grace_days():
+    """This method tests for statistics cache: grace days are fetched again."""
+    cache = StatisticsCache(grace_days=2)
+    cache.put(1, day(-5), day(0), [item(offset) for offset in range(-5, 1)])
+    assert cache.missing_ranges(1, day(-5), day(0)) == [(day(-2), day(0))]
+    with pytest.raises(ValueError):
+        StatisticsCache(grace_days=-1)
+
+
+def test_utils_statistics_cache_sqlite(tmp_path):
+    """
+    This method tests for statistics cache: statistics are kept in SQLite between runs and may be cleared.
+
+    :param tmp_path: pytest tmp_path fixture
+    """
+    path = str(tmp_path / "statistics.db")
+    cache = StatisticsCache(path)
+    cache.put(1, day(-3), day(-1), [item(-3), item(-2)])
+    cache.put(2, day(-1), day(-1), [item(-1)])
+    cache.close()
+    cache = StatisticsCache(path)
+    assert cache.get_items(1, day(-3), day(-1)) == [item(-3), item(-2)]
+    assert not cache.missing_ranges(1, day(-3), day(-1))
+    cache.clear(1)
+    assert cache.missing_ranges(1, day(-3), day(-1)) == [(day(-3), day(-1))]
+    assert cache.get_items(2, day(-1), day(-1)) == [item(-1)]
+    cache.clear()
+    cache.close()
+    assert not StatisticsCache(path).get_items(2, day(-1), day(-1))
+
+
+def test_utils_statistics_cache_scopes(tmp_path):
+    """
+    This method tests for statistics cache: statistics of different tokens and APIs are kept apart.
+
+    :param tmp_path: pytest tmp_path fixture
+    """
+    first = StatisticsCache.scope_of("token", "https://api.ablt.ai")
+    assert first == StatisticsCache.scope_of("token", "https://api.ablt.ai/") and "token" not in first
+    second = StatisticsCache.scope_of("other", "https://api.ablt.ai")
+    assert len({first, second, StatisticsCache.scope_of("token", "http://localhost")}) == 3
+    path = str(tmp_path / "statistics.db")
+    cache = StatisticsCache(path)
+    cache.put(-1, day(-2), day(-1), [item(-2)], first)
+    cache.put(-1, day(-2), day(-1), [item(-1)], second)
+    cache.close()
+    cache = StatisticsCache(path)
+    assert cache.get_items(-1, day(-2), day(-1), first) == [item(-2)]
+    assert cache.get_items(-1, day(-2), day(-1), second) == [item(-1)]
+    assert cache.missing_ranges(-1, day(-2), day(-1)) == [(day(-2), day(-1))]
+    cache.clear(scope=first)
+    assert not cache.get_items(-1, day(-2), day(-1), first)
+    assert cache.get_items(-1, day(-2), day(-1), second) == [item(-1)]
+    cache.close()
+    assert StatisticsCache(path).get_items(-1, day(-2), day(-1), second) == [item(-1)]
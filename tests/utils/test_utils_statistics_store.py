@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_statistics_store.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for local store of statistics.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.ablt_python_api.schemas import StatisticsSchema
+from src.ablt_python_api.utils.statistics import STAT_FIELDS, sum_statistics
+from src.ablt_python_api.utils.statistics_store import StatisticsStore
+
+
+def make_items(start: date, days: int, value: int = 1) -> list:
+    """
+    This function makes statistics items for every second day.
+
+    :param start: start date
+    :param days: number of days
+    :param value: value of each counter
+    :return: items (StatisticItemSchema dicts)
+    """
+    return [
+        {**dict.fromkeys(STAT_FIELDS, value), "date": (start + timedelta(days=day)).isoformat()}
+        for day in range(0, days, 2)
+    ]
+
+
+def test_utils_statistics_store_watermark():
+    """This method tests for statistics store: watermark moves forward till yesterday only."""
+    store = StatisticsStore()
+    today = date.today()
+    assert store.get_watermark(1) is None and not store.users()
+    assert store.put(1, "2024-01-01", "2024-01-31", make_items(date(2024, 1, 1), 31)) == 16
+    assert store.get_watermark(1) == "2024-01-31"
+    store.put(1, "2024-01-01", "2024-01-10", [])
+    assert store.get_watermark(1) == "2024-01-31"
+    store.put(1, "2024-02-01", today.isoformat(), [])
+    assert store.get_watermark(1) == (today - timedelta(days=1)).isoformat()
+    assert store.users() == [1]
+    assert StatisticsStore(grace_days=2).first_open_day() == today - timedelta(days=2)
+    with pytest.raises(ValueError):
+        StatisticsStore(grace_days=-1)
+
+
+def test_utils_statistics_store_queries(tmp_path):
+    """
+    This method tests for statistics store: totals, days and ranges are the same as API returns, data is persisted.
+
+    :param tmp_path: pytest tmp_path fixture
+    """
+    path = str(tmp_path / "statistics.db")
+    store = StatisticsStore(path)
+    items = make_items(date(2024, 1, 1), 60)
+    store.put(-1, "2024-01-01", "2024-02-29", items)
+    store.put(2, "2024-01-01", "2024-02-29", make_items(date(2024, 1, 1), 60, value=5))
+    # Synced range replaces stored items, so removed or changed days don't stay in the store
+    store.put(-1, "2024-02-01", "2024-02-29", make_items(date(2024, 2, 2), 28))
+    expected = [item for item in items if item["date"] < "2024-02-01"] + make_items(date(2024, 2, 2), 28)
+    store.close()
+    store = StatisticsStore(path)
+    statistics = store.get_usage_statistics(start_date="2024-01-01", end_date="2024-02-29")
+    assert statistics == {"total": sum_statistics(expected), "items": expected}
+    assert StatisticsSchema.model_validate(statistics)
+    assert store.get_statistics_total() == sum_statistics(expected)
+    assert store.get_statistics_total(2, "2024-01-01", "2024-01-31") == dict.fromkeys(STAT_FIELDS, 16 * 5)
+    assert store.get_statistics_total(3) == dict.fromkeys(STAT_FIELDS, 0)
+    assert store.get_statistics_for_a_day("2024-02-02") == expected[16]
+    assert store.get_statistics_for_a_day("2024-02-01") is None
+    assert store.get_statistics_for_a_day() is None
+    store.clear(2)
+    assert store.users() == [-1] and store.get_statistics_total(2) == dict.fromkeys(STAT_FIELDS, 0)
+    store.clear()
+    assert not store.users() and not store.get_usage_statistics()["items"]
+
+
+def test_utils_statistics_store_scopes(tmp_path):
+    """
+    This method tests for statistics store: statistics and watermarks of different tokens and APIs are kept apart.
+
+    :param tmp_path: pytest tmp_path fixture
+    """
+    first = StatisticsStore.scope_of("token", "https://api.ablt.ai")
+    second = StatisticsStore.scope_of("other", "https://api.ablt.ai")
+    path = str(tmp_path / "statistics.db")
+    store = StatisticsStore(path)
+    store.put(-1, "2024-01-01", "2024-01-31", make_items(date(2024, 1, 1), 31), first)
+    store.put(-1, "2024-01-01", "2024-01-10", make_items(date(2024, 1, 1), 10, value=5), second)
+    store.close()
+    store = StatisticsStore(path)
+    assert (store.get_watermark(-1, first), store.get_watermark(-1, second)) == ("2024-01-31", "2024-01-10")
+    assert store.get_watermark() is None and not store.users()
+    assert store.users(first) == store.users(second) == [-1]
+    assert store.get_statistics_total(scope=first) == dict.fromkeys(STAT_FIELDS, 16)
+    assert store.get_statistics_total(scope=second) == dict.fromkeys(STAT_FIELDS, 5 * 5)
+    assert store.get_statistics_for_a_day("2024-01-03", scope=second)["response_tokens"] == 5
+    assert len(store.get_usage_statistics(scope=first)["items"]) == 16
+    store.clear(scope=first)
+    assert not store.users(first) and store.get_watermark(-1, second) == "2024-01-10"
+    store.clear(-1)
+    assert not store.users(second)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_stream.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for chat streams.
+"""
+
+import pytest
+
+from src.ablt_python_api.utils.exceptions import DoneException
+from src.ablt_python_api.utils.stream import AsyncChatStream, ChatStream
+
+
+def messages(chat_stream, done=True):
+    """
+    This method emulates chat response.
+
+    :param chat_stream: stream to keep metadata
+    :param done: whether the bot is done
+    :return: messages
+    """
+    for chunk in chat_stream.track_chunks([b"Hello", b" world"]):
+        yield chunk.decode()
+    chat_stream.done = done
+
+
+async def async_messages(chat_stream):
+    """
+    This method emulates async chat response.
+
+    :param chat_stream: stream to keep metadata
+    :return: messages
+    """
+    for message in messages(chat_stream):
+        yield message
+
+
+def test_utils_stream_without_done_exception():
+    """This method tests for chat stream: iteration just stops when the bot is done."""
+    chat_stream = ChatStream(raise_on_done=False)
+    assert list(chat_stream.attach(messages(chat_stream))) == ["Hello", " world"]
+    assert chat_stream.done
+    assert (chat_stream.chunks, chat_stream.bytes, chat_stream.messages) == (2, 11, 2)
+    assert chat_stream.duration >= 0
+
+
+def test_utils_stream_with_done_exception():
+    """This method tests for chat stream: legacy DoneException is raised when the bot is done."""
+    chat_stream = ChatStream()
+    chat_stream.attach(messages(chat_stream))
+    with pytest.raises(DoneException):
+        list(chat_stream)
+    assert not list(chat_stream)
+
+
+def test_utils_stream_not_done():
+    """This method tests for chat stream: DoneException isn't raised if the bot isn't done."""
+    chat_stream = ChatStream()
+    assert list(chat_stream.attach(messages(chat_stream, done=False))) == ["Hello", " world"]
+
+
+def test_utils_stream_empty():
+    """This method tests for chat stream: stream without source is empty."""
+    assert not list(ChatStream())
+    assert ChatStream().duration is None
+
+
+@pytest.mark.asyncio
+async def test_utils_stream_empty_on_finish():
+    """This method tests for chat stream: callback is called for stream without source (rejected request)."""
+    finished = []
+    chat_stream = ChatStream(on_finish=finished.append)
+    assert not list(chat_stream) and not list(chat_stream)
+    async_chat_stream = AsyncChatStream(on_finish=finished.append)
+    assert not [message async for message in async_chat_stream]
+    assert finished == [chat_stream, async_chat_stream]
+    assert chat_stream.duration >= 0 and chat_stream.events == 0
+
+
+@pytest.mark.asyncio
+async def test_utils_stream_async():
+    """This method tests for async chat stream."""
+    chat_stream = AsyncChatStream(raise_on_done=False)
+    assert [message async for message in chat_stream.attach(async_messages(chat_stream))] == ["Hello", " world"]
+    assert chat_stream.done and chat_stream.messages == 2
+    chat_stream = AsyncChatStream()
+    with pytest.raises(DoneException):
+        async for _ in chat_stream.attach(async_messages(chat_stream)):
+            pass
+
+
+def test_utils_stream_timing_disabled():
+    """This method tests for chat stream: arrival of messages isn't recorded by default."""
+    chat_stream = ChatStream(raise_on_done=False)
+    list(chat_stream.attach(messages(chat_stream)))
+    assert not chat_stream.timing
+    assert chat_stream.first_message_at is None and not chat_stream.gaps
+    metrics = chat_stream.metrics()
+    assert metrics["time_to_first_token"] is None and metrics["tokens_per_second"] is None
+    assert (metrics["messages"], metrics["chunks"], metrics["bytes"]) == (2, 2, 11)
+
+
+def test_utils_stream_timing():
+    """This method tests for chat stream: time to first token, gaps between messages and rate."""
+    chat_stream = ChatStream(raise_on_done=False, timing=True)
+    chat_stream.mark_request_sent()
+    chat_stream.mark_headers_received()
+    list(chat_stream.attach(messages(chat_stream)))
+    assert chat_stream.request_sent_at <= chat_stream.headers_at <= chat_stream.first_message_at
+    assert chat_stream.first_message_at <= chat_stream.last_message_at <= chat_stream.finished_at
+    assert len(chat_stream.gaps) == 1
+    metrics = chat_stream.metrics()
+    assert 0 <= metrics["time_to_headers"] <= metrics["time_to_first_token"]
+    assert metrics["gap_mean"] == metrics["gap_p50"] == metrics["gap_p95"] == metrics["gap_max"] == chat_stream.gaps[0]
+
+
+def test_utils_stream_on_finish():
+    """This method tests for chat stream: callback is called once, before legacy DoneException."""
+    finished = []
+    chat_stream = ChatStream(on_finish=finished.append)
+    assert chat_stream.timing
+    chat_stream.attach(messages(chat_stream))
+    with pytest.raises(DoneException):
+        list(chat_stream)
+    chat_stream.close()
+    assert finished == [chat_stream]
+    assert chat_stream.time_to_first_token is not None
+
+
+def test_utils_stream_on_finish_error():
+    """This method tests for chat stream: callback is called if source fails."""
+
+    def failed():
+        yield "Hello"
+        raise ConnectionError
+
+    finished = []
+    chat_stream = ChatStream(on_finish=finished.append).attach(failed())
+    with pytest.raises(ConnectionError):
+        list(chat_stream)
+    assert finished == [chat_stream] and chat_stream.messages == 1
+
+
+@pytest.mark.asyncio
+async def test_utils_stream_async_timing():
+    """This method tests for async chat stream: timing and callback."""
+    finished = []
+    chat_stream = AsyncChatStream(raise_on_done=False, on_finish=finished.append)
+    assert [message async for message in chat_stream.attach(async_messages(chat_stream))] == ["Hello", " world"]
+    assert finished == [chat_stream] and len(chat_stream.gaps) == 1
+    await chat_stream.aclose()
+    assert finished == [chat_stream]
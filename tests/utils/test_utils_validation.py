@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Filename: test_utils_validation.py
+Author: Iliya Vereshchagin
+Copyright (c) 2023 aBLT.ai. All rights reserved.
+
+Created: 18.10.2026
+Last Modified: 18.10.2026
+
+Description:
+This file tests for validation modes of API responses.
+"""
+
+import copy
+import json
+from typing import List
+
+import pytest
+from pydantic import ValidationError
+
+from src.ablt_python_api.schemas import BotSchema, StatisticsSchema, StatisticTotalSchema
+from src.ablt_python_api.utils.statistics import STAT_FIELDS
+from src.ablt_python_api.utils.validation import LazyModel, ResponseValidator, get_adapter
+
+BOTS = [
+    {
+        "uid": str(number),
+        "slug": f"bot-{number}",
+        "model": "gpt-4",
+        "name": f"Bot {number}",
+        "description": "Bot",
+        "welcome_message": "Hi!",
+        "avatar_url": None,
+    }
+    for number in range(3)
+]
+STATISTICS = {
+    "total": dict.fromkeys(STAT_FIELDS, 2),
+    "items": [{**dict.fromkeys(STAT_FIELDS, 1), "date": day} for day in ("2024-01-01", "2024-01-02")],
+}
+
+
+def test_utils_validation_off():
+    """This method tests for validation: raw dicts are returned as is."""
+    validator = ResponseValidator()
+    assert validator.loads(json.dumps(STATISTICS).encode(), StatisticsSchema) == STATISTICS
+    assert validator.typed(STATISTICS, StatisticsSchema) is STATISTICS
+    assert validator.typed_many(BOTS, BotSchema) == BOTS
+
+
+def test_utils_validation_lazy():
+    """This method tests for validation: data is validated once on the first attribute access."""
+    validator = ResponseValidator("lazy")
+    statistics = validator.typed(validator.loads(json.dumps(STATISTICS).encode(), StatisticsSchema), StatisticsSchema)
+    assert isinstance(statistics, LazyModel) and not statistics.is_validated
+    assert statistics.raw == STATISTICS
+    assert statistics.total.total_tokens == 2
+    assert statistics.is_validated and statistics.validate() is statistics.validate()
+    assert statistics == StatisticsSchema.model_validate(STATISTICS)
+    assert copy.copy(statistics).items[1].date.isoformat() == "2024-01-02"
+    bots = validator.typed_many(BOTS, BotSchema)
+    assert [bot.slug for bot in bots] == ["bot-0", "bot-1", "bot-2"]
+    broken = validator.typed({"uid": "1"}, BotSchema)
+    assert broken.raw == {"uid": "1"}
+    with pytest.raises(ValidationError):
+        _ = broken.slug
+
+
+def test_utils_validation_strict():
+    """This method tests for validation: models are validated from bytes and dicts at once."""
+    validator = ResponseValidator("strict")
+    statistics = validator.loads(json.dumps(STATISTICS).encode(), StatisticsSchema)
+    assert statistics == StatisticsSchema.model_validate(STATISTICS)
+    assert validator.typed(statistics, StatisticsSchema) is statistics
+    assert validator.typed(STATISTICS["total"], StatisticTotalSchema) == statistics.total
+    assert validator.typed_many(BOTS, BotSchema) == [BotSchema.model_validate(bot) for bot in BOTS]
+    assert validator.typed(None, BotSchema) is None
+    assert get_adapter(List[BotSchema]) is get_adapter(List[BotSchema])
+    with pytest.raises(ValidationError):
+        validator.loads(b'{"total": {}}', StatisticsSchema)
+    with pytest.raises(ValidationError):
+        validator.typed_many([{"uid": "1"}], BotSchema)
+
+
+def test_utils_validation_invalid_mode():
+    """This method tests for validation: unknown mode."""
+    with pytest.raises(ValueError):
+        ResponseValidator("eager")